@@ -0,0 +1,434 @@
+# benchmark.py - 네트워크 없이 회원사 수집/지도 생성 처리량을 재는 벤치마크
+#
+# 사용법:
+#   python benchmark.py                      # 100, 10k, 100k행 전체 실행 후 기준값과 비교
+#   python benchmark.py --sizes 100,10000    # 일부 크기만
+#   python benchmark.py --cases pipeline     # 파이프라인 수집 모드 (기본 비교에서 제외, 코어가 여러 개일 때)
+#   python benchmark.py --update-baseline    # 현재 결과를 기준값으로 저장
+#   python benchmark.py --repeat 3 ...       # 경우마다 3번 실행해 지표별 중앙값 사용 (기준값 저장 시 권장)
+#
+# 녹화해 둔 네이버 검색/구인사이트 페이지(benchmarks/fixtures)와 지오코딩 응답을
+# 로컬 대역 서버로 돌려주고, 각 경우를 별도 프로세스에서 실행해 최대 메모리를 잰다.
+
+import argparse
+import contextlib
+import html
+import json
+import os
+import resource
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+from openpyxl import Workbook
+
+BENCH_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'benchmarks')
+FIXTURE_DIR = os.path.join(BENCH_DIR, 'fixtures')
+BASELINE_PATH = os.path.join(BENCH_DIR, 'baseline.json')
+
+DEFAULT_SIZES = (100, 10000, 100000)
+CASES = ('collector', 'pipeline', 'mapper')
+# 기본으로 실행해 기준값과 비교하는 경우. pipeline(프로세스 풀 파싱)은 코어가 여러 개일 때만
+# 이득이 있고 코어 하나에서는 파싱 프로세스 시작/전달 비용으로 오히려 느리므로 --cases로 따로 실행
+DEFAULT_CASES = ('collector', 'mapper')
+# 기준값 비교: (지표, 클수록 좋은지)
+METRICS = (
+    ('rows_per_sec', True),
+    ('p95_ms', False),
+    ('peak_rss_mb', False),
+    ('html_seconds', False),
+)
+
+# 합성 회원사 데이터
+ROADS = [
+    ('서울특별시 강남구', '테헤란로'), ('서울특별시 중구', '세종대로'), ('서울특별시 마포구', '월드컵북로'),
+    ('경기도 성남시 분당구', '판교역로'), ('부산광역시 해운대구', '센텀중앙로'), ('대전광역시 유성구', '대학로'),
+    ('인천광역시 연수구', '송도과학로'), ('광주광역시 북구', '첨단과기로'), ('대구광역시 동구', '동대구로'),
+]
+# 이 간격마다 홈페이지 대신 구인사이트 링크가 검색 결과에 나옴
+SARAMIN_EVERY = 5
+JOBKOREA_EVERY = 7
+# 지도 입력에서 같은 건물 주소를 쓰는 회원사 비율
+COLOCATED_RATIO = 0.2
+
+def company_name(i):
+    return f"벤치마크{i:06d}"
+
+def company_address(i):
+    region, road = ROADS[i % len(ROADS)]
+    return f"{region} {road} {i // len(ROADS) + 1}"
+
+def company_homepage(i):
+    return f"https://www.bm{i:06d}.co.kr"
+
+def search_homepage(i):
+    """네이버 검색 결과에 나오는 홈페이지 링크 (일부는 구인사이트)"""
+    if i % SARAMIN_EVERY == 0:
+        return f"https://www.saramin.co.kr/zf_user/company-info/view?csn={i:06d}"
+    if i % JOBKOREA_EVERY == 0:
+        return f"https://www.jobkorea.co.kr/Recruit/Co_Read/C/{i:06d}"
+    return company_homepage(i)
+
+def write_member_list(path, rows, with_address=False):
+    """합성 회원사 목록 엑셀을 만듭니다."""
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet()
+    if with_address:
+        distinct = max(1, int(rows * (1 - COLOCATED_RATIO)))
+        ws.append(['회원사명', '주소'])
+        for i in range(rows):
+            ws.append([company_name(i), company_address(i % distinct)])
+    else:
+        # 실제 회원사 목록처럼 주소/홈페이지 열은 비워 둠
+        ws.append(['회원사명', '주소', '홈페이지'])
+        for i in range(rows):
+            ws.append([company_name(i), None, None])
+    wb.save(path)
+
+def percentile(values, q):
+    """정렬된 목록의 백분위수 (최근접 순위)"""
+    if not values:
+        return 0.0
+    index = min(len(values) - 1, max(0, int(round(q / 100 * len(values) + 0.5)) - 1))
+    return values[index]
+
+class PageStandinServer:
+    """녹화한 네이버 검색/구인사이트 페이지를 회사별로 채워 돌려주는 로컬 HTTP 서버
+
+    요청 경로는 StandinHttp가 바꾼 '/원래호스트/원래경로' 형식입니다.
+    """
+    def __init__(self, fixture_dir=FIXTURE_DIR, host='127.0.0.1', port=0):
+        self.templates = {}
+        for name in ('naver_search', 'saramin_company', 'jobkorea_company'):
+            with open(os.path.join(fixture_dir, name + '.html'), encoding='utf-8') as f:
+                self.templates[name] = f.read()
+        self.host = host
+        self.port = port
+        self.server = None
+        self.requests = 0
+        self.lock = threading.Lock()
+
+    @property
+    def url(self):
+        return f"http://{self.host}:{self.port}"
+
+    def render(self, name, i):
+        page = self.templates[name]
+        homepage = search_homepage(i) if name == 'naver_search' else company_homepage(i)
+        for key, value in (('company', company_name(i)), ('address', company_address(i)), ('homepage', homepage)):
+            page = page.replace('{{' + key + '}}', html.escape(value))
+        return page
+
+    def respond(self, path, query):
+        """(상태 코드, HTML)을 반환합니다."""
+        host, _, rest = path.lstrip('/').partition('/')
+        try:
+            if host == 'search.naver.com':
+                keyword = parse_qs(query).get('query', [''])[0].split()[0]
+                return 200, self.render('naver_search', int(keyword[len('벤치마크'):]))
+            if host.endswith('saramin.co.kr'):
+                return 200, self.render('saramin_company', int(parse_qs(query)['csn'][0]))
+            if host.endswith('jobkorea.co.kr'):
+                return 200, self.render('jobkorea_company', int(rest.rsplit('/', 1)[-1]))
+        except (KeyError, IndexError, ValueError):
+            pass
+        return 404, '<html><body>not found</body></html>'
+
+    def start(self):
+        standin = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+            # 헤더와 본문을 나눠 보내도 지연 ACK에 걸리지 않도록 (keep-alive 응답마다 ~40ms)
+            disable_nagle_algorithm = True
+
+            def do_GET(self):
+                url = urlparse(self.path)
+                status, page = standin.respond(url.path, url.query)
+                with standin.lock:
+                    standin.requests += 1
+                data = page.encode('utf-8')
+                self.send_response(status)
+                self.send_header('Content-Type', 'text/html; charset=utf-8')
+                self.send_header('Content-Length', str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, format, *args):
+                pass
+
+        self.server = ThreadingHTTPServer((self.host, self.port), Handler)
+        self.server.daemon_threads = True
+        self.port = self.server.server_address[1]
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self):
+        if self.server is not None:
+            self.server.shutdown()
+            self.server.server_close()
+            self.server = None
+
+class StandinHttp:
+    """세션 풀을 감싸 모든 요청을 대역 서버로 보냅니다. (https://호스트/경로 → 대역서버/호스트/경로)"""
+    def __init__(self, http, base_url):
+        self.http = http
+        self.base_url = base_url.rstrip('/')
+
+    def get(self, url, **kwargs):
+        parsed = urlparse(url)
+        target = f"{self.base_url}/{parsed.hostname}{parsed.path}"
+        if parsed.query:
+            target += '?' + parsed.query
+        return self.http.get(target, **kwargs)
+
+    def stats(self):
+        return self.http.stats()
+
+    def summary(self):
+        return self.http.summary()
+
+class LatencyRecorder:
+    """함수 호출마다 걸린 시간을 모읍니다. (여러 스레드에서 호출 가능)"""
+    def __init__(self):
+        self.samples = []
+        self.lock = threading.Lock()
+
+    def wrap(self, func):
+        def timed(*args, **kwargs):
+            started = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                elapsed = time.perf_counter() - started
+                with self.lock:
+                    self.samples.append(elapsed)
+        return timed
+
+    def summary(self):
+        samples = sorted(self.samples)
+        return {
+            'samples': len(samples),
+            'p50_ms': percentile(samples, 50) * 1000,
+            'p95_ms': percentile(samples, 95) * 1000,
+            'p99_ms': percentile(samples, 99) * 1000,
+        }
+
+def run_collector_case(rows, page_url, workdir, concurrency, pipeline=False):
+    """CompanyInfoCollector.run을 합성 목록으로 실행합니다. (pipeline이면 파싱을 프로세스 풀에서)"""
+    from http_session import HttpSessionPool
+    from member_visit import CompanyInfoCollector
+
+    input_path = os.path.join(workdir, '회원사 목록.xlsx')
+    write_member_list(input_path, rows)
+
+    http = StandinHttp(HttpSessionPool(pool_maxsize=concurrency), page_url)
+    collector = CompanyInfoCollector(input_path, page_cache_path=None, http=http)
+    latency = LatencyRecorder()
+    if pipeline:
+        # 파이프라인 모드는 search_company_info를 거치지 않으므로 검색 페이지 요청 시간을 잼
+        collector.fetch_bytes = latency.wrap(collector.fetch_bytes)
+    else:
+        collector.search_company_info = latency.wrap(collector.search_company_info)
+
+    started = time.perf_counter()
+    ok = collector.run(concurrency=concurrency, host_rate=1e6, pipeline=pipeline)
+    elapsed = time.perf_counter() - started
+    return ok, elapsed, latency, None, collector.metrics.summary()['stages']
+
+def run_mapper_case(rows, geocode_url, workdir, concurrency):
+    """ExcelToGoogleMap.run을 합성 목록으로 실행합니다."""
+    from geocoders import GoogleGeocoder
+    from http_session import HttpSessionPool
+    from member_visit_view_upload import ExcelToGoogleMap
+
+    input_path = os.path.join(workdir, '회원사 목록_업데이트.xlsx')
+    write_member_list(input_path, rows, with_address=True)
+
+    http = HttpSessionPool(pool_maxsize=concurrency)
+    geocoder = GoogleGeocoder('benchmark-key', base_url=geocode_url, http=http, concurrency=concurrency)
+    mapper = ExcelToGoogleMap(input_path, 'benchmark-key', cache_path=os.path.join(workdir, 'geocode.sqlite'),
+                              http=http, geocoder=geocoder, qps=1e6)
+    latency = LatencyRecorder()
+    geocoder.geocode = latency.wrap(geocoder.geocode)
+    html_timer = LatencyRecorder()
+    mapper.generate_html = html_timer.wrap(mapper.generate_html)
+
+    started = time.perf_counter()
+    mapper.run()
+    elapsed = time.perf_counter() - started
+    return (bool(mapper.company_locations), elapsed, latency, sum(html_timer.samples),
+            mapper.metrics.summary()['stages'])
+
+def run_child(case, rows, server_url, result_path, concurrency):
+    """한 경우를 실행하고 결과를 JSON 파일로 씁니다. (벤치마크 하위 프로세스)"""
+    workdir = tempfile.mkdtemp(prefix=f'bench_{case}_{rows}_')
+    os.chdir(workdir)
+    runners = {
+        'collector': run_collector_case,
+        'pipeline': lambda *args: run_collector_case(*args, pipeline=True),
+        'mapper': run_mapper_case,
+    }
+    runner = runners[case]
+
+    # 행마다 찍는 진행 출력은 버림 (측정 대상 아님)
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        ok, elapsed, latency, html_seconds, stages = runner(rows, server_url, workdir, concurrency)
+
+    result = {
+        'case': case,
+        'rows': rows,
+        'ok': bool(ok),
+        'seconds': elapsed,
+        'rows_per_sec': rows / elapsed if elapsed else 0.0,
+        # 리눅스 ru_maxrss 단위는 KB
+        'peak_rss_mb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+        # 파싱 프로세스 중 가장 큰 것 (pipeline 경우만)
+        'worker_peak_rss_mb': resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss / 1024,
+        'html_seconds': html_seconds,
+    }
+    result.update(latency.summary())
+    # 단계별 누적 시간 (회귀가 났을 때 어느 단계인지 확인용, 비교 대상은 아님)
+    result['stages'] = stages
+    os.chdir(BENCH_DIR)
+    shutil.rmtree(workdir, ignore_errors=True)
+    with open(result_path, 'w', encoding='utf-8') as f:
+        json.dump(result, f, ensure_ascii=False)
+
+def compare(results, baseline, tolerance):
+    """기준값보다 tolerance 이상 나빠진 지표 목록을 반환합니다."""
+    regressions = []
+    for result in results:
+        key = f"{result['case']}:{result['rows']}"
+        base = baseline.get(key)
+        if not base:
+            continue
+        for metric, higher_is_better in METRICS:
+            current = result.get(metric)
+            reference = base.get(metric)
+            if current is None or not reference:
+                continue
+            change = (current - reference) / reference
+            if (higher_is_better and change < -tolerance) or (not higher_is_better and change > tolerance):
+                regressions.append((key, metric, reference, current, change))
+    return regressions
+
+def median_result(runs):
+    """같은 경우를 여러 번 실행한 결과를 숫자 지표별 중앙값으로 합칩니다. (나머지는 첫 실행 값)"""
+    merged = dict(runs[0])
+    merged['ok'] = all(run['ok'] for run in runs)
+    merged['runs'] = len(runs)
+    for key, value in runs[0].items():
+        if isinstance(value, (int, float)) and not isinstance(value, bool) and key != 'rows':
+            values = sorted(run[key] for run in runs if run.get(key) is not None)
+            merged[key] = values[len(values) // 2]
+    return merged
+
+def print_report(results):
+    print(f"{'경우':<18}{'행/초':>10}{'p50(ms)':>10}{'p95(ms)':>10}{'p99(ms)':>10}"
+          f"{'최대RSS(MB)':>13}{'HTML(초)':>10}{'전체(초)':>10}")
+    for r in results:
+        html_seconds = f"{r['html_seconds']:.2f}" if r['html_seconds'] is not None else '-'
+        status = '' if r['ok'] else '  ❌ 실패'
+        print(f"{r['case'] + ':' + str(r['rows']):<18}{r['rows_per_sec']:>10.1f}{r['p50_ms']:>10.2f}"
+              f"{r['p95_ms']:>10.2f}{r['p99_ms']:>10.2f}{r['peak_rss_mb']:>13.1f}{html_seconds:>10}"
+              f"{r['seconds']:>10.1f}{status}")
+
+def main():
+    parser = argparse.ArgumentParser(description="회원사 수집/지도 생성 오프라인 벤치마크")
+    parser.add_argument('--sizes', default=','.join(str(size) for size in DEFAULT_SIZES),
+                        help="합성 회원사 수 (쉼표 구분)")
+    parser.add_argument('--cases', default=','.join(DEFAULT_CASES),
+                        help=f"실행할 경우 ({', '.join(CASES)}, 기본: {', '.join(DEFAULT_CASES)})")
+    parser.add_argument('--concurrency', type=int, default=16, help="동시 요청 수")
+    parser.add_argument('--baseline', default=BASELINE_PATH, help="기준값 JSON 파일")
+    parser.add_argument('--tolerance', type=float, default=0.3, help="허용 성능 저하 비율 (0.3 = 30%%)")
+    parser.add_argument('--update-baseline', action='store_true', help="이번 결과를 기준값으로 저장")
+    parser.add_argument('--output', help="결과 JSON 저장 경로")
+    parser.add_argument('--repeat', type=int, default=1, help="경우마다 실행할 횟수 (지표별 중앙값 사용)")
+    parser.add_argument('--child', nargs=4, metavar=('CASE', 'ROWS', 'URL', 'RESULT'), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        case, rows, url, result_path = args.child
+        run_child(case, int(rows), url, result_path, args.concurrency)
+        return 0
+
+    from geocode_standin import ReplayGeocodeServer
+
+    sizes = [int(size) for size in args.sizes.split(',') if size]
+    cases = [case for case in args.cases.split(',') if case]
+    pages = PageStandinServer().start()
+    geocodes = ReplayGeocodeServer(os.path.join(FIXTURE_DIR, 'geocode_recordings.jsonl'), synthesize=True).start()
+    print(f"🎭 대역 서버: 페이지 {pages.url}, 지오코딩 {geocodes.url}")
+
+    results = []
+    try:
+        for rows in sizes:
+            for case in cases:
+                url = geocodes.url if case == 'mapper' else pages.url
+                runs = []
+                for attempt in range(1, args.repeat + 1):
+                    repeat_note = f" ({attempt}/{args.repeat})" if args.repeat > 1 else ""
+                    print(f"⏱️ {case} {rows}행 실행 중...{repeat_note}", flush=True)
+                    with tempfile.NamedTemporaryFile(suffix='.json', delete=False) as f:
+                        result_path = f.name
+                    command = [sys.executable, os.path.abspath(__file__), '--concurrency', str(args.concurrency),
+                               '--child', case, str(rows), url, result_path]
+                    completed = subprocess.run(command, cwd=os.path.dirname(os.path.abspath(__file__)))
+                    if completed.returncode != 0:
+                        print(f"❌ {case} {rows}행 실행 실패 (종료 코드 {completed.returncode})")
+                        return 2
+                    with open(result_path, encoding='utf-8') as f:
+                        runs.append(json.load(f))
+                    os.remove(result_path)
+                results.append(median_result(runs))
+    finally:
+        pages.stop()
+        geocodes.stop()
+
+    print()
+    print_report(results)
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+
+    if args.update_baseline:
+        baseline = {}
+        if os.path.exists(args.baseline):
+            with open(args.baseline, encoding='utf-8') as f:
+                baseline = json.load(f)
+        for r in results:
+            baseline[f"{r['case']}:{r['rows']}"] = {metric: r[metric] for metric, _ in METRICS
+                                                    if r.get(metric) is not None}
+        with open(args.baseline, 'w', encoding='utf-8') as f:
+            json.dump(baseline, f, ensure_ascii=False, indent=2, sort_keys=True)
+        print(f"\n💾 기준값 저장: {args.baseline}")
+        return 0
+
+    if not all(r['ok'] for r in results):
+        print("\n❌ 일부 경우가 결과를 만들지 못했습니다.")
+        return 1
+
+    if not os.path.exists(args.baseline):
+        print("\n⚠️ 기준값 파일이 없어 비교하지 않았습니다. (--update-baseline으로 생성)")
+        return 0
+    with open(args.baseline, encoding='utf-8') as f:
+        baseline = json.load(f)
+    regressions = compare(results, baseline, args.tolerance)
+    if regressions:
+        print(f"\n❌ 성능 저하 ({args.tolerance:.0%} 초과):")
+        for key, metric, reference, current, change in regressions:
+            print(f"   {key} {metric}: {reference:.2f} → {current:.2f} ({change:+.0%})")
+        return 1
+    print(f"\n✅ 기준값 대비 성능 저하 없음 (허용 {args.tolerance:.0%})")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
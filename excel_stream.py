@@ -0,0 +1,91 @@
+# excel_stream.py - openpyxl 스트리밍 모드로 큰 엑셀 파일을 읽고 쓰는 도구
+
+import math
+
+import pandas as pd
+from openpyxl import Workbook, load_workbook
+
+def header_names(header):
+    """헤더 행 값을 열 이름 목록으로 (빈 칸은 pandas처럼 'Unnamed: 열 번호')"""
+    return [
+        str(name).strip() if name is not None else f"Unnamed: {i}"
+        for i, name in enumerate(header)
+    ]
+
+def iter_excel_rows(path, sheet_name=None):
+    """엑셀 행을 (행 번호, {열 이름: 값}) 형태로 하나씩 읽습니다.
+
+    openpyxl read-only 모드로 필요한 만큼만 읽으므로 파일 크기와 관계없이
+    첫 행부터 바로 처리할 수 있습니다. 행 번호는 pd.read_excel의 인덱스와
+    같고(헤더 다음 행이 0), 완전히 빈 행은 건너뜁니다.
+    """
+    wb = load_workbook(path, read_only=True, data_only=True)
+    try:
+        ws = wb[sheet_name] if sheet_name else wb.worksheets[0]
+        rows = ws.iter_rows(values_only=True)
+
+        header = next(rows, None)
+        if header is None:
+            return
+        columns = header_names(header)
+
+        for index, values in enumerate(rows):
+            if all(value is None for value in values):
+                continue
+            yield index, dict(zip(columns, values))
+    finally:
+        wb.close()
+
+def read_excel_columns(path, columns, sheet_name=None):
+    """필요한 열만 스트리밍으로 읽어 DataFrame을 만듭니다. (빈 칸은 NaN)"""
+    index = []
+    records = []
+    for row_index, row in iter_excel_rows(path, sheet_name):
+        index.append(row_index)
+        records.append([
+            float('nan') if row.get(column) is None else row.get(column)
+            for column in columns
+        ])
+    return pd.DataFrame(records, columns=columns, index=index)
+
+def excel_columns(path, sheet_name=None):
+    """헤더 행의 열 이름 목록을 반환합니다. (iter_excel_rows와 같은 이름)"""
+    wb = load_workbook(path, read_only=True, data_only=True)
+    try:
+        ws = wb[sheet_name] if sheet_name else wb.worksheets[0]
+        header = next(ws.iter_rows(max_row=1, values_only=True), ())
+        return header_names(header)
+    finally:
+        wb.close()
+
+class ExcelStreamWriter:
+    """write-only 모드로 행을 바로바로 기록하는 엑셀 작성기"""
+    def __init__(self, path, columns):
+        self.path = path
+        self.columns = list(columns)
+        self.wb = Workbook(write_only=True)
+        self.ws = self.wb.create_sheet()
+        self.ws.append(self.columns)
+        self.count = 0
+
+    @staticmethod
+    def cell_value(value):
+        """NaN/None은 빈 칸으로 기록"""
+        if value is None:
+            return None
+        if isinstance(value, float) and math.isnan(value):
+            return None
+        return value
+
+    def append(self, values):
+        """값 목록을 한 행으로 기록합니다."""
+        self.ws.append([self.cell_value(value) for value in values])
+        self.count += 1
+
+    def append_dict(self, row):
+        """{열 이름: 값} 행을 열 순서대로 기록합니다."""
+        self.append([row.get(column) for column in self.columns])
+
+    def close(self):
+        """파일을 저장합니다."""
+        self.wb.save(self.path)
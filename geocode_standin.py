@@ -0,0 +1,197 @@
+# geocode_standin.py - 녹화한 지오코딩 응답을 재생하는 로컬 HTTP 대역 서버
+
+import argparse
+import hashlib
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+from geocoders import BACKEND_CLASSES
+
+# 경로 → 백엔드 클래스 (주소 파라미터 이름, 빈 응답, 가짜 응답 형식)
+BACKENDS_BY_PATH = {backend.path: backend for backend in BACKEND_CLASSES}
+
+# 가짜 좌표를 만들 범위 (대략 한반도 남쪽)
+SYNTHETIC_BOUNDS = (34.5, 126.5, 38.0, 129.5)
+
+class RecordingHttp:
+    """세션 풀을 감싸 지오코딩 요청/응답을 JSONL 파일에 녹화합니다.
+
+    지오코더 백엔드의 http 자리에 그대로 넣어 쓰고, 녹화 파일은
+    ReplayGeocodeServer가 다시 읽습니다.
+    """
+    def __init__(self, http, path):
+        self.http = http
+        self.path = path
+        self.lock = threading.Lock()
+        self.file = open(path, 'a', encoding='utf-8')
+        self.count = 0
+
+    def get(self, url, **kwargs):
+        response = self.http.get(url, **kwargs)
+        path = urlparse(url).path
+        backend = BACKENDS_BY_PATH.get(path)
+        if backend is not None:
+            try:
+                body = response.json()
+            except ValueError:
+                body = response.text
+            entry = {
+                'path': path,
+                'query': (kwargs.get('params') or {}).get(backend.query_param, ''),
+                'status': response.status_code,
+                'body': body,
+            }
+            with self.lock:
+                self.file.write(json.dumps(entry, ensure_ascii=False) + '\n')
+                self.count += 1
+        return response
+
+    def stats(self):
+        return self.http.stats()
+
+    def summary(self):
+        return f"지오코딩 응답 {self.count}개 녹화 ({self.path})"
+
+    def close(self):
+        self.file.close()
+
+class ReplayGeocodeServer:
+    """구글/카카오/네이버 지오코딩 API 흉내를 내는 로컬 HTTP 서버
+
+    녹화된 (경로, 주소) 응답을 그대로 돌려주고, 녹화에 없는 주소는 '결과
+    없음' 응답을 줍니다. synthesize=True면 대신 주소 해시로 만든 고정 가짜
+    좌표를 돌려주므로 녹화 없이도 부하 테스트를 할 수 있습니다. latency로
+    응답 지연을, over_limit_rate로 할당량 초과(429) 응답 비율을 흉내 냅니다.
+    """
+    def __init__(self, recordings=None, host='127.0.0.1', port=0, latency=0.0,
+                 synthesize=False, over_limit_rate=0.0, seed=0):
+        self.host = host
+        self.port = port
+        self.latency = latency
+        self.synthesize = synthesize
+        self.over_limit_rate = over_limit_rate
+        self.random = random.Random(seed)
+        self.responses = {}
+        self.requests = 0
+        self.lock = threading.Lock()
+        self.server = None
+        self.thread = None
+        if recordings:
+            self.load(recordings)
+
+    def load(self, path):
+        """녹화 JSONL 파일을 읽습니다. (같은 요청은 나중 응답 사용)"""
+        with open(path, encoding='utf-8') as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                entry = json.loads(line)
+                self.responses[(entry['path'], entry['query'])] = (entry['status'], entry['body'])
+        return len(self.responses)
+
+    @staticmethod
+    def synthetic_coords(address):
+        """주소마다 항상 같은 가짜 좌표"""
+        digest = hashlib.sha1(address.encode('utf-8')).digest()
+        south, west, north, east = SYNTHETIC_BOUNDS
+        lat = south + (north - south) * int.from_bytes(digest[:4], 'big') / 0xFFFFFFFF
+        lng = west + (east - west) * int.from_bytes(digest[4:8], 'big') / 0xFFFFFFFF
+        return round(lat, 6), round(lng, 6)
+
+    def respond(self, path, query):
+        """(HTTP 상태 코드, 응답 본문)을 반환합니다."""
+        backend = BACKENDS_BY_PATH.get(path)
+        if backend is None:
+            return 404, {'error': 'unknown path'}
+
+        with self.lock:
+            self.requests += 1
+            over_limit = self.over_limit_rate and self.random.random() < self.over_limit_rate
+        if over_limit:
+            return backend.OVER_LIMIT_RESPONSE
+
+        recorded = self.responses.get((path, query))
+        if recorded is not None:
+            return recorded
+        if self.synthesize and query:
+            return 200, backend.fake_payload(*self.synthetic_coords(query))
+        return 200, backend.EMPTY_PAYLOAD
+
+    @property
+    def url(self):
+        return f"http://{self.host}:{self.port}"
+
+    def start(self):
+        """백그라운드 스레드에서 서버를 시작합니다. (port=0이면 빈 포트 사용)"""
+        standin = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+            # 헤더와 본문을 나눠 보내도 지연 ACK에 걸리지 않도록 (keep-alive 응답마다 ~40ms)
+            disable_nagle_algorithm = True
+
+            def do_GET(self):
+                url = urlparse(self.path)
+                backend = BACKENDS_BY_PATH.get(url.path)
+                params = parse_qs(url.query)
+                query = params.get(backend.query_param, [''])[0] if backend else ''
+                if standin.latency:
+                    time.sleep(standin.latency)
+
+                status, body = standin.respond(url.path, query)
+                data = json.dumps(body, ensure_ascii=False).encode('utf-8')
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json; charset=utf-8')
+                self.send_header('Content-Length', str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, format, *args):
+                pass
+
+        self.server = ThreadingHTTPServer((self.host, self.port), Handler)
+        self.server.daemon_threads = True
+        self.port = self.server.server_address[1]
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        """서버를 멈춥니다."""
+        if self.server is not None:
+            self.server.shutdown()
+            self.server.server_close()
+            self.server = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+def main():
+    parser = argparse.ArgumentParser(description="녹화한 지오코딩 응답을 재생하는 로컬 대역 서버")
+    parser.add_argument("recordings", nargs="?", help="RecordingHttp로 녹화한 JSONL 파일")
+    parser.add_argument("--port", type=int, default=8765, help="서버 포트")
+    parser.add_argument("--latency", type=float, default=0.0, help="응답마다 넣을 지연(초)")
+    parser.add_argument("--synthesize", action="store_true", help="녹화에 없는 주소는 가짜 좌표로 응답")
+    parser.add_argument("--over-limit-rate", type=float, default=0.0, help="할당량 초과 응답 비율 (0~1)")
+    args = parser.parse_args()
+
+    server = ReplayGeocodeServer(args.recordings, port=args.port, latency=args.latency,
+                                 synthesize=args.synthesize, over_limit_rate=args.over_limit_rate)
+    server.start()
+    print(f"🎭 지오코딩 대역 서버 실행 중: {server.url} (녹화 응답 {len(server.responses)}개)")
+    print("   base_url로 이 주소를 지정하세요. 종료: Ctrl+C")
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        server.stop()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,271 @@
+# geocoders.py - 주소 → 좌표 변환 공급자(구글/카카오/네이버)를 같은 방식으로 쓰기 위한 백엔드
+
+from abc import ABC, abstractmethod
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+
+from http_session import get_shared_pool
+
+# 변환 결과 (status: OK, ZERO_RESULTS, OVER_QUERY_LIMIT, REQUEST_DENIED, ERROR)
+GeocodeResult = namedtuple('GeocodeResult', ['address', 'lat', 'lng', 'confidence', 'status', 'message'])
+
+def make_result(address, status, message='', lat=None, lng=None, confidence=0.0):
+    """GeocodeResult를 만듭니다. (실패 결과는 좌표 없이)"""
+    return GeocodeResult(address, lat, lng, confidence, status, message)
+
+class GeocoderBackend(ABC):
+    """주소 묶음을 받아 GeocodeResult 목록을 돌려주는 지오코더 백엔드
+
+    하위 클래스는 build_request와 parse_response만 구현합니다. 공급자에
+    일괄 변환 API가 없으므로 geocode_batch는 keep-alive 세션 위에서
+    concurrency개씩 동시에 요청하고, rate_limiter(acquire 메서드가 있는
+    객체)로 공급자 할당량을 지킵니다.
+    """
+    name = 'base'
+    base_url = ''
+    path = ''
+    # 요청에서 주소가 들어가는 쿼리 파라미터 (대역 서버가 녹화 응답을 찾을 때 사용)
+    query_param = 'query'
+    # 대역 서버가 할당량 초과를 흉내 낼 때 돌려줄 (HTTP 상태 코드, 응답)
+    OVER_LIMIT_RESPONSE = (429, {'error': 'rate limited'})
+
+    def __init__(self, http=None, rate_limiter=None, timeout=15, concurrency=4, base_url=None):
+        self.http = http or get_shared_pool()
+        self.rate_limiter = rate_limiter
+        self.timeout = timeout
+        self.concurrency = concurrency
+        if base_url:
+            self.base_url = base_url.rstrip('/')
+
+    @property
+    def url(self):
+        return self.base_url + self.path
+
+    @abstractmethod
+    def build_request(self, address):
+        """(params, headers)를 반환합니다."""
+
+    @abstractmethod
+    def parse_response(self, address, status_code, payload):
+        """HTTP 상태 코드와 JSON 응답을 GeocodeResult로 바꿉니다."""
+
+    def geocode(self, address):
+        """주소 하나를 변환합니다. 네트워크 오류도 ERROR 결과로 돌려줍니다."""
+        params, headers = self.build_request(address)
+        if self.rate_limiter is not None:
+            self.rate_limiter.acquire()
+        try:
+            response = self.http.get(self.url, params=params, headers=headers, timeout=self.timeout)
+            try:
+                payload = response.json()
+            except ValueError:
+                payload = None
+            return self.parse_response(address, response.status_code, payload)
+        except Exception as e:
+            return make_result(address, 'ERROR', str(e))
+
+    def geocode_batch(self, addresses):
+        """주소 목록을 변환해 같은 순서의 GeocodeResult 목록을 반환합니다."""
+        addresses = list(addresses)
+        if self.concurrency <= 1 or len(addresses) <= 1:
+            return [self.geocode(address) for address in addresses]
+        with ThreadPoolExecutor(max_workers=min(self.concurrency, len(addresses))) as executor:
+            return list(executor.map(self.geocode, addresses))
+
+    @staticmethod
+    def http_error(address, status_code, payload):
+        """공급자 공통 HTTP 오류 코드를 결과로 바꿉니다. 오류가 아니면 None."""
+        if status_code in (401, 403):
+            return make_result(address, 'REQUEST_DENIED', f"HTTP {status_code}")
+        if status_code == 429:
+            return make_result(address, 'OVER_QUERY_LIMIT', f"HTTP {status_code}")
+        if status_code != 200 or not isinstance(payload, dict):
+            return make_result(address, 'ERROR', f"HTTP {status_code}")
+        return None
+
+class GoogleGeocoder(GeocoderBackend):
+    """구글 Geocoding API"""
+    name = 'google'
+    base_url = 'https://maps.googleapis.com'
+    path = '/maps/api/geocode/json'
+    query_param = 'address'
+    # 대역 서버가 녹화에 없는 주소에 돌려줄 '결과 없음' 응답
+    EMPTY_PAYLOAD = {'status': 'ZERO_RESULTS', 'results': []}
+    OVER_LIMIT_RESPONSE = (200, {'status': 'OVER_QUERY_LIMIT', 'results': []})
+    # geometry.location_type별 신뢰도
+    LOCATION_CONFIDENCE = {
+        'ROOFTOP': 1.0,
+        'RANGE_INTERPOLATED': 0.8,
+        'GEOMETRIC_CENTER': 0.6,
+        'APPROXIMATE': 0.4,
+    }
+
+    def __init__(self, api_key, language='ko', region='kr', **kwargs):
+        super().__init__(**kwargs)
+        self.api_key = api_key
+        self.language = language
+        self.region = region
+
+    def build_request(self, address):
+        params = {
+            'address': address,
+            'key': self.api_key,
+            'language': self.language,  # 한국어 우선
+            'region': self.region       # 한국 지역 우선
+        }
+        return params, None
+
+    def parse_response(self, address, status_code, payload):
+        error = self.http_error(address, status_code, payload)
+        if error is not None:
+            return error
+
+        status = payload.get('status')
+        if status == 'OK' and payload.get('results'):
+            # 첫 번째 결과 사용 (가장 정확한 결과)
+            result = payload['results'][0]
+            location = result['geometry']['location']
+            confidence = self.LOCATION_CONFIDENCE.get(result['geometry'].get('location_type'), 0.5)
+            if result.get('partial_match'):
+                confidence *= 0.8
+            return make_result(address, 'OK', lat=float(location['lat']), lng=float(location['lng']),
+                               confidence=confidence)
+        if status in ('ZERO_RESULTS', 'OVER_QUERY_LIMIT', 'REQUEST_DENIED'):
+            return make_result(address, status, payload.get('error_message', ''))
+        return make_result(address, 'ERROR', f"{status} {payload.get('error_message', '')}".strip())
+
+    @staticmethod
+    def fake_payload(lat, lng):
+        """대역 서버용 성공 응답"""
+        return {'status': 'OK', 'results': [
+            {'geometry': {'location': {'lat': lat, 'lng': lng}, 'location_type': 'ROOFTOP'}}
+        ]}
+
+class KakaoGeocoder(GeocoderBackend):
+    """카카오 로컬 API 주소 검색"""
+    name = 'kakao'
+    base_url = 'https://dapi.kakao.com'
+    path = '/v2/local/search/address.json'
+    # 대역 서버가 녹화에 없는 주소에 돌려줄 '결과 없음' 응답
+    EMPTY_PAYLOAD = {'documents': [], 'meta': {'total_count': 0}}
+    # address_type별 신뢰도 (도로명/지번 주소 일치가 가장 정확)
+    ADDRESS_CONFIDENCE = {
+        'ROAD_ADDR': 1.0,
+        'REGION_ADDR': 0.9,
+        'ROAD': 0.5,
+        'REGION': 0.4,
+    }
+
+    def __init__(self, rest_api_key, **kwargs):
+        super().__init__(**kwargs)
+        self.rest_api_key = rest_api_key
+
+    def build_request(self, address):
+        return {'query': address}, {'Authorization': f'KakaoAK {self.rest_api_key}'}
+
+    def parse_response(self, address, status_code, payload):
+        error = self.http_error(address, status_code, payload)
+        if error is not None:
+            return error
+
+        documents = payload.get('documents') or []
+        if not documents:
+            return make_result(address, 'ZERO_RESULTS')
+        document = documents[0]
+        confidence = self.ADDRESS_CONFIDENCE.get(document.get('address_type'), 0.5)
+        if len(documents) > 1:
+            confidence *= 0.8
+        return make_result(address, 'OK', lat=float(document['y']), lng=float(document['x']),
+                           confidence=confidence)
+
+    @staticmethod
+    def fake_payload(lat, lng):
+        return {'documents': [{'x': str(lng), 'y': str(lat), 'address_type': 'ROAD_ADDR'}],
+                'meta': {'total_count': 1}}
+
+class NaverGeocoder(GeocoderBackend):
+    """네이버 클라우드 플랫폼 Maps Geocoding API"""
+    name = 'naver'
+    base_url = 'https://maps.apigw.ntruss.com'
+    path = '/map-geocode/v2/geocode'
+    # 대역 서버가 녹화에 없는 주소에 돌려줄 '결과 없음' 응답
+    EMPTY_PAYLOAD = {'status': 'OK', 'meta': {'totalCount': 0}, 'addresses': [], 'errorMessage': ''}
+
+    def __init__(self, client_id, client_secret, **kwargs):
+        super().__init__(**kwargs)
+        self.client_id = client_id
+        self.client_secret = client_secret
+
+    def build_request(self, address):
+        headers = {
+            'x-ncp-apigw-api-key-id': self.client_id,
+            'x-ncp-apigw-api-key': self.client_secret,
+        }
+        return {'query': address}, headers
+
+    def parse_response(self, address, status_code, payload):
+        error = self.http_error(address, status_code, payload)
+        if error is not None:
+            return error
+
+        if payload.get('status') not in (None, 'OK'):
+            return make_result(address, 'ERROR', payload.get('errorMessage', ''))
+        addresses = payload.get('addresses') or []
+        if not addresses:
+            return make_result(address, 'ZERO_RESULTS')
+        found = addresses[0]
+        confidence = 1.0 if len(addresses) == 1 else 0.7
+        return make_result(address, 'OK', lat=float(found['y']), lng=float(found['x']),
+                           confidence=confidence)
+
+    @staticmethod
+    def fake_payload(lat, lng):
+        return {'status': 'OK', 'meta': {'totalCount': 1},
+                'addresses': [{'x': str(lng), 'y': str(lat)}], 'errorMessage': ''}
+
+
+# 대역 서버가 경로로 공급자를 알아볼 때 쓰는 목록
+BACKEND_CLASSES = (GoogleGeocoder, KakaoGeocoder, NaverGeocoder)
+
+class FailoverGeocoder:
+    """여러 백엔드를 우선순위대로 묶은 백엔드 (GeocoderBackend와 같은 geocode/geocode_batch 인터페이스)
+
+    parallel=False면 앞 백엔드가 찾지 못한 주소만 다음 백엔드에 묻고,
+    parallel=True면 모든 백엔드에 동시에 물어 우선순위가 가장 높은 성공
+    결과를 씁니다. (지연 시간을 줄이는 대신 요청 수가 늘어남)
+    """
+    name = 'failover'
+
+    def __init__(self, backends, parallel=False):
+        self.backends = list(backends)
+        self.parallel = parallel
+        self.name = '+'.join(backend.name for backend in self.backends)
+
+    def geocode(self, address):
+        return self.geocode_batch([address])[0]
+
+    def geocode_batch(self, addresses):
+        addresses = list(addresses)
+        if self.parallel:
+            with ThreadPoolExecutor(max_workers=len(self.backends)) as executor:
+                runs = list(executor.map(lambda backend: backend.geocode_batch(addresses), self.backends))
+            return [
+                next((result for result in results if result.status == 'OK'), results[0])
+                for results in zip(*runs)
+            ]
+
+        results = [None] * len(addresses)
+        pending = list(range(len(addresses)))
+        for backend in self.backends:
+            if not pending:
+                break
+            batch = backend.geocode_batch([addresses[i] for i in pending])
+            still_pending = []
+            for i, result in zip(pending, batch):
+                # 처음 받은 실패 결과를 남겨 두고, 성공하면 덮어씀
+                if results[i] is None or result.status == 'OK':
+                    results[i] = result
+                if result.status != 'OK':
+                    still_pending.append(i)
+            pending = still_pending
+        return results
@@ -0,0 +1,141 @@
+# homepage_verifier.py - 홈페이지 후보 URL이 실제로 열리는지 동시에 확인하는 검증기
+
+import html
+import re
+import socket
+import threading
+import time
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit
+
+from http_session import HttpSessionPool
+
+# 확인 결과 (alive: 최종 응답이 400 미만, parked: 도메인 판매/주차 페이지로 보임)
+HomepageCheck = namedtuple('HomepageCheck', ['url', 'alive', 'status', 'final_url', 'title', 'parked', 'seconds'])
+
+# 주차(판매 중) 도메인 페이지에 흔히 나오는 문구 (소문자)
+PARKED_KEYWORDS = [
+    'domain for sale', 'this domain is for sale', 'buy this domain', 'domain is parked',
+    'parked free', 'parkingcrew', 'sedoparking', 'hugedomains', 'dan.com',
+    '도메인 판매', '도메인을 구매', '도메인 구입', '이 도메인은 판매',
+]
+
+TITLE_REGEX = re.compile(rb'<title[^>]*>(.*?)</title', re.IGNORECASE | re.DOTALL)
+
+class HomepageVerifier:
+    """홈페이지 후보 URL을 짧은 GET 요청으로 동시에 확인하는 검증기
+
+    리다이렉트를 따라간 최종 응답의 상태 코드와 URL, 본문 앞부분(max_bytes)의
+    <title>을 확인합니다. 요청은 concurrency개 스레드에서 동시에 보내고,
+    호스트별 동시 요청은 per_host개로 제한합니다. 호스트 DNS 조회 결과와
+    URL별 확인 결과는 실행하는 동안 캐시하므로, 이름이 풀리지 않는 도메인은
+    요청 없이 바로 실패로 처리하고 같은 URL은 한 번만 확인합니다.
+    rate_limiter(HostRateLimiter처럼 wait(url)이 있는 객체)를 주면 요청마다
+    그 호스트별 요청 간격을 지킵니다.
+    """
+    def __init__(self, http=None, top_k=3, concurrency=16, per_host=2, timeout=5, max_bytes=32768,
+                 headers=None):
+        # 확인용 요청은 재시도 없이 짧게 (기본 세션 풀의 5xx 재시도/백오프를 쓰지 않음)
+        self.owns_http = http is None
+        self.http = http or HttpSessionPool(pool_maxsize=per_host, retries=0, timeout=timeout)
+        self.top_k = top_k
+        self.per_host = per_host
+        self.timeout = timeout
+        self.max_bytes = max_bytes
+        self.headers = headers
+        self.executor = ThreadPoolExecutor(max_workers=concurrency)
+        self.lock = threading.Lock()
+        # 호스트 → 이름 풀림 여부, 호스트 → 동시 요청 제한, URL → 확인 Future
+        self.dns_cache = {}
+        self.host_slots = {}
+        self.checks = {}
+
+    def resolve(self, host):
+        """호스트 이름이 풀리는지 확인합니다. (결과 캐시)"""
+        resolved = self.dns_cache.get(host)
+        if resolved is None:
+            try:
+                socket.getaddrinfo(host, None)
+                resolved = True
+            except (socket.gaierror, UnicodeError):
+                resolved = False
+            self.dns_cache[host] = resolved
+        return resolved
+
+    def host_slot(self, host):
+        """호스트별 동시 요청 제한 세마포어"""
+        with self.lock:
+            slot = self.host_slots.get(host)
+            if slot is None:
+                slot = self.host_slots[host] = threading.BoundedSemaphore(self.per_host)
+            return slot
+
+    @staticmethod
+    def is_parked(title, body):
+        """제목이나 본문 앞부분에 도메인 판매/주차 문구가 있는지 확인합니다."""
+        text = (title + ' ' + body.decode('utf-8', errors='ignore')).lower()
+        return any(keyword in text for keyword in PARKED_KEYWORDS)
+
+    @staticmethod
+    def decode_title(raw, response):
+        """제목 바이트를 문자열로 (헤더에 charset이 없으면 UTF-8, 안 되면 CP949)"""
+        if 'charset' in response.headers.get('Content-Type', '').lower() and response.encoding:
+            try:
+                return raw.decode(response.encoding, errors='replace')
+            except LookupError:
+                pass
+        try:
+            return raw.decode('utf-8')
+        except UnicodeDecodeError:
+            return raw.decode('cp949', errors='replace')
+
+    def check(self, url, rate_limiter=None):
+        """URL 하나를 확인해 HomepageCheck를 반환합니다. (네트워크 오류도 결과로)"""
+        started = time.perf_counter()
+        host = urlsplit(url).hostname or ''
+        if not host or not self.resolve(host):
+            return HomepageCheck(url, False, None, None, '', False, time.perf_counter() - started)
+
+        if rate_limiter is not None:
+            rate_limiter.wait(url)
+        try:
+            with self.host_slot(host):
+                response = self.http.get(url, headers=self.headers, timeout=self.timeout,
+                                         allow_redirects=True, stream=True)
+                try:
+                    body = b''
+                    if 'html' in response.headers.get('Content-Type', 'text/html').lower():
+                        for chunk in response.iter_content(8192):
+                            body += chunk
+                            if len(body) >= self.max_bytes or b'</title' in body.lower():
+                                break
+                finally:
+                    response.close()
+        except Exception:
+            return HomepageCheck(url, False, None, None, '', False, time.perf_counter() - started)
+
+        title = ''
+        match = TITLE_REGEX.search(body)
+        if match:
+            title = ' '.join(html.unescape(self.decode_title(match.group(1), response)).split())
+        alive = response.status_code < 400
+        return HomepageCheck(url, alive, response.status_code, response.url, title,
+                             alive and self.is_parked(title, body), time.perf_counter() - started)
+
+    def check_many(self, urls, rate_limiter=None):
+        """URL 목록을 동시에 확인해 같은 순서의 HomepageCheck 목록을 반환합니다."""
+        futures = []
+        with self.lock:
+            for url in urls:
+                future = self.checks.get(url)
+                if future is None:
+                    future = self.checks[url] = self.executor.submit(self.check, url, rate_limiter)
+                futures.append(future)
+        return [future.result() for future in futures]
+
+    def close(self):
+        """확인 스레드와 (직접 만든) 세션 풀을 정리합니다."""
+        self.executor.shutdown(wait=True)
+        if self.owns_http:
+            self.http.close()
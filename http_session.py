@@ -0,0 +1,130 @@
+# http_session.py - 회원사 정보 수집/지도 생성이 함께 쓰는 HTTP 세션 풀
+
+import threading
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# 호스트별 기본 연결 풀 크기
+DEFAULT_HOST_POOL_SIZES = {
+    'search.naver.com': 16,
+    'maps.googleapis.com': 32,
+    'www.saramin.co.kr': 4,
+    'www.jobkorea.co.kr': 4,
+    'www.work.go.kr': 4,
+    'www.incruit.com': 4,
+}
+# 전용 풀이 없는 호스트(회사 홈페이지, 구인사이트 하위 도메인, 지오코더 주소 등)를 위해
+# 기본 어댑터가 동시에 유지하는 호스트별 풀 수
+DEFAULT_POOL_CONNECTIONS = 32
+
+class HttpSessionPool:
+    """keep-alive 연결을 재사용하는 requests 세션 (호스트별 연결 풀)"""
+    def __init__(self, pool_maxsize=10, host_pool_sizes=None, retries=3,
+                 backoff_factor=0.5, timeout=10, headers=None):
+        self.timeout = timeout
+        self.retry = Retry(
+            total=retries,
+            backoff_factor=backoff_factor,
+            status_forcelist=(500, 502, 503, 504),
+            raise_on_status=False
+        )
+        self.session = requests.Session()
+        if headers:
+            self.session.headers.update(headers)
+
+        self.adapters = {}
+        # 풀 수 제한으로 닫힌 풀의 호스트별 요청/연결 수 (stats에 더함)
+        self.retired = {}
+        self.lock = threading.Lock()
+        self.default_adapter = self.make_adapter(pool_maxsize, DEFAULT_POOL_CONNECTIONS)
+        self.session.mount('http://', self.default_adapter)
+        self.session.mount('https://', self.default_adapter)
+
+        sizes = dict(DEFAULT_HOST_POOL_SIZES)
+        sizes.update(host_pool_sizes or {})
+        for host, size in sizes.items():
+            self.mount_host(host, size)
+
+    def make_adapter(self, pool_maxsize, pool_connections=1):
+        """연결 풀 크기와 재시도 설정이 적용된 어댑터를 만듭니다.
+
+        pool_connections개를 넘는 호스트의 풀은 오래 안 쓴 것부터 닫히는데,
+        닫히기 전에 요청/연결 수를 retired에 옮겨 stats가 잃지 않게 합니다.
+        """
+        adapter = HTTPAdapter(pool_connections=pool_connections, pool_maxsize=pool_maxsize,
+                              max_retries=self.retry, pool_block=False)
+        pools = adapter.poolmanager.pools
+        dispose = pools.dispose_func
+
+        def retire(pool):
+            with self.lock:
+                entry = self.retired.setdefault(pool.host, {'requests': 0, 'connections': 0})
+                entry['requests'] += pool.num_requests
+                entry['connections'] += pool.num_connections
+            if dispose is not None:
+                dispose(pool)
+
+        pools.dispose_func = retire
+        return adapter
+
+    def mount_host(self, host, pool_maxsize):
+        """특정 호스트 전용 연결 풀을 등록합니다."""
+        adapter = self.make_adapter(pool_maxsize)
+        self.adapters[host] = adapter
+        self.session.mount(f'http://{host}/', adapter)
+        self.session.mount(f'https://{host}/', adapter)
+
+    def get(self, url, **kwargs):
+        """GET 요청 (timeout 미지정 시 기본값 사용)"""
+        kwargs.setdefault('timeout', self.timeout)
+        return self.session.get(url, **kwargs)
+
+    def stats(self):
+        """호스트별 요청 수와 새로 연 연결 수, 재사용 비율을 반환합니다."""
+        with self.lock:
+            per_host = {host: dict(entry) for host, entry in self.retired.items()}
+        adapters = list(self.adapters.values()) + [self.default_adapter]
+        for adapter in adapters:
+            pools = adapter.poolmanager.pools
+            for key in list(pools.keys()):
+                pool = pools.get(key)
+                if pool is None:
+                    continue
+                host = pool.host
+                entry = per_host.setdefault(host, {'requests': 0, 'connections': 0})
+                entry['requests'] += pool.num_requests
+                entry['connections'] += pool.num_connections
+
+        total_requests = sum(e['requests'] for e in per_host.values())
+        total_connections = sum(e['connections'] for e in per_host.values())
+        reused = max(0, total_requests - total_connections)
+        return {
+            'requests': total_requests,
+            'connections': total_connections,
+            'reused': reused,
+            'reuse_ratio': reused / total_requests if total_requests else 0.0,
+            'hosts': per_host,
+        }
+
+    def summary(self):
+        """통계를 한 줄 문자열로 반환합니다."""
+        s = self.stats()
+        return (f"HTTP 요청 {s['requests']}회, 새 연결 {s['connections']}개, "
+                f"연결 재사용 {s['reused']}회 ({s['reuse_ratio']:.0%})")
+
+    def close(self):
+        """세션과 연결 풀을 닫습니다."""
+        self.session.close()
+
+_shared_pool = None
+_shared_lock = threading.Lock()
+
+def get_shared_pool():
+    """프로세스 전체에서 공유하는 세션 풀을 반환합니다."""
+    global _shared_pool
+    with _shared_lock:
+        if _shared_pool is None:
+            _shared_pool = HttpSessionPool()
+        return _shared_pool
@@ -0,0 +1,319 @@
+# juso_geocoder.py - 도로명주소 DB(juso.go.kr 위치정보요약DB)로 주소를 좌표로 바꾸는 오프라인 지오코더
+
+import argparse
+import glob
+import io
+import math
+import os
+import re
+import sqlite3
+import time
+import zipfile
+
+# 위치정보요약DB(entrc_*.txt) 열 위치 ('|' 구분, cp949)
+# 시군구코드|출입구일련번호|법정동코드|시도명|시군구명|읍면동명|도로명코드|도로명|지하여부|
+# 건물본번|건물부번|건물명|우편번호|건물용도분류|건물군여부|관할행정동|X좌표|Y좌표
+JUSO_COLUMNS = {
+    'sido': 3,
+    'sigungu': 4,
+    'road': 7,
+    'underground': 8,
+    'main': 9,
+    'sub': 10,
+    'x': 16,
+    'y': 17,
+}
+
+# 시도 이름 → 짧은 키 (앞 두 글자가 아닌 것만)
+SIDO_ALIASES = {
+    '충청북도': '충북', '충청남도': '충남',
+    '전라북도': '전북', '전북특별자치도': '전북', '전라남도': '전남',
+    '경상북도': '경북', '경상남도': '경남',
+}
+SIDO_KEYS = {
+    '서울', '부산', '대구', '인천', '광주', '대전', '울산', '세종', '경기', '강원',
+    '충북', '충남', '전북', '전남', '경북', '경남', '제주',
+}
+
+# 도로명 + 건물번호 (예: 테헤란로 152, 강남대로 94길 15, 판교역로 지하 235-1)
+ROAD_ADDRESS_PATTERN = re.compile(
+    r'(?:^|\s)(?P<road>\S+(?:로|길)(?:\s*\d+(?:번)?길)?)\s+'
+    r'(?P<underground>지하\s*)?(?P<main>\d+)(?:-(?P<sub>\d+))?(?!\d)'
+)
+
+# UTM-K (GRS80, EPSG:5179) 투영 상수
+GRS80_A = 6378137.0
+GRS80_F = 1 / 298.257222101
+UTMK_LAT0 = 38.0
+UTMK_LON0 = 127.5
+UTMK_K0 = 0.9996
+UTMK_FALSE_EASTING = 1000000.0
+UTMK_FALSE_NORTHING = 2000000.0
+
+def sido_key(name):
+    """시도 이름을 비교용 짧은 키로 바꿉니다. (서울특별시/서울시/서울 → 서울)"""
+    name = name.strip()
+    return SIDO_ALIASES.get(name, name[:2])
+
+def compact(text):
+    """공백을 없앤 비교용 문자열"""
+    return re.sub(r'\s+', '', text or '')
+
+def _meridian_arc(phi, e2):
+    """적도에서 위도 phi까지의 자오선 호 길이"""
+    return GRS80_A * (
+        (1 - e2 / 4 - 3 * e2 ** 2 / 64 - 5 * e2 ** 3 / 256) * phi
+        - (3 * e2 / 8 + 3 * e2 ** 2 / 32 + 45 * e2 ** 3 / 1024) * math.sin(2 * phi)
+        + (15 * e2 ** 2 / 256 + 45 * e2 ** 3 / 1024) * math.sin(4 * phi)
+        - (35 * e2 ** 3 / 3072) * math.sin(6 * phi)
+    )
+
+def utmk_to_wgs84(x, y):
+    """UTM-K 좌표(m)를 WGS84 위경도로 변환합니다. (횡메르카토르 역변환)"""
+    e2 = GRS80_F * (2 - GRS80_F)
+    ep2 = e2 / (1 - e2)
+    e1 = (1 - math.sqrt(1 - e2)) / (1 + math.sqrt(1 - e2))
+
+    m = _meridian_arc(math.radians(UTMK_LAT0), e2) + (y - UTMK_FALSE_NORTHING) / UTMK_K0
+    mu = m / (GRS80_A * (1 - e2 / 4 - 3 * e2 ** 2 / 64 - 5 * e2 ** 3 / 256))
+    phi1 = (mu
+            + (3 * e1 / 2 - 27 * e1 ** 3 / 32) * math.sin(2 * mu)
+            + (21 * e1 ** 2 / 16 - 55 * e1 ** 4 / 32) * math.sin(4 * mu)
+            + (151 * e1 ** 3 / 96) * math.sin(6 * mu)
+            + (1097 * e1 ** 4 / 512) * math.sin(8 * mu))
+
+    sin1 = math.sin(phi1)
+    cos1 = math.cos(phi1)
+    tan1 = math.tan(phi1)
+    c1 = ep2 * cos1 ** 2
+    t1 = tan1 ** 2
+    n1 = GRS80_A / math.sqrt(1 - e2 * sin1 ** 2)
+    r1 = GRS80_A * (1 - e2) / (1 - e2 * sin1 ** 2) ** 1.5
+    d = (x - UTMK_FALSE_EASTING) / (n1 * UTMK_K0)
+
+    lat = phi1 - (n1 * tan1 / r1) * (
+        d ** 2 / 2
+        - (5 + 3 * t1 + 10 * c1 - 4 * c1 ** 2 - 9 * ep2) * d ** 4 / 24
+        + (61 + 90 * t1 + 298 * c1 + 45 * t1 ** 2 - 252 * ep2 - 3 * c1 ** 2) * d ** 6 / 720
+    )
+    lng = math.radians(UTMK_LON0) + (
+        d
+        - (1 + 2 * t1 + c1) * d ** 3 / 6
+        + (5 - 2 * c1 + 28 * t1 - 3 * c1 ** 2 + 8 * ep2 + 24 * t1 ** 2) * d ** 5 / 120
+    ) / cos1
+    return math.degrees(lat), math.degrees(lng)
+
+def parse_road_address(address):
+    """도로명주소를 (시도 키, 시군구, 도로명, 지하여부, 본번, 부번)으로 나눕니다.
+
+    시도/시군구가 없는 주소는 해당 값이 None입니다. 도로명과 건물번호를
+    찾지 못하면 None을 반환합니다.
+    """
+    # 괄호 안 참고항목과 쉼표 뒤 상세주소(층, 호수 등)는 제외
+    text = re.sub(r'\([^)]*\)', ' ', address or '').split(',')[0]
+    match = ROAD_ADDRESS_PATTERN.search(text)
+    if match is None:
+        return None
+
+    tokens = text[:match.start()].split()
+    sido = None
+    if tokens and sido_key(tokens[0]) in SIDO_KEYS:
+        sido = sido_key(tokens.pop(0))
+    # 읍/면/동은 도로명주소 키에 쓰지 않음
+    sigungu = ''.join(token for token in tokens if token[-1] in '시군구') or None
+
+    return (
+        sido,
+        sigungu,
+        compact(match.group('road')),
+        1 if match.group('underground') else 0,
+        int(match.group('main')),
+        int(match.group('sub') or 0),
+    )
+
+class JusoGeocoder:
+    """도로명주소 DB를 SQLite 파일에 색인해 두고 네트워크 없이 좌표를 찾는 지오코더
+
+    건물 표는 (시도, 시군구, 도로명, 본번, 부번, 지하여부)를 기본 키로 하는
+    WITHOUT ROWID 표라서 시도→시군구→도로명→건물번호 순의 접두사 색인(B-트리)
+    자체에 좌표가 함께 저장됩니다. 시도/시군구가 빠지거나 표기가 다른 주소는
+    (도로명, 본번, 부번) 보조 색인으로 찾고, 후보가 한 곳일 때만 사용합니다.
+    """
+    def __init__(self, db_path="juso_geocoder.sqlite"):
+        self.db_path = db_path
+        self.hits = 0
+        self.misses = 0
+        self.lookup_seconds = 0.0
+
+        self.conn = sqlite3.connect(db_path)
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS building ("
+            " sido TEXT, sigungu TEXT, road TEXT, main INTEGER, sub INTEGER, underground INTEGER,"
+            " lat REAL, lng REAL,"
+            " PRIMARY KEY (sido, sigungu, road, main, sub, underground)) WITHOUT ROWID"
+        )
+        self.conn.execute("CREATE INDEX IF NOT EXISTS idx_building_road ON building (road, main, sub)")
+        self.conn.commit()
+
+    def __len__(self):
+        return self.conn.execute("SELECT COUNT(*) FROM building").fetchone()[0]
+
+    @staticmethod
+    def dump_files(path):
+        """덤프 경로(txt 파일, 폴더, zip)에 든 txt 파일을 바이너리 스트림으로 하나씩 엽니다."""
+        if os.path.isdir(path):
+            paths = sorted(glob.glob(os.path.join(path, '*.txt')) + glob.glob(os.path.join(path, '*.zip')))
+        else:
+            paths = [path]
+
+        for file_path in paths:
+            if file_path.lower().endswith('.zip'):
+                with zipfile.ZipFile(file_path) as archive:
+                    for member in sorted(archive.namelist()):
+                        if member.lower().endswith('.txt'):
+                            with archive.open(member) as f:
+                                yield f
+            else:
+                with open(file_path, 'rb') as f:
+                    yield f
+
+    def iter_dump_rows(self, path, encoding='cp949', columns=None):
+        """덤프 파일의 건물 행을 (시도 키, 시군구, 도로명, 본번, 부번, 지하여부, 위도, 경도)로 읽습니다."""
+        columns = columns or JUSO_COLUMNS
+        width = max(columns.values()) + 1
+        for f in self.dump_files(path):
+            for line in io.TextIOWrapper(f, encoding=encoding, errors='replace'):
+                fields = line.rstrip('\r\n').split('|')
+                if len(fields) < width:
+                    continue
+                try:
+                    x = float(fields[columns['x']])
+                    y = float(fields[columns['y']])
+                    main = int(fields[columns['main']])
+                    sub = int(fields[columns['sub']] or 0)
+                except ValueError:
+                    continue
+
+                lat, lng = utmk_to_wgs84(x, y)
+                yield (
+                    sido_key(fields[columns['sido']]),
+                    compact(fields[columns['sigungu']]),
+                    compact(fields[columns['road']]),
+                    main,
+                    sub,
+                    1 if fields[columns['underground']].strip() in ('1', 'Y') else 0,
+                    lat,
+                    lng,
+                )
+
+    def import_dump(self, path, encoding='cp949', columns=None, batch_size=10000):
+        """juso.go.kr 위치정보요약DB 덤프를 읽어 색인에 넣고, 넣은 행 수를 반환합니다.
+
+        출입구가 여러 개인 건물은 처음 나온 출입구 좌표를 사용합니다.
+        """
+        started = time.time()
+        self.conn.execute("PRAGMA synchronous = OFF")
+        self.conn.execute("PRAGMA journal_mode = MEMORY")
+        # 보조 색인은 다 넣은 뒤 한 번에 만드는 편이 빠름
+        self.conn.execute("DROP INDEX IF EXISTS idx_building_road")
+
+        count = 0
+        batch = []
+        insert = "INSERT OR IGNORE INTO building VALUES (?, ?, ?, ?, ?, ?, ?, ?)"
+        with self.conn:
+            for row in self.iter_dump_rows(path, encoding, columns):
+                batch.append(row)
+                if len(batch) >= batch_size:
+                    count += self.conn.executemany(insert, batch).rowcount
+                    batch = []
+            if batch:
+                count += self.conn.executemany(insert, batch).rowcount
+            self.conn.execute("CREATE INDEX IF NOT EXISTS idx_building_road ON building (road, main, sub)")
+
+        self.conn.execute("PRAGMA synchronous = FULL")
+        print(f"🏠 도로명주소 DB 가져오기 완료: 건물 {count}개 ({time.time() - started:.1f}초)")
+        return count
+
+    def lookup(self, address):
+        """주소의 좌표를 반환합니다. 색인에 없거나 후보가 여럿이면 None."""
+        started = time.perf_counter()
+        coords = self.find(address)
+        self.lookup_seconds += time.perf_counter() - started
+        if coords is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return coords
+
+    def find(self, address):
+        """lookup의 검색 부분 (통계 없이)"""
+        parsed = parse_road_address(address)
+        if parsed is None:
+            return None
+        sido, sigungu, road, underground, main, sub = parsed
+
+        # 1) 시도→시군구→도로명→건물번호 기본 키로 바로 찾기
+        if sido is not None:
+            row = self.conn.execute(
+                "SELECT lat, lng FROM building"
+                " WHERE sido = ? AND sigungu = ? AND road = ? AND main = ? AND sub = ? AND underground = ?",
+                (sido, sigungu or '', road, main, sub, underground)
+            ).fetchone()
+            if row is not None:
+                return {'lat': row[0], 'lng': row[1]}
+
+        # 2) 도로명+건물번호로 찾고 시도/시군구가 맞는 후보가 한 곳이면 사용
+        candidates = self.conn.execute(
+            "SELECT sido, sigungu, lat, lng FROM building"
+            " WHERE road = ? AND main = ? AND sub = ? AND underground = ?",
+            (road, main, sub, underground)
+        ).fetchall()
+        if sido is not None:
+            candidates = [c for c in candidates if c[0] == sido]
+        if sigungu:
+            # '분당구'처럼 시를 빼고 쓴 주소도 '성남시분당구'와 맞춰 봄
+            candidates = [c for c in candidates if c[1].endswith(sigungu) or sigungu.endswith(c[1])]
+
+        if len({(c[0], c[1]) for c in candidates}) != 1:
+            return None
+        return {'lat': candidates[0][2], 'lng': candidates[0][3]}
+
+    def reset_stats(self):
+        """통계를 초기화합니다."""
+        self.hits = 0
+        self.misses = 0
+        self.lookup_seconds = 0.0
+
+    def close(self):
+        """DB 연결을 닫습니다."""
+        self.conn.close()
+
+def main():
+    parser = argparse.ArgumentParser(description="도로명주소 DB 덤프를 오프라인 지오코더 색인으로 가져오거나 주소를 찾습니다.")
+    parser.add_argument("--db", default="juso_geocoder.sqlite", help="색인 SQLite 파일 경로")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    import_parser = subparsers.add_parser("import", help="위치정보요약DB 덤프(txt 파일, 폴더, zip) 가져오기")
+    import_parser.add_argument("dump", help="덤프 파일 또는 폴더 경로")
+    import_parser.add_argument("--encoding", default="cp949", help="덤프 파일 인코딩")
+
+    lookup_parser = subparsers.add_parser("lookup", help="주소 좌표 찾기")
+    lookup_parser.add_argument("addresses", nargs="+", help="찾을 도로명주소")
+    args = parser.parse_args()
+
+    geocoder = JusoGeocoder(args.db)
+    try:
+        if args.command == "import":
+            geocoder.import_dump(args.dump, encoding=args.encoding)
+        else:
+            for address in args.addresses:
+                coords = geocoder.lookup(address)
+                if coords:
+                    print(f"✅ {address}: ({coords['lat']:.6f}, {coords['lng']:.6f})")
+                else:
+                    print(f"❌ {address}: 찾을 수 없습니다.")
+    finally:
+        geocoder.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,200 @@
+# member_map_pipeline.py - 회원사 목록에서 지도까지 한 번에 처리하는 스트리밍 파이프라인
+
+import argparse
+import os
+import queue
+import threading
+import time
+
+from excel_stream import ExcelStreamWriter
+from member_visit import CompanyInfoCollector
+from member_visit_view_upload import ExcelToGoogleMap
+from run_manifest import RunManifest
+from run_metrics import RunMetrics
+
+class MemberMapPipeline:
+    """주소/홈페이지 수집 → 지오코딩 → 지도 HTML 생성을 한 프로세스에서 잇는 파이프라인
+
+    수집 단계(CompanyInfoCollector.iter_collected_rows)가 주소를 찾은 행을
+    내보내는 대로 지오코딩 단계(ExcelToGoogleMap.geocode_stream)로 넘기므로
+    중간 엑셀 파일을 쓰고 다시 읽지 않습니다. 수집은 별도 스레드에서 돌고,
+    다음 검색을 기다리는 동안에는 지오코딩 단계에 틱을 보내 모아 둔 주소를
+    batch_wait초 안에 요청하게 합니다. 첫 위치가 나오면 바로 지도를
+    한 번 그리고, 이후 render_interval초마다 지금까지의 위치로 다시 그려
+    수집이 끝나기 전에도 지도를 열어 볼 수 있습니다. 마지막 지도는 입력
+    순서대로 정렬한 전체 위치로 그립니다. xlsx_path를 주면 수집 결과 엑셀도
+    함께 기록합니다. (선택 출력) external_data=True면 지도 데이터를 별도 파일과
+    미리 압축한 .gz/.br 파일로 내보냅니다. (ExcelToGoogleMap.generate_html 참고)
+
+    수집기와 지도 생성기가 같은 실행 매니페스트를 쓰면 바뀌지 않은 행은 검색과
+    지오코딩을 건너뛰고, 새로 찾은 위치가 없으면 중간 지도도 그리지 않으며,
+    위치 목록이 지난번과 같으면 마지막 지도도 다시 만들지 않습니다.
+    """
+    def __init__(self, collector, mapper, output_path="회원사_지도_구글.html", xlsx_path=None,
+                 render_interval=30.0, batch_wait=2.0, external_data=False):
+        self.collector = collector
+        self.mapper = mapper
+        self.output_path = output_path
+        self.xlsx_path = xlsx_path
+        self.render_interval = render_interval
+        self.batch_wait = batch_wait
+        self.external_data = external_data
+        self.metrics = mapper.metrics
+        self.renders = 0
+
+    def collected_rows(self, concurrency, host_rate):
+        """수집이 끝난 행의 (회원사명, 주소)를 원래 행 순서대로 내보냅니다. (xlsx_path면 엑셀에도 기록)"""
+        writer = ExcelStreamWriter(self.xlsx_path, self.collector.output_columns()) if self.xlsx_path else None
+        try:
+            for _, row, company_name in self.collector.iter_collected_rows(concurrency, host_rate):
+                if writer is not None:
+                    with self.metrics.timer('save'):
+                        writer.append_dict(row)
+                yield company_name, row.get('주소')
+        finally:
+            # 수집/지오코딩 중 오류로 멈춰도 그때까지의 행은 엑셀에 남김
+            if writer is not None:
+                with self.metrics.timer('save'):
+                    writer.close()
+                print(f"💾 수집 결과 저장: {self.xlsx_path} ({writer.count}개 행)")
+
+    def threaded_rows(self, rows):
+        """rows를 수집 스레드에서 읽어 넘기고, 새 행 없이 잠시 지나면 None(틱)을 내보내는 생성기"""
+        items = queue.Queue(maxsize=1000)
+        stop = threading.Event()
+        # 새 행을 기다리다 틱을 보내는 간격 (지오코딩 묶음 대기 시간보다 짧게)
+        tick = max(self.batch_wait / 4, 0.05)
+        
+        def offer(item):
+            # 소비 쪽이 멈췄으면 큐가 차도 기다리지 않음
+            while not stop.is_set():
+                try:
+                    items.put(item, timeout=0.1)
+                    return True
+                except queue.Full:
+                    continue
+            return False
+        
+        def produce():
+            try:
+                for row in rows:
+                    if not offer(('row', row)):
+                        break
+                else:
+                    offer(('end', None))
+            except Exception as e:
+                offer(('error', e))
+            finally:
+                # 수집 단계 정리(저널/엑셀 닫기)는 생성기를 돌린 스레드에서
+                rows.close()
+        
+        thread = threading.Thread(target=produce, name='collector', daemon=True)
+        thread.start()
+        try:
+            while True:
+                try:
+                    kind, value = items.get(timeout=tick)
+                except queue.Empty:
+                    yield None
+                    continue
+                if kind == 'error':
+                    raise value
+                if kind == 'end':
+                    return
+                yield value
+        finally:
+            stop.set()
+            thread.join()
+
+    def render(self, final=False):
+        """지금까지 찾은 위치로 지도를 그립니다. (마지막에는 위치 목록이 바뀐 경우에만)"""
+        with self.metrics.timer('html'):
+            if final:
+                if not self.mapper.generate_html_if_changed(self.output_path, external_data=self.external_data):
+                    return
+            else:
+                self.mapper.generate_html(self.output_path, external_data=self.external_data)
+        self.renders += 1
+        if self.renders == 1:
+            self.metrics.gauge('first_map_seconds', round(self.metrics.elapsed(), 3))
+
+    def run(self, concurrency=8, host_rate=2.0):
+        """전체 파이프라인을 실행합니다."""
+        print("🚀 회원사 지도 파이프라인 (수집 → 지오코딩 → 지도)")
+        print("=" * 60)
+
+        self.metrics.start_snapshots()
+        rows = None
+        try:
+            if not self.mapper.prepare_geocoding():
+                return False
+
+            rows = self.threaded_rows(self.collected_rows(concurrency, host_rate))
+            last_render = None
+            for _ in self.mapper.geocode_stream(rows, self.batch_wait):
+                # 지난 실행과 같은 위치만 나오는 동안은 그리지 않음
+                if not self.mapper.new_locations:
+                    continue
+                # 간격은 지난 그리기가 끝난 때부터 (위치가 많아 그리기가 느려져도 수집이 밀리지 않게)
+                if last_render is None or time.perf_counter() - last_render >= self.render_interval:
+                    self.render()
+                    last_render = time.perf_counter()
+
+            if not self.mapper.company_locations:
+                print("❌ 좌표를 찾은 회원사가 없어 지도를 만들지 않았습니다.")
+                return False
+            self.render(final=True)
+            manifest = self.mapper.manifest
+            if manifest is not None:
+                manifest.save()
+        finally:
+            # 오류로 멈췄을 때도 수집 단계를 바로 정리 (저널/엑셀 닫기)
+            if rows is not None:
+                rows.close()
+            self.mapper.finish_metrics()
+
+        print(f"🔌 {self.mapper.http.summary()}")
+        print("\n" + "=" * 60)
+        print(f"🎉 모든 작업이 완료되었습니다! (지도 {self.renders}회 갱신)")
+        return True
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="회원사 목록에서 주소를 수집해 바로 구글 지도로 만드는 파이프라인")
+    parser.add_argument('excel_file', nargs='?', default="회원사 목록.xlsx", help="회원사 목록 엑셀 파일 경로")
+    parser.add_argument('--api-key', default=os.environ.get('GOOGLE_MAPS_API_KEY'),
+                        help="구글 지도 API 키 (기본: 환경 변수 GOOGLE_MAPS_API_KEY)")
+    parser.add_argument('--output', default="회원사_지도_구글.html", help="지도 HTML 경로")
+    parser.add_argument('--xlsx', default=None, help="수집 결과 엑셀도 기록할 경로 (선택)")
+    parser.add_argument('--concurrency', type=int, default=8, help="동시 검색 수")
+    parser.add_argument('--host-rate', type=float, default=2.0, help="호스트별 초당 요청 수")
+    parser.add_argument('--resume', action='store_true', help="수집 저널을 읽어 이미 찾은 행은 다시 검색하지 않음")
+    parser.add_argument('--replay', action='store_true', help="네트워크 없이 캐시된 검색 페이지만 사용")
+    parser.add_argument('--offline', action='store_true', help="지오코딩 API를 호출하지 않고 좌표 캐시만 사용")
+    parser.add_argument('--juso-db', default="juso_geocoder.sqlite", help="도로명주소 DB 색인 경로 (없으면 사용 안 함)")
+    parser.add_argument('--external-data', action='store_true',
+                        help="지도 데이터를 별도 파일로 내보내고 .gz/.br 압축본도 생성 (웹 서버로 제공할 때)")
+    parser.add_argument('--render-interval', type=float, default=30.0, help="수집 중 지도를 다시 그리는 간격(초)")
+    parser.add_argument('--batch-wait', type=float, default=2.0, help="지오코딩 요청을 모으는 최대 대기 시간(초)")
+    parser.add_argument('--metrics', default=None, help="단계별 계측 결과 JSON 경로 (같은 이름의 .prom 파일도 생성)")
+    parser.add_argument('--metrics-interval', type=float, default=0, help="계측 중간 스냅샷 간격(초), 0이면 끝날 때만")
+    parser.add_argument('--quiet', action='store_true', help="행별 출력 대신 진행 상황 한 줄만 표시")
+    parser.add_argument('--full', action='store_true',
+                        help="실행 매니페스트를 무시하고 모든 행을 다시 처리 (매니페스트는 새로 기록)")
+    args = parser.parse_args()
+
+    if not args.api_key:
+        print("🛑 구글 지도 API 키를 --api-key 또는 환경 변수 GOOGLE_MAPS_API_KEY로 지정해주세요.")
+    else:
+        # 수집과 지오코딩이 한 계측 결과를 함께 씀
+        metrics = RunMetrics('pipeline', args.metrics, args.metrics_interval)
+        # 수집(회사명, 주소 → 주소/홈페이지)과 지오코딩(회원사명, 주소 → 좌표)이 한 매니페스트의 다른 구역을 씀
+        manifest = RunManifest(os.path.splitext(args.excel_file)[0] + '_manifest.json', fresh=args.full)
+        collector = CompanyInfoCollector(args.excel_file, replay=args.replay, resume=args.resume,
+                                         metrics=metrics, quiet=args.quiet, manifest=manifest)
+        juso_db = args.juso_db if os.path.exists(args.juso_db) else None
+        mapper = ExcelToGoogleMap(args.excel_file, args.api_key, offline=args.offline, local_geocoder=juso_db,
+                                  metrics=metrics, quiet=args.quiet, manifest=manifest)
+        pipeline = MemberMapPipeline(collector, mapper, args.output, args.xlsx,
+                                     render_interval=args.render_interval, batch_wait=args.batch_wait,
+                                     external_data=args.external_data)
+        pipeline.run(args.concurrency, args.host_rate)
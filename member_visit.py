@@ -1,24 +1,600 @@
 import pandas as pd
-import requests
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, SoupStrainer, NavigableString, CData
+import soupsieve
 import time
 import re
-from urllib.parse import urljoin, urlparse
+import argparse
+import asyncio
+import threading
+import gzip
+import hashlib
+import json
+import multiprocessing
+import os
+import sqlite3
+from collections import namedtuple, deque
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from urllib.parse import urlparse, urlsplit, urlunsplit, parse_qsl, urlencode
 import warnings
+from http_session import get_shared_pool
+from excel_stream import iter_excel_rows, excel_columns, ExcelStreamWriter
+from run_metrics import RunMetrics, ProgressLine
+from homepage_verifier import HomepageVerifier
+from run_manifest import RunManifest
 warnings.filterwarnings('ignore')
 
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+class PageCache:
+    """가져온 검색/구인사이트 페이지를 압축해 SQLite 파일에 보관하는 캐시"""
+    def __init__(self, db_path="page_cache.sqlite", max_age_days=30, host_max_age_days=None, max_size_mb=500):
+        self.db_path = db_path
+        self.max_age_seconds = max_age_days * 24 * 60 * 60
+        # 호스트별 보관 기간 (예: {'search.naver.com': 7})
+        self.host_max_age_seconds = {
+            host: days * 24 * 60 * 60 for host, days in (host_max_age_days or {}).items()
+        }
+        self.max_size_bytes = max_size_mb * 1024 * 1024 if max_size_mb else None
+        self.hits = 0
+        self.misses = 0
+        
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(db_path, check_same_thread=False)
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS pages ("
+            " key TEXT PRIMARY KEY, url TEXT, host TEXT, codec TEXT, body BLOB,"
+            " size INTEGER, fetched_at REAL, accessed_at REAL)"
+        )
+        self.conn.execute("CREATE INDEX IF NOT EXISTS idx_pages_accessed ON pages (accessed_at)")
+        self.conn.commit()
+    
+    @staticmethod
+    def normalize_url(url):
+        """스킴/호스트 소문자화, 쿼리 정렬, 프래그먼트 제거"""
+        parts = urlsplit(url.strip())
+        query = urlencode(sorted(parse_qsl(parts.query, keep_blank_values=True)))
+        return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), parts.path or '/', query, ''))
+    
+    @staticmethod
+    def make_key(url):
+        """정규화된 URL의 해시를 캐시 키로 사용"""
+        return hashlib.sha256(PageCache.normalize_url(url).encode('utf-8')).hexdigest()
+    
+    def max_age_for(self, host):
+        """호스트에 적용할 보관 기간(초)"""
+        for suffix, seconds in self.host_max_age_seconds.items():
+            if host == suffix or host.endswith('.' + suffix):
+                return seconds
+        return self.max_age_seconds
+    
+    def compress(self, text):
+        """본문 압축 (zstandard가 있으면 zstd, 없으면 gzip)"""
+        data = text.encode('utf-8')
+        if zstandard is not None:
+            return 'zstd', zstandard.ZstdCompressor().compress(data)
+        return 'gzip', gzip.compress(data)
+    
+    def decompress(self, codec, body):
+        """저장된 코덱으로 본문 복원"""
+        if codec == 'zstd':
+            data = zstandard.ZstdDecompressor().decompress(body)
+        else:
+            data = gzip.decompress(body)
+        return data.decode('utf-8')
+    
+    def get(self, url, ignore_age=False):
+        """캐시된 페이지 본문을 반환 (없거나 만료되면 None)"""
+        key = self.make_key(url)
+        now = time.time()
+        
+        with self.lock:
+            row = self.conn.execute(
+                "SELECT host, codec, body, fetched_at FROM pages WHERE key = ?", (key,)
+            ).fetchone()
+            
+            if row is None:
+                self.misses += 1
+                return None
+            
+            host, codec, body, fetched_at = row
+            if not ignore_age and now - fetched_at > self.max_age_for(host):
+                self.misses += 1
+                return None
+            
+            # LRU 순서 갱신
+            self.conn.execute("UPDATE pages SET accessed_at = ? WHERE key = ?", (now, key))
+            self.conn.commit()
+            self.hits += 1
+        
+        return self.decompress(codec, body)
+    
+    def put(self, url, text):
+        """페이지 본문을 압축해 저장하고, 용량 초과 시 오래 쓰이지 않은 페이지부터 삭제"""
+        codec, body = self.compress(text)
+        now = time.time()
+        host = urlsplit(url).netloc.lower()
+        
+        with self.lock:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO pages (key, url, host, codec, body, size, fetched_at, accessed_at)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (self.make_key(url), self.normalize_url(url), host, codec, body, len(body), now, now)
+            )
+            if self.max_size_bytes:
+                self.evict()
+            self.conn.commit()
+    
+    def evict(self):
+        """전체 용량이 상한을 넘으면 LRU 순으로 삭제"""
+        total = self.conn.execute("SELECT COALESCE(SUM(size), 0) FROM pages").fetchone()[0]
+        if total <= self.max_size_bytes:
+            return
+        
+        rows = self.conn.execute("SELECT key, size FROM pages ORDER BY accessed_at ASC").fetchall()
+        expired = []
+        for key, size in rows:
+            if total <= self.max_size_bytes:
+                break
+            expired.append((key,))
+            total -= size
+        self.conn.executemany("DELETE FROM pages WHERE key = ?", expired)
+    
+    def close(self):
+        """캐시 DB 연결 종료"""
+        self.conn.close()
+
+class CollectionJournal:
+    """검색이 끝난 행을 한 줄씩 추가 기록하는 JSONL 저널 (중단 후 이어하기용)"""
+    def __init__(self, path, fsync_every=20, fsync_interval=5.0):
+        self.path = path
+        self.fsync_every = fsync_every
+        self.fsync_interval = fsync_interval
+        self.file = None
+        self.pending = 0
+        self.last_sync = time.monotonic()
+        self.lock = threading.Lock()
+    
+    def load(self):
+        """기록된 행을 {행 번호: 기록} 형태로 반환 (마지막 줄이 깨졌으면 무시)"""
+        entries = {}
+        if not os.path.exists(self.path):
+            return entries
+        
+        with open(self.path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    continue
+                entries[entry['row']] = entry
+        return entries
+    
+    def open(self, resume):
+        """이어하기면 기존 저널 뒤에 추가, 아니면 새로 시작"""
+        self.file = open(self.path, 'a' if resume else 'w', encoding='utf-8')
+    
+    def append(self, row, company_name, address, homepage):
+        """완료된 행 기록 (fsync는 일정 개수/시간마다 묶어서 수행)"""
+        entry = {
+            'row': int(row),
+            'name': company_name,
+            'address': address,
+            'homepage': homepage,
+            'ts': time.time()
+        }
+        with self.lock:
+            self.file.write(json.dumps(entry, ensure_ascii=False) + '\n')
+            self.file.flush()
+            self.pending += 1
+            if (self.pending >= self.fsync_every or
+                    time.monotonic() - self.last_sync >= self.fsync_interval):
+                self.sync()
+    
+    def sync(self):
+        """버퍼를 디스크에 확정"""
+        os.fsync(self.file.fileno())
+        self.pending = 0
+        self.last_sync = time.monotonic()
+    
+    def close(self):
+        """남은 기록을 확정하고 파일 닫기"""
+        if self.file is None:
+            return
+        with self.lock:
+            self.file.flush()
+            self.sync()
+            self.file.close()
+            self.file = None
+
+class HostRateLimiter:
+    """호스트별 초당 요청 수 제한 (여러 스레드에서 공유)"""
+    def __init__(self, requests_per_second):
+        self.interval = 1.0 / requests_per_second if requests_per_second else 0
+        self.lock = threading.Lock()
+        self.next_slot = {}
+    
+    def wait(self, url):
+        """해당 호스트의 다음 요청 시점까지 대기"""
+        if not self.interval:
+            return
+        
+        host = urlparse(url).netloc.lower()
+        with self.lock:
+            now = time.monotonic()
+            slot = max(now, self.next_slot.get(host, now))
+            self.next_slot[host] = slot + self.interval
+        
+        if slot > now:
+            time.sleep(slot - now)
+
+# 주소를 담고 있는 (상위 요소 클래스, 주소 요소 클래스) 규칙 - 우선순위 순
+ADDRESS_SELECTORS = [
+    ('business_info', 'addr'),
+    ('company_info', 'address'),
+    ('info_group', 'addr'),
+    ('detail_info', 'addr'),
+]
+ADDRESS_CLASSES = {target for _, target in ADDRESS_SELECTORS}
+
+# 본문 텍스트에서 주소 패턴 찾기
+ADDRESS_REGEX = re.compile(r'[가-힣]+[시도]\s+[가-힣]+[시군구]\s+[가-힣\d\-\s,]+', re.MULTILINE)
+
+# 구인구직 사이트
+JOB_SITE_DOMAINS = [
+    'saramin.co.kr', 'jobkorea.co.kr', 'work.go.kr', 'incruit.com',
+    'wanted.co.kr', 'indeed.com', 'linkedin.com', 'jobplanet.co.kr',
+    'catch.co.kr', 'alba.co.kr', 'albamon.com'
+]
+# 포털, SNS
+PORTAL_DOMAINS = [
+    'naver.com', 'google.com', 'daum.net', 'youtube.com',
+    'facebook.com', 'instagram.com', 'twitter.com'
+]
+# 블로그 서비스 (blog.로 시작하는 호스트도 블로그로 분류)
+BLOG_DOMAINS = ['tistory.com', 'blogspot.com', 'blog.me', 'wordpress.com', 'brunch.co.kr']
+# 회사 홈페이지로 인정하는 최상위 도메인 (긴 것부터 비교)
+COMPANY_TLDS = ['co.kr', 'com', 'kr', 'org', 'net']
+# 홈페이지 후보 검증 결과에 따른 점수 보정
+# (열림/제목에 회사명 → 가점, 열리지 않음/주차 도메인/포털·블로그 등으로 리다이렉트 → 감점)
+HOMEPAGE_CHECK_SCORES = {'alive': 3, 'title_match': 2, 'dead': -10, 'parked': -8, 'offsite': -2}
+
+# 구인구직 사이트별 회사 홈페이지 추출 규칙 (호스트 접미사 → 규칙)
+# - selectors: 순서대로 찾아 attribute 값이 회사 홈페이지인 첫 요소를 사용
+# - link_keywords: 링크 텍스트/title에 이 단어가 있는 링크를 사용
+# - fallback: 앞에서 못 찾으면 본문 텍스트에서 이 정규식에 맞는 첫 URL을 사용
+# 새 구인사이트는 여기에 규칙만 추가하면 됩니다. (JOB_SITE_DOMAINS에도 추가)
+URL_PATTERN = r'https?://[^\s<>"]+'
+JOB_SITE_RULES = {
+    'saramin.co.kr': {
+        'selectors': [
+            '.company_info_list a[href*="http"]',
+            '.company_summary a[href*="http"]',
+            '.basic_info a[href*="http"]',
+            'a[title*="홈페이지"]',
+            'a[title*="homepage"]',
+        ],
+        'fallback': URL_PATTERN,
+    },
+    'jobkorea.co.kr': {
+        'selectors': [
+            '.tbList a[href*="http"]',
+            '.corpDetail a[href*="http"]',
+            '.coInfo a[href*="http"]',
+            'a[title*="홈페이지"]',
+        ],
+        'fallback': URL_PATTERN,
+    },
+    'work.go.kr': {
+        'selectors': [
+            '.company_info a[href*="http"]',
+            '.detail_info a[href*="http"]',
+            'a[title*="홈페이지"]',
+        ],
+        'fallback': URL_PATTERN,
+    },
+    'incruit.com': {
+        'selectors': [
+            '.company_info a[href*="http"]',
+            '.info_box a[href*="http"]',
+            'a[title*="홈페이지"]',
+        ],
+        'fallback': URL_PATTERN,
+    },
+}
+# 규칙이 없는 구인사이트에 쓰는 규칙
+GENERIC_JOB_SITE_RULE = {
+    'link_keywords': ['홈페이지', 'homepage'],
+    'fallback': URL_PATTERN,
+}
+
+HostClass = namedtuple('HostClass', ['host', 'category', 'tld'])
+
+# 컴파일된 구인사이트 규칙 (selectors: SoupSieve 목록, fallback: 컴파일된 정규식 또는 None)
+JobSiteRule = namedtuple('JobSiteRule', ['name', 'selectors', 'attribute', 'link_keywords', 'fallback'])
+
+# 검색 계획: 정리된 회사명(행 번호 인덱스), 회사명별 행 번호, 검색할 고유 회사명 목록
+LookupPlan = namedtuple('LookupPlan', ['names', 'rows', 'keys'])
+
+class DomainClassifier:
+    """URL 호스트명을 접미사 집합으로 한 번에 분류하는 도메인 분류기
+    
+    category는 job_site / portal / blog / company 중 하나이고,
+    tld는 COMPANY_TLDS 중 일치하는 최상위 도메인(없으면 None)이다.
+    """
+    JOB_SITE = 'job_site'
+    PORTAL = 'portal'
+    BLOG = 'blog'
+    COMPANY = 'company'
+    
+    def __init__(self, job_sites, portals, blogs, company_tlds):
+        self.suffixes = {}
+        for category, domains in ((self.JOB_SITE, job_sites), (self.PORTAL, portals), (self.BLOG, blogs)):
+            for domain in domains:
+                self.suffixes[domain] = category
+        self.company_tlds = set(company_tlds)
+        self.cache = {}
+        self.lock = threading.Lock()
+    
+    def classify(self, url):
+        """URL을 분류 (호스트 단위로 결과 캐시)"""
+        try:
+            host = urlparse(url).hostname or ''
+        except ValueError:
+            host = ''
+        
+        result = self.cache.get(host)
+        if result is None:
+            result = self.classify_host(host)
+            with self.lock:
+                self.cache[host] = result
+        return result
+    
+    def classify_host(self, host):
+        """호스트명의 접미사를 긴 것부터 확인해 분류"""
+        category = None
+        tld = None
+        
+        # 'www.saramin.co.kr' -> 'www.saramin.co.kr', 'saramin.co.kr', 'co.kr', 'kr'
+        start = 0
+        while host:
+            suffix = host[start:]
+            if category is None:
+                category = self.suffixes.get(suffix)
+            if tld is None and start > 0 and suffix in self.company_tlds:
+                tld = suffix
+            dot = host.find('.', start)
+            if dot < 0:
+                break
+            start = dot + 1
+        
+        if category is None and host:
+            category = self.BLOG if host.startswith('blog.') else self.COMPANY
+        
+        return HostClass(host, category, tld)
+
+DOMAIN_CLASSIFIER = DomainClassifier(JOB_SITE_DOMAINS, PORTAL_DOMAINS, BLOG_DOMAINS, COMPANY_TLDS)
+
+class JobSiteExtractor:
+    """JOB_SITE_RULES 규칙 표로 구인사이트 페이지에서 회사 홈페이지를 찾는 추출기
+    
+    CSS 선택자와 정규식은 만들 때 한 번만 컴파일하고, 페이지마다 호스트에
+    맞는 규칙을 골라 선택자 → 링크 단어 → 본문 URL 순으로 찾다가 처음
+    조건에 맞는 URL에서 멈춘다.
+    """
+    def __init__(self, rules, generic_rule):
+        self.rules = {suffix: self.compile_rule(suffix, spec) for suffix, spec in rules.items()}
+        self.generic_rule = self.compile_rule('generic', generic_rule)
+    
+    @staticmethod
+    def compile_rule(name, spec):
+        """규칙 하나를 컴파일"""
+        fallback = spec.get('fallback')
+        return JobSiteRule(
+            name,
+            [soupsieve.compile(selector) for selector in spec.get('selectors', ())],
+            spec.get('attribute', 'href'),
+            [keyword.lower() for keyword in spec.get('link_keywords', ())],
+            re.compile(fallback) if fallback else None,
+        )
+    
+    def rule_for(self, url):
+        """URL 호스트에 맞는 규칙 (긴 접미사부터 비교, 없으면 일반 규칙)"""
+        host = DOMAIN_CLASSIFIER.classify(url).host
+        start = 0
+        while host:
+            rule = self.rules.get(host[start:])
+            if rule is not None:
+                return rule
+            dot = host.find('.', start)
+            if dot < 0:
+                break
+            start = dot + 1
+        return self.generic_rule
+    
+    def extract(self, html, url, accept):
+        """페이지에서 accept(URL)가 참인 첫 URL을 반환 (없으면 빈 문자열)"""
+        rule = self.rule_for(url)
+        soup = BeautifulSoup(html, 'html.parser')
+        
+        try:
+            for selector in rule.selectors:
+                for element in selector.iselect(soup):
+                    value = element.get(rule.attribute, '')
+                    if accept(value):
+                        return value
+            
+            if rule.link_keywords:
+                for link in soup.find_all('a', href=True):
+                    text = link.get_text().strip().lower()
+                    title = link.get('title', '').lower()
+                    if any(keyword in text or keyword in title for keyword in rule.link_keywords):
+                        href = link.get('href', '')
+                        if accept(href):
+                            return href
+            
+            # 텍스트에서 URL 패턴 찾기
+            if rule.fallback is not None:
+                for match in rule.fallback.finditer(soup.get_text()):
+                    if accept(match.group()):
+                        return match.group()
+        
+        except Exception:
+            pass
+        
+        return ""
+
+JOB_SITE_EXTRACTOR = JobSiteExtractor(JOB_SITE_RULES, GENERIC_JOB_SITE_RULE)
+
+class SearchPage:
+    """네이버 검색 결과를 한 번만 순회해 만든 추출용 문서 모델
+    
+    lxml 파서로 <body>만 파싱한 뒤 한 번의 순회로 주소 후보, 링크 후보,
+    본문 텍스트를 함께 모은다. extract_address와 extract_homepage가 공유한다.
+    """
+    def __init__(self, html):
+        soup = BeautifulSoup(html, 'lxml', parse_only=SoupStrainer('body'))
+        
+        # ADDRESS_SELECTORS 순서별 주소 후보 텍스트
+        self.address_candidates = [[] for _ in ADDRESS_SELECTORS]
+        # (href, 링크 텍스트) 목록 - 문서 순서
+        self.anchors = []
+        strings = []
+        
+        for node in soup.descendants:
+            if isinstance(node, NavigableString):
+                # get_text()와 같은 문자열만 포함 (주석, 스크립트 제외)
+                if type(node) in (NavigableString, CData):
+                    strings.append(node)
+                continue
+            
+            if node.name == 'a' and node.has_attr('href'):
+                self.anchors.append((node['href'], node.get_text().strip()))
+            
+            classes = node.get('class')
+            if classes and ADDRESS_CLASSES.intersection(classes):
+                self.collect_address(node, classes)
+        
+        self.text = ''.join(strings)
+    
+    def collect_address(self, node, classes):
+        """주소 클래스를 가진 요소가 어떤 규칙에 해당하는지 확인해 후보에 추가"""
+        ancestor_classes = set()
+        for parent in node.parents:
+            ancestor_classes.update(parent.get('class') or ())
+        
+        text = None
+        for i, (container, target) in enumerate(ADDRESS_SELECTORS):
+            if target in classes and container in ancestor_classes:
+                if text is None:
+                    text = node.get_text().strip()
+                self.address_candidates[i].append(text)
+
 class CompanyInfoCollector:
-    def __init__(self, excel_file_path):
+    def __init__(self, excel_file_path, page_cache_path="page_cache.sqlite", replay=False, http=None,
+                 journal_path=None, resume=False, metrics=None, metrics_path=None, metrics_interval=0,
+                 quiet=False, verifier=None, manifest=None):
         self.excel_file_path = excel_file_path
         self.df = None
         self.headers = {
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
         }
+        # 비동기 모드에서만 사용하는 호스트별 요청 제한
+        self.rate_limiter = None
+        # 페이지 캐시 (page_cache_path가 None이면 사용하지 않음)
+        self.page_cache = PageCache(page_cache_path) if page_cache_path else None
+        # 재생 모드: 네트워크 없이 캐시된 페이지만 사용 (보관 기간 무시)
+        self.replay = replay
+        # keep-alive 연결을 재사용하는 공유 HTTP 세션
+        self.http = http or get_shared_pool()
+        # 홈페이지 후보 검증기 (HomepageVerifier, None이면 문자열 점수만으로 선택)
+        if verifier is not None and replay:
+            # 재생 모드는 네트워크를 쓰지 않으므로 후보를 열어 보지 않음
+            print("재생 모드에서는 홈페이지 후보를 검증하지 않습니다.")
+            verifier = None
+        self.verifier = verifier
+        if verifier is not None and verifier.headers is None:
+            verifier.headers = self.headers
+        # 이번 실행에서 이미 확인한 구인사이트 페이지의 추출 결과 (정규화된 URL → 홈페이지)
+        self.job_site_results = {}
+        # 완료된 행을 기록하는 저널 (resume이면 저널에서 복원 후 이어서 수집)
+        if journal_path is None:
+            journal_path = os.path.splitext(excel_file_path)[0] + '_journal.jsonl'
+        self.journal = CollectionJournal(journal_path)
+        self.resume = resume
+        # 실행 매니페스트 (RunManifest 또는 경로). 지난번과 같은 (회사명, 주소) 행은 다시 검색하지 않음
+        if isinstance(manifest, str):
+            manifest = RunManifest(manifest)
+        self.manifest = manifest
+        self.row_hashes = None
+        # 단계별 소요 시간/건수 계측 (metrics_path를 주면 끝날 때 JSON과 .prom 파일로 저장)
+        self.metrics = metrics or RunMetrics('collector', metrics_path, metrics_interval)
+        # quiet면 행마다 출력하지 않고 진행 상황 한 줄만 갱신
+        self.quiet = quiet
+        self.progress = None
+    
+    def log(self, message):
+        """행 단위 진행 메시지 출력 (quiet면 생략)"""
+        if not self.quiet:
+            print(message)
+    
+    def start_progress(self, total=None):
+        """검색 진행 표시 시작 (quiet가 아니면 계측 게이지만 갱신)"""
+        self.progress = ProgressLine('rows', total, enabled=self.quiet, metrics=self.metrics)
+        return self.progress
+    
+    def report_result(self, company_name, address, homepage, done=None):
+        """검색 결과 한 건 출력 (quiet면 진행 표시만 갱신)"""
+        self.metrics.count('address_found' if address else 'address_missing')
+        self.metrics.count('homepage_found' if homepage else 'homepage_missing')
+        if self.progress is not None:
+            self.progress.update(done, company_name)
+        if not self.quiet:
+            print(f"  -> 주소: {address[:50]}{'...' if len(address) > 50 else ''}")
+            print(f"  -> 홈페이지: {homepage}")
+    
+    def fetch(self, url):
+        """페이지 HTML 가져오기 (캐시 우선, 비동기 모드에서는 호스트별 요청 간격 적용)"""
+        if self.page_cache is not None:
+            cached = self.page_cache.get(url, ignore_age=self.replay)
+            if cached is not None:
+                self.metrics.count('page_cache_hit')
+                return cached
+            self.metrics.count('page_cache_miss')
+        
+        if self.replay:
+            raise LookupError(f"캐시에 없는 페이지: {url}")
+        
+        response = self.download(url)
+        if self.page_cache is not None:
+            self.page_cache.put(url, response.text)
+        return response.text
+    
+    def download(self, url):
+        """네트워크로 페이지 요청 (비동기 모드에서는 호스트별 요청 간격 적용)"""
+        if self.rate_limiter is not None:
+            with self.metrics.timer('rate_wait'):
+                self.rate_limiter.wait(url)
+        
+        with self.metrics.timer('fetch'):
+            response = self.http.get(url, headers=self.headers, timeout=10)
+            response.raise_for_status()
+        return response
+    
+    def fetch_bytes(self, url):
+        """fetch와 같지만 (본문 바이트, 인코딩)을 반환 (디코딩은 파싱 프로세스에서)"""
+        if self.page_cache is not None or self.replay:
+            return self.fetch(url).encode('utf-8'), 'utf-8'
+        response = self.download(url)
+        return response.content, response.encoding
     
     def load_excel(self):
         """엑셀 파일 로드"""
         try:
-            self.df = pd.read_excel(self.excel_file_path)
+            with self.metrics.timer('load'):
+                self.df = pd.read_excel(self.excel_file_path)
             print(f"엑셀 파일 로드 완료: {len(self.df)}개 행")
             return True
         except Exception as e:
@@ -28,71 +604,67 @@ class CompanyInfoCollector:
     def search_company_info(self, company_name):
         """회사 정보 검색"""
         try:
-            # 네이버 검색 사용
-            search_url = f"https://search.naver.com/search.naver?query={company_name} 회사 주소 홈페이지"
+            html = self.fetch(self.search_url(company_name))
             
-            response = requests.get(search_url, headers=self.headers, timeout=10)
-            response.raise_for_status()
+            with self.metrics.timer('parse'):
+                page = SearchPage(html)
             
-            soup = BeautifulSoup(response.text, 'html.parser')
-            
-            address = self.extract_address(soup, company_name)
-            homepage = self.extract_homepage(soup, company_name)
+            with self.metrics.timer('address'):
+                address = self.extract_address(page, company_name)
+            # 구인사이트 후속 검색(job_site 단계) 포함
+            with self.metrics.timer('homepage'):
+                homepage = self.extract_homepage(page, company_name)
             
             return address, homepage
             
         except Exception as e:
-            print(f"{company_name} 검색 중 오류: {e}")
+            self.metrics.count('search_error')
+            self.log(f"{company_name} 검색 중 오류: {e}")
             return "", ""
     
-    def extract_address(self, soup, company_name):
+    @staticmethod
+    def search_url(company_name):
+        """회사 검색 URL (네이버 검색 사용)"""
+        return f"https://search.naver.com/search.naver?query={company_name} 회사 주소 홈페이지"
+    
+    def extract_address(self, page, company_name):
         """주소 추출"""
-        address_patterns = [
-            # 지식패널이나 기업 정보에서 주소 찾기
-            '.txt_addr',
-            '.addr',
-            '.address',
-            # 일반적인 주소 패턴
-            lambda tag: tag.name and '주소' in tag.get_text() and tag.find_next(),
-        ]
-        
-        # 다양한 선택자로 주소 찾기
-        selectors = [
-            '.business_info .addr',
-            '.company_info .address',
-            '.info_group .addr',
-            '.detail_info .addr'
-        ]
-        
-        for selector in selectors:
-            elements = soup.select(selector)
-            for element in elements:
-                text = element.get_text().strip()
+        # 기업 정보 영역의 주소 후보 (선택자 우선순위 순)
+        for candidates in page.address_candidates:
+            for text in candidates:
                 if self.is_valid_address(text):
                     return text
         
         # 텍스트에서 주소 패턴 찾기
-        address_regex = re.compile(r'[가-힣]+[시도]\s+[가-힣]+[시군구]\s+[가-힣\d\-\s,]+', re.MULTILINE)
-        text = soup.get_text()
-        matches = address_regex.findall(text)
-        
-        for match in matches:
+        for match in ADDRESS_REGEX.findall(page.text):
             if self.is_valid_address(match):
                 return match.strip()
         
         return ""
     
-    def extract_homepage(self, soup, company_name):
+    def extract_homepage(self, page, company_name):
         """홈페이지 추출"""
-        # 링크에서 홈페이지 찾기
-        links = soup.find_all('a', href=True)
+        homepage = self.pick_homepage(page, company_name)
+        
+        # 구인구직 사이트면 실제 홈페이지 크롤링
+        if homepage and self.is_job_site_url(homepage):
+            self.log(f"  -> 구인사이트에서 실제 홈페이지 찾는 중...")
+            self.metrics.count('job_site_follow')
+            with self.metrics.timer('job_site'):
+                actual_homepage = self.extract_homepage_from_job_site(homepage)
+            return actual_homepage if actual_homepage else homepage
         
+        return homepage
+    
+    def pick_homepage(self, page, company_name):
+        """검색 결과 링크 중 가장 적합한 홈페이지 후보 (구인사이트 URL일 수 있음)"""
+        return self.select_best_homepage(self.homepage_candidates(page, company_name), company_name)
+    
+    def homepage_candidates(self, page, company_name):
+        """검색 결과 링크 중 홈페이지 후보 목록 (문서 순서)"""
         potential_homepages = []
         
-        for link in links:
-            href = link['href']
-            text = link.get_text().strip()
-            
+        for href, text in page.anchors:
             # 공식 홈페이지로 보이는 링크 찾기
             if any(keyword in text.lower() for keyword in ['홈페이지', 'homepage', '공식', 'www', 'http']):
                 if self.is_valid_homepage(href):
@@ -102,238 +674,52 @@ class CompanyInfoCollector:
             if self.is_company_website(href, company_name):
                 potential_homepages.append(href)
         
-        # 가장 적합한 홈페이지 선택
-        if potential_homepages:
-            homepage = self.select_best_homepage(potential_homepages, company_name)
-            
-            # 구인구직 사이트면 실제 홈페이지 크롤링
-            if self.is_job_site_url(homepage):
-                print(f"  -> 구인사이트에서 실제 홈페이지 찾는 중...")
-                actual_homepage = self.extract_homepage_from_job_site(homepage)
-                return actual_homepage if actual_homepage else homepage
-            
-            return homepage
-        
-        return ""
+        return potential_homepages
     
     def is_job_site_url(self, url):
         """구인구직 사이트 URL인지 확인"""
-        job_sites = [
-            'saramin.co.kr', 'jobkorea.co.kr', 'work.go.kr', 'incruit.com',
-            'wanted.co.kr', 'indeed.com', 'linkedin.com', 'jobplanet.co.kr',
-            'catch.co.kr', 'alba.co.kr', 'albamon.com'
-        ]
-        
-        url_lower = url.lower()
-        return any(job_site in url_lower for job_site in job_sites)
+        return DOMAIN_CLASSIFIER.classify(url).category == DomainClassifier.JOB_SITE
     
     def extract_homepage_from_job_site(self, job_site_url):
-        """구인구직 사이트에서 실제 회사 홈페이지 추출"""
+        """구인구직 사이트에서 실제 회사 홈페이지 추출 (같은 페이지는 실행 중 한 번만)"""
+        known = self.known_job_site_result(job_site_url)
+        if known is not None:
+            return known
+        
         try:
-            response = requests.get(job_site_url, headers=self.headers, timeout=10)
-            response.raise_for_status()
-            
-            soup = BeautifulSoup(response.text, 'html.parser')
-            
-            # 사람인에서 홈페이지 추출
-            if 'saramin' in job_site_url:
-                return self.extract_from_saramin(soup)
-            
-            # 잡코리아에서 홈페이지 추출
-            elif 'jobkorea' in job_site_url:
-                return self.extract_from_jobkorea(soup)
-            
-            # 워크넷에서 홈페이지 추출
-            elif 'work.go.kr' in job_site_url:
-                return self.extract_from_worknet(soup)
-            
-            # 인크루트에서 홈페이지 추출
-            elif 'incruit' in job_site_url:
-                return self.extract_from_incruit(soup)
-            
-            # 기타 사이트는 일반적인 방법으로
-            else:
-                return self.extract_homepage_generic(soup)
+            html = self.fetch(job_site_url)
+            homepage = self.extract_homepage_from_job_site_html(html, job_site_url)
         
         except Exception as e:
-            print(f"  -> 구인사이트 크롤링 오류: {e}")
+            self.metrics.count('job_site_error')
+            self.log(f"  -> 구인사이트 크롤링 오류: {e}")
             return ""
-    
-    def extract_from_saramin(self, soup):
-        """사람인에서 홈페이지 추출"""
-        try:
-            # 사람인의 회사 정보 섹션에서 홈페이지 찾기
-            selectors = [
-                '.company_info_list a[href*="http"]',
-                '.company_summary a[href*="http"]',
-                '.basic_info a[href*="http"]',
-                'a[title*="홈페이지"]',
-                'a[title*="homepage"]'
-            ]
-            
-            for selector in selectors:
-                elements = soup.select(selector)
-                for element in elements:
-                    href = element.get('href', '')
-                    if self.is_company_homepage(href):
-                        return href
-            
-            # 텍스트에서 URL 패턴 찾기
-            text = soup.get_text()
-            urls = re.findall(r'https?://[^\s<>"]+', text)
-            for url in urls:
-                if self.is_company_homepage(url):
-                    return url
-        
-        except Exception:
-            pass
-        
-        return ""
-    
-    def extract_from_jobkorea(self, soup):
-        """잡코리아에서 홈페이지 추출"""
-        try:
-            # 잡코리아의 회사 정보 섹션에서 홈페이지 찾기
-            selectors = [
-                '.tbList a[href*="http"]',
-                '.corpDetail a[href*="http"]',
-                '.coInfo a[href*="http"]',
-                'a[title*="홈페이지"]'
-            ]
-            
-            for selector in selectors:
-                elements = soup.select(selector)
-                for element in elements:
-                    href = element.get('href', '')
-                    if self.is_company_homepage(href):
-                        return href
-            
-            # 텍스트에서 URL 패턴 찾기
-            text = soup.get_text()
-            urls = re.findall(r'https?://[^\s<>"]+', text)
-            for url in urls:
-                if self.is_company_homepage(url):
-                    return url
-        
-        except Exception:
-            pass
         
-        return ""
+        self.remember_job_site_result(job_site_url, homepage)
+        return homepage
     
-    def extract_from_worknet(self, soup):
-        """워크넷에서 홈페이지 추출"""
-        try:
-            # 워크넷의 회사 정보 섹션에서 홈페이지 찾기
-            selectors = [
-                '.company_info a[href*="http"]',
-                '.detail_info a[href*="http"]',
-                'a[title*="홈페이지"]'
-            ]
-            
-            for selector in selectors:
-                elements = soup.select(selector)
-                for element in elements:
-                    href = element.get('href', '')
-                    if self.is_company_homepage(href):
-                        return href
-            
-            # 텍스트에서 URL 패턴 찾기
-            text = soup.get_text()
-            urls = re.findall(r'https?://[^\s<>"]+', text)
-            for url in urls:
-                if self.is_company_homepage(url):
-                    return url
-        
-        except Exception:
-            pass
-        
-        return ""
+    def known_job_site_result(self, job_site_url):
+        """이번 실행에서 이미 추출한 구인사이트 페이지의 결과 (없으면 None)"""
+        homepage = self.job_site_results.get(PageCache.normalize_url(job_site_url))
+        self.metrics.count('job_site_memo_miss' if homepage is None else 'job_site_memo_hit')
+        return homepage
     
-    def extract_from_incruit(self, soup):
-        """인크루트에서 홈페이지 추출"""
-        try:
-            # 인크루트의 회사 정보 섹션에서 홈페이지 찾기
-            selectors = [
-                '.company_info a[href*="http"]',
-                '.info_box a[href*="http"]',
-                'a[title*="홈페이지"]'
-            ]
-            
-            for selector in selectors:
-                elements = soup.select(selector)
-                for element in elements:
-                    href = element.get('href', '')
-                    if self.is_company_homepage(href):
-                        return href
-            
-            # 텍스트에서 URL 패턴 찾기
-            text = soup.get_text()
-            urls = re.findall(r'https?://[^\s<>"]+', text)
-            for url in urls:
-                if self.is_company_homepage(url):
-                    return url
-        
-        except Exception:
-            pass
-        
-        return ""
+    def remember_job_site_result(self, job_site_url, homepage):
+        """구인사이트 페이지 추출 결과 기억 (가져오기에 실패한 페이지는 기억하지 않음)"""
+        self.job_site_results[PageCache.normalize_url(job_site_url)] = homepage
     
-    def extract_homepage_generic(self, soup):
-        """일반적인 방법으로 홈페이지 추출"""
-        try:
-            # 홈페이지 관련 링크 찾기
-            links = soup.find_all('a', href=True)
-            
-            for link in links:
-                href = link.get('href', '')
-                text = link.get_text().strip().lower()
-                title = link.get('title', '').lower()
-                
-                if ('홈페이지' in text or 'homepage' in text or 
-                    '홈페이지' in title or 'homepage' in title):
-                    if self.is_company_homepage(href):
-                        return href
-            
-            # 텍스트에서 URL 패턴 찾기
-            text = soup.get_text()
-            urls = re.findall(r'https?://[^\s<>"]+', text)
-            for url in urls:
-                if self.is_company_homepage(url):
-                    return url
-        
-        except Exception:
-            pass
-        
-        return ""
+    def extract_homepage_from_job_site_html(self, html, job_site_url):
+        """가져온 구인구직 사이트 페이지에서 실제 회사 홈페이지 추출 (JOB_SITE_RULES 규칙 사용)"""
+        return JOB_SITE_EXTRACTOR.extract(html, job_site_url, self.is_company_homepage)
     
     def is_company_homepage(self, url):
         """실제 회사 홈페이지인지 확인"""
         if not url or not url.startswith(('http://', 'https://')):
             return False
         
-        url_lower = url.lower()
-        
-        # 구인사이트는 제외
-        job_sites = [
-            'saramin.co.kr', 'jobkorea.co.kr', 'work.go.kr', 'incruit.com',
-            'wanted.co.kr', 'indeed.com', 'linkedin.com', 'jobplanet.co.kr'
-        ]
-        
-        if any(job_site in url_lower for job_site in job_sites):
-            return False
-        
-        # 기타 제외할 사이트들
-        excluded_domains = [
-            'naver.com', 'google.com', 'daum.net', 'youtube.com',
-            'facebook.com', 'instagram.com', 'twitter.com', 'blog'
-        ]
-        
-        if any(domain in url_lower for domain in excluded_domains):
-            return False
-        
-        # 실제 회사 도메인으로 보이는 것들
-        company_domains = ['.co.kr', '.com', '.kr', '.org', '.net']
-        return any(domain in url_lower for domain in company_domains)
+        # 구인사이트, 포털/SNS, 블로그는 제외하고 회사 도메인으로 보이는 것만
+        host_class = DOMAIN_CLASSIFIER.classify(url)
+        return host_class.category == DomainClassifier.COMPANY and host_class.tld is not None
     
     def is_valid_address(self, text):
         """유효한 주소인지 확인"""
@@ -349,52 +735,227 @@ class CompanyInfoCollector:
         if not url.startswith(('http://', 'https://')):
             return False
         
-        # 제외할 도메인들 (구인사이트 제외하지 않음 - 나중에 크롤링할 예정)
-        excluded_domains = [
-            'naver.com', 'google.com', 'daum.net', 'youtube.com',
-            'facebook.com', 'instagram.com', 'twitter.com'
-        ]
-        
-        return not any(domain in url.lower() for domain in excluded_domains)
+        # 포털/SNS만 제외 (구인사이트 제외하지 않음 - 나중에 크롤링할 예정)
+        return DOMAIN_CLASSIFIER.classify(url).category != DomainClassifier.PORTAL
     
     def is_company_website(self, url, company_name):
         """회사 웹사이트인지 확인"""
         if not self.is_valid_homepage(url):
             return False
         
-        # 회사명의 영문/한글 부분 추출
+        # 회사명의 영문 부분이 도메인에 들어 있는지 확인
         company_parts = re.findall(r'[a-zA-Z]+', company_name.lower())
         
-        url_lower = url.lower()
-        return any(part in url_lower for part in company_parts if len(part) > 2)
+        host = DOMAIN_CLASSIFIER.classify(url).host
+        return any(part in host for part in company_parts if len(part) > 2)
     
     def select_best_homepage(self, homepages, company_name):
         """가장 적합한 홈페이지 선택"""
         if not homepages:
             return ""
         
+        return self.choose_homepage(self.rank_homepages(homepages, company_name), company_name)
+    
+    def rank_homepages(self, homepages, company_name):
+        """홈페이지 후보를 점수가 높은 순으로 정렬한 [(점수, URL)] 목록 (중복 제거)"""
         # 회사명과 가장 관련성이 높은 것 선택
         scored_homepages = []
+        company_parts = re.findall(r'[a-zA-Z]+', company_name.lower())
         
-        for homepage in homepages:
+        for homepage in dict.fromkeys(homepages):
+            host_class = DOMAIN_CLASSIFIER.classify(homepage)
             score = 0
             # .co.kr, .com 도메인 우선
-            if '.co.kr' in homepage:
+            if host_class.tld == 'co.kr':
                 score += 3
-            elif '.com' in homepage:
+            elif host_class.tld == 'com':
                 score += 2
             
             # 회사명 포함 여부
-            company_parts = re.findall(r'[a-zA-Z]+', company_name.lower())
             for part in company_parts:
-                if part in homepage.lower():
+                if part in host_class.host:
                     score += 1
             
             scored_homepages.append((score, homepage))
         
-        # 점수가 가장 높은 것 선택
+        # 점수가 가장 높은 것부터
         scored_homepages.sort(reverse=True)
-        return scored_homepages[0][1]
+        return scored_homepages
+    
+    def choose_homepage(self, ranked, company_name):
+        """순위 목록에서 홈페이지 선택 (검증기가 있으면 상위 후보를 확인해 점수 보정)"""
+        if not ranked:
+            return ""
+        if self.verifier is None:
+            return ranked[0][1]
+        
+        with self.metrics.timer('verify'):
+            reranked = self.verify_homepages(ranked, company_name)
+        if reranked[0][1] != ranked[0][1]:
+            self.metrics.count('homepage_reranked')
+        return reranked[0][1]
+    
+    def verify_homepages(self, ranked, company_name):
+        """상위 top_k개 후보(구인사이트 제외)를 동시에 확인해 점수를 보정한 순위 목록"""
+        top = ranked[:self.verifier.top_k]
+        targets = [url for _, url in top if not self.is_job_site_url(url)]
+        # 검증 요청도 검색과 같은 호스트별 요청 간격을 지킴
+        checks = dict(zip(targets, self.verifier.check_many(targets, self.rate_limiter)))
+        
+        reranked = []
+        for score, url in top:
+            check = checks.get(url)
+            if check is not None:
+                score, url = self.apply_homepage_check(score, url, check, company_name)
+            reranked.append((score, url))
+        # 모두 열리지 않으면 확인하지 않은 나머지 후보가 앞설 수 있음 (점수가 같으면 원래 순서 유지)
+        reranked.extend(ranked[len(top):])
+        reranked.sort(key=lambda item: -item[0])
+        return reranked
+    
+    def apply_homepage_check(self, score, url, check, company_name):
+        """검증 결과를 점수에 반영해 (점수, URL)을 반환 (다른 회사 도메인으로 옮겼으면 최종 주소 사용)"""
+        self.metrics.count('homepage_checked')
+        if not check.alive:
+            self.metrics.count('homepage_dead')
+            return score + HOMEPAGE_CHECK_SCORES['dead'], url
+        
+        score += HOMEPAGE_CHECK_SCORES['alive']
+        if check.parked:
+            self.metrics.count('homepage_parked')
+            score += HOMEPAGE_CHECK_SCORES['parked']
+        if self.title_matches(check.title, company_name):
+            self.metrics.count('homepage_title_match')
+            score += HOMEPAGE_CHECK_SCORES['title_match']
+        
+        final = DOMAIN_CLASSIFIER.classify(check.final_url)
+        if final.host and final.host != DOMAIN_CLASSIFIER.classify(url).host:
+            if final.category != DomainClassifier.COMPANY:
+                score += HOMEPAGE_CHECK_SCORES['offsite']
+            elif final.tld is not None:
+                url = f"{urlsplit(check.final_url).scheme}://{final.host}/"
+        return score, url
+    
+    @staticmethod
+    def title_matches(title, company_name):
+        """페이지 제목에 회사명(법인 표기 제외)이나 회사명의 영문 단어가 들어 있는지 확인"""
+        if not title:
+            return False
+        title_key = re.sub(r'\s+', '', title).lower()
+        name_key = re.sub(r'\(주\)|㈜|주식회사|\s+', '', company_name).lower()
+        if name_key and name_key in title_key:
+            return True
+        return any(part in title_key for part in re.findall(r'[a-zA-Z]+', company_name.lower()) if len(part) > 2)
+    
+    def prepare_columns(self):
+        """주소, 홈페이지 열 준비 (없으면 생성, 문자열을 담을 수 있게 object 형으로)"""
+        for column in ('주소', '홈페이지'):
+            if column not in self.df.columns:
+                self.df[column] = ""
+            # 전부 비어 있는 열은 float64로 읽혀 문자열을 넣을 수 없음
+            self.df[column] = self.df[column].astype(object)
+    
+    def apply_manifest(self):
+        """매니페스트에 같은 내용(회사명, 입력 주소)으로 기록된 행은 지난 결과를 반영해 다시 검색하지 않음"""
+        if self.manifest is None:
+            return 0
+        
+        names = self.df['회원사명'] if '회원사명' in self.df.columns else pd.Series(index=self.df.index, dtype=object)
+        self.row_hashes = pd.Series([RunManifest.content_hash(name, address)
+                                     for name, address in zip(names, self.df['주소'])],
+                                    index=self.df.index, dtype=object)
+        
+        reused = 0
+        missing = self.df['주소'].isna() | self.df['홈페이지'].isna()
+        for index in self.df.index[missing & names.notna()]:
+            entry = self.manifest.lookup('collector', self.row_hashes[index])
+            if entry is not None:
+                self.df.at[index, '주소'], self.df.at[index, '홈페이지'] = entry
+                reused += 1
+        if reused:
+            self.metrics.count('manifest_reused', reused)
+            print(f"매니페스트에서 바뀌지 않은 행 {reused}개의 결과를 재사용합니다: {self.manifest.path}")
+        return reused
+    
+    @staticmethod
+    def found_address(address, homepage):
+        """매니페스트에 기록할 결과인지 (검색 실패/주소 못 찾음은 빈 주소라 기록하지 않고 다음 실행에서 다시 검색)"""
+        return pd.notna(address) and pd.notna(homepage) and str(address).strip() != ''
+    
+    def record_manifest(self):
+        """주소를 찾은 행의 결과를 매니페스트에 기록하고 저장"""
+        if self.manifest is None or self.row_hashes is None:
+            return
+        
+        done = self.df['주소'].notna() & self.df['홈페이지'].notna()
+        done &= self.df['주소'].astype(str).str.strip().ne('')
+        if '회원사명' in self.df.columns:
+            done &= self.df['회원사명'].notna()
+        for row_hash, address, homepage in zip(self.row_hashes[done], self.df.loc[done, '주소'],
+                                               self.df.loc[done, '홈페이지']):
+            self.manifest.record('collector', row_hash, [str(address), str(homepage)])
+        self.manifest.save()
+    
+    def apply_journal(self):
+        """저널에 기록된 결과를 DataFrame에 반영하고, 반영된 행 번호 집합을 반환"""
+        entries = self.journal.load()
+        # 회원사명 열이 없으면 저널의 행과 맞춰 볼 수 없으므로 반영하지 않음 (이전 실행의 저널)
+        if not entries or '회원사명' not in self.df.columns:
+            return set()
+        
+        journal_df = pd.DataFrame.from_dict(entries, orient='index')
+        journal_df = journal_df[journal_df.index.isin(self.df.index)]
+        
+        # 엑셀이 바뀌어 행이 어긋난 경우는 반영하지 않음
+        names = self.df.loc[journal_df.index, '회원사명'].astype(str).str.strip()
+        matched = journal_df[journal_df['name'].values == names.values]
+        
+        self.df.loc[matched.index, '주소'] = matched['address']
+        self.df.loc[matched.index, '홈페이지'] = matched['homepage']
+        return set(matched.index)
+    
+    def start_journal(self):
+        """저널 열기 (이어하기면 기존 기록을 먼저 반영)"""
+        if self.resume:
+            done = self.apply_journal()
+            print(f"저널에서 {len(done)}개 행을 복원했습니다: {self.journal.path}")
+        self.journal.open(self.resume)
+    
+    def plan_lookups(self):
+        """검색 계획: 회사명을 벡터 연산으로 정리하고, 정보가 빠진 고유 회사명만 추림"""
+        raw_names = self.df['회원사명'] if '회원사명' in self.df.columns else pd.Series(index=self.df.index, dtype=object)
+        names = raw_names.astype(str).str.strip()
+        
+        has_name = raw_names.notna() & names.ne('') & names.ne('nan')
+        missing = self.df['주소'].isna() | self.df['홈페이지'].isna()
+        pending = names[has_name & missing]
+        
+        skipped_empty = int((~has_name).sum())
+        skipped_filled = int((has_name & ~missing).sum())
+        if skipped_empty:
+            print(f"회사명이 없는 행 {skipped_empty}개 건너뜀")
+        if skipped_filled:
+            print(f"이미 정보가 있는 행 {skipped_filled}개 건너뜀")
+        
+        rows = pending.groupby(pending, sort=False).groups
+        keys = list(pending.drop_duplicates())
+        print(f"검색 대상: 고유 회사명 {len(keys)}개 (행 {len(pending)}개)")
+        return LookupPlan(pending, rows, keys)
+    
+    def record_result(self, plan, company_name, address, homepage):
+        """회사명 하나의 검색 결과를 해당하는 모든 행에 대해 저널에 기록"""
+        for index in plan.rows[company_name]:
+            self.journal.append(index, company_name, address, homepage)
+    
+    def apply_results(self, plan, results):
+        """고유 회사명별 검색 결과를 해당하는 모든 행에 한 번에 반영"""
+        if not results:
+            return
+        
+        found = pd.DataFrame.from_dict(results, orient='index', columns=['주소', '홈페이지'])
+        merged = plan.names.to_frame('key').join(found, on='key', how='inner')
+        self.df.loc[merged.index, '주소'] = merged['주소']
+        self.df.loc[merged.index, '홈페이지'] = merged['홈페이지']
     
     def update_excel(self):
         """엑셀 파일의 주소, 홈페이지 업데이트"""
@@ -402,83 +963,467 @@ class CompanyInfoCollector:
             print("엑셀 파일이 로드되지 않았습니다.")
             return False
         
-        # 주소, 홈페이지 열이 없으면 생성
-        if '주소' not in self.df.columns:
-            self.df['주소'] = ""
-        if '홈페이지' not in self.df.columns:
-            self.df['홈페이지'] = ""
-        
-        total_companies = len(self.df)
+        self.prepare_columns()
+        self.apply_manifest()
+        self.start_journal()
+        plan = self.plan_lookups()
         
-        for index, row in self.df.iterrows():
-            try:
-                # 회사명 가져오기
-                company_name = str(row.get('회원사명', '')).strip()
-                
-                if not company_name or company_name == 'nan':
-                    print(f"행 {index + 1}: 회사명이 없습니다.")
-                    continue
-                
-                print(f"진행률: {index + 1}/{total_companies} - {company_name} 검색 중...")
+        results = {}
+        total = len(plan.keys)
+        self.start_progress(total)
+        try:
+            for i, company_name in enumerate(plan.keys, 1):
+                self.log(f"진행률: {i}/{total} - {company_name} 검색 중...")
                 
-                # 이미 정보가 있으면 건너뛰기
-                if pd.notna(row.get('주소')) and pd.notna(row.get('홈페이지')):
-                    print(f"  -> 이미 정보가 있습니다. 건너뜀")
+                try:
+                    address, homepage = self.search_company_info(company_name)
+                except Exception as e:
+                    self.metrics.count('search_error')
+                    self.log(f"{company_name} 처리 중 오류: {e}")
                     continue
                 
-                address, homepage = self.search_company_info(company_name)
-                
                 # 결과 저장
-                self.df.at[index, '주소'] = address
-                self.df.at[index, '홈페이지'] = homepage
-                
-                print(f"  -> 주소: {address[:50]}{'...' if len(address) > 50 else ''}")
-                print(f"  -> 홈페이지: {homepage}")
+                results[company_name] = (address, homepage)
+                self.record_result(plan, company_name, address, homepage)
+                self.report_result(company_name, address, homepage, i)
                 
                 # 요청 간 딜레이 (서버 부하 방지)
                 time.sleep(2)
+        finally:
+            self.progress.close()
+            self.journal.close()
+            self.apply_results(plan, results)
+        
+        return True
+    
+    async def update_excel_async(self, concurrency=8, host_rate=2.0):
+        """엑셀 파일의 주소, 홈페이지를 동시에 여러 건씩 업데이트
+        
+        concurrency개의 검색을 동시에 진행하고, 고정 2초 딜레이 대신
+        호스트별 초당 요청 수(host_rate)로 요청 간격을 조절한다.
+        결과는 원래 행 순서대로 self.df에 기록한다.
+        """
+        if self.df is None:
+            print("엑셀 파일이 로드되지 않았습니다.")
+            return False
+        
+        self.prepare_columns()
+        self.apply_manifest()
+        self.start_journal()
+        plan = self.plan_lookups()
+        print(f"동시 검색: {concurrency}건")
+        
+        loop = asyncio.get_running_loop()
+        semaphore = asyncio.Semaphore(concurrency)
+        executor = ThreadPoolExecutor(max_workers=concurrency)
+        self.rate_limiter = HostRateLimiter(host_rate)
+        
+        total = len(plan.keys)
+        progress = self.start_progress(total)
+        
+        async def lookup(company_name):
+            async with semaphore:
+                address, homepage = await loop.run_in_executor(executor, self.search_company_info, company_name)
+            # 완료되는 대로 저널에 기록
+            self.record_result(plan, company_name, address, homepage)
+            progress.update(note=company_name)
+            return address, homepage
+        
+        try:
+            results = await asyncio.gather(*(lookup(company_name) for company_name in plan.keys))
+        finally:
+            self.rate_limiter = None
+            executor.shutdown(wait=True)
+            self.journal.close()
+            progress.close()
+        
+        # 결과 저장 (원래 행 순서, 진행 표시는 완료 순서로 이미 갱신됨)
+        self.progress = None
+        for i, (company_name, (address, homepage)) in enumerate(zip(plan.keys, results), 1):
+            self.log(f"진행률: {i}/{total} - {company_name}")
+            self.report_result(company_name, address, homepage)
+        
+        self.apply_results(plan, dict(zip(plan.keys, results)))
+        return True
+    
+    async def update_excel_pipelined(self, concurrency=8, host_rate=2.0, workers=None, queue_size=None):
+        """네트워크 요청은 이벤트 루프에서, HTML 파싱/추출은 프로세스 풀에서 나눠 처리
+        
+        검색 페이지 가져오기 → 파싱 → (구인사이트면) 후속 페이지 가져오기/파싱
+        단계를 크기가 정해진 큐로 이어, 파싱이 밀리면 가져오기도 멈춘다.
+        프로세스 사이에는 페이지 바이트와 (주소, 홈페이지) 같은 작은 튜플만
+        오간다. workers는 파싱 프로세스 수(기본: CPU 코어 수)이다.
+        """
+        if self.df is None:
+            print("엑셀 파일이 로드되지 않았습니다.")
+            return False
+        
+        self.prepare_columns()
+        self.apply_manifest()
+        self.start_journal()
+        plan = self.plan_lookups()
+        workers = workers or os.cpu_count() or 1
+        queue_size = queue_size or workers * 2
+        # 후속 단계: 구인사이트 따라가기와 (검증기가 있으면) 홈페이지 후보 검증
+        followers = concurrency if self.verifier is not None else max(1, concurrency // 4)
+        top_k = self.verifier.top_k if self.verifier is not None else 1
+        print(f"파이프라인 검색: 동시 요청 {concurrency}건, 파싱 프로세스 {workers}개")
+        
+        # 스레드를 만들기 전에 프로세스 풀을 준비 (spawn: 부모의 잠금/연결 상태를 물려받지 않음)
+        process_pool = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('spawn'),
+                                           initializer=init_parse_worker)
+        io_executor = ThreadPoolExecutor(max_workers=concurrency + followers)
+        self.rate_limiter = HostRateLimiter(host_rate)
+        loop = asyncio.get_running_loop()
+        # (회사명, 페이지 바이트, 인코딩) / (회사명, 주소, [(점수, 홈페이지 후보)])
+        parse_queue = asyncio.Queue(maxsize=queue_size)
+        follow_queue = asyncio.Queue(maxsize=queue_size)
+        names = iter(plan.keys)
+        results = {}
+        total = len(plan.keys)
+        self.start_progress(total)
+        
+        def finish(company_name, address, homepage):
+            # 완료되는 대로 저널에 기록
+            results[company_name] = (address, homepage)
+            self.record_result(plan, company_name, address, homepage)
+            self.log(f"진행률: {len(results)}/{total} - {company_name}")
+            self.report_result(company_name, address, homepage, len(results))
+        
+        async def fetch_search_pages():
+            for company_name in names:
+                try:
+                    data, encoding = await loop.run_in_executor(
+                        io_executor, self.fetch_bytes, self.search_url(company_name))
+                except Exception as e:
+                    self.metrics.count('search_error')
+                    self.log(f"{company_name} 검색 중 오류: {e}")
+                    finish(company_name, "", "")
+                    continue
+                # 파싱이 밀려 큐가 차 있으면 여기서 대기
+                with self.metrics.timer('parse_backpressure'):
+                    await parse_queue.put((company_name, data, encoding))
+        
+        async def parse_pages():
+            while True:
+                item = await parse_queue.get()
+                if item is None:
+                    return
+                company_name, data, encoding = item
+                try:
+                    address, candidates, seconds = await loop.run_in_executor(
+                        process_pool, parse_search_result, data, encoding, company_name, top_k)
+                except Exception as e:
+                    self.metrics.count('search_error')
+                    self.log(f"{company_name} 검색 중 오류: {e}")
+                    finish(company_name, "", "")
+                    continue
+                self.metrics.observe('parse', seconds)
+                homepage = candidates[0][1] if candidates else ""
+                if candidates and (self.verifier is not None or self.is_job_site_url(homepage)):
+                    await follow_queue.put((company_name, address, candidates))
+                else:
+                    finish(company_name, address, homepage)
+        
+        async def follow_job_sites():
+            while True:
+                item = await follow_queue.get()
+                if item is None:
+                    return
+                company_name, address, candidates = item
+                job_site_url = candidates[0][1]
+                if self.verifier is not None:
+                    job_site_url = await loop.run_in_executor(
+                        io_executor, self.choose_homepage, candidates, company_name)
+                if not self.is_job_site_url(job_site_url):
+                    finish(company_name, address, job_site_url)
+                    continue
                 
-            except Exception as e:
-                print(f"행 {index + 1} 처리 중 오류: {e}")
-                continue
+                self.metrics.count('job_site_follow')
+                started = time.perf_counter()
+                actual_homepage = self.known_job_site_result(job_site_url)
+                if actual_homepage is None:
+                    try:
+                        data, encoding = await loop.run_in_executor(io_executor, self.fetch_bytes, job_site_url)
+                        actual_homepage, seconds = await loop.run_in_executor(
+                            process_pool, parse_job_site_page, data, encoding, job_site_url)
+                        self.metrics.observe('job_site_parse', seconds)
+                        self.remember_job_site_result(job_site_url, actual_homepage)
+                    except Exception as e:
+                        self.metrics.count('job_site_error')
+                        self.log(f"  -> 구인사이트 크롤링 오류: {e}")
+                        actual_homepage = ""
+                self.metrics.observe('job_site', time.perf_counter() - started)
+                finish(company_name, address, actual_homepage or job_site_url)
         
+        fetch_tasks = [asyncio.create_task(fetch_search_pages()) for _ in range(concurrency)]
+        parse_tasks = [asyncio.create_task(parse_pages()) for _ in range(workers)]
+        follow_tasks = [asyncio.create_task(follow_job_sites()) for _ in range(followers)]
+        try:
+            # 앞 단계가 모두 끝나면 다음 단계에 종료 표시(None)를 보냄
+            await asyncio.gather(*fetch_tasks)
+            for _ in parse_tasks:
+                await parse_queue.put(None)
+            await asyncio.gather(*parse_tasks)
+            for _ in follow_tasks:
+                await follow_queue.put(None)
+            await asyncio.gather(*follow_tasks)
+        finally:
+            for task in fetch_tasks + parse_tasks + follow_tasks:
+                task.cancel()
+            self.rate_limiter = None
+            io_executor.shutdown(wait=True)
+            process_pool.shutdown(wait=True)
+            self.journal.close()
+            self.progress.close()
+        
+        self.apply_results(plan, results)
+        return True
+    
+    def update_excel_streaming(self, output_path=None, concurrency=1, host_rate=0.5):
+        """엑셀을 한 행씩 읽어 검색하고 결과를 바로 새 엑셀에 기록
+        
+        전체 파일을 메모리에 올리지 않고 첫 행부터 바로 검색을 시작한다.
+        concurrency개까지 미리 검색을 걸어 두되, 기록은 원래 행 순서대로 한다.
+        """
+        if output_path is None:
+            output_path = self.excel_file_path.replace('.xlsx', '_업데이트.xlsx')
+        
+        writer = ExcelStreamWriter(output_path, self.output_columns())
+        for _, row, _ in self.iter_collected_rows(concurrency, host_rate):
+            with self.metrics.timer('save'):
+                writer.append_dict(row)
+        
+        with self.metrics.timer('save'):
+            writer.close()
+        print(f"결과 저장 완료: {output_path} ({writer.count}개 행)")
+        if self.manifest is not None:
+            self.manifest.save()
         return True
     
+    def output_columns(self):
+        """결과 엑셀의 열 목록 (원래 열 + 주소, 홈페이지)"""
+        columns = excel_columns(self.excel_file_path)
+        for column in ('주소', '홈페이지'):
+            if column not in columns:
+                columns.append(column)
+        return columns
+    
+    def iter_collected_rows(self, concurrency=1, host_rate=0.5):
+        """엑셀을 한 행씩 읽어 검색하고 (행 번호, 행, 회사명)을 원래 행 순서대로 내보내는 생성기
+        
+        concurrency개까지 미리 검색을 걸어 두고, 앞 행의 결과가 나오는 대로
+        주소/홈페이지를 채운 행을 내보낸다. 저널에 있거나 이미 정보가 있는
+        행은 검색하지 않는다. (update_excel_streaming과 통합 파이프라인에서 사용)
+        """
+        journaled = self.journal.load() if self.resume else {}
+        self.journal.open(self.resume)
+        executor = ThreadPoolExecutor(max_workers=concurrency)
+        self.rate_limiter = HostRateLimiter(host_rate)
+        # (행 번호, 행, 회사명, 행 해시, 검색 Future 또는 None) - 행 순서 유지
+        window = deque()
+        
+        def flush(limit):
+            while len(window) > limit:
+                index, row, company_name, row_hash, future = window.popleft()
+                if future is not None:
+                    # search_company_info는 오류를 직접 세고 빈 결과를 돌려줌 (기록하지 않음)
+                    address, homepage = future.result()
+                    row['주소'] = address
+                    row['홈페이지'] = homepage
+                    self.journal.append(index, company_name, address, homepage)
+                    
+                    self.log(f"진행률: {index + 1} - {company_name}")
+                    self.report_result(company_name, address, homepage)
+                if row_hash is not None and self.found_address(row.get('주소'), row.get('홈페이지')):
+                    self.manifest.record('collector', row_hash, [str(row['주소']), str(row['홈페이지'])])
+                yield index, row, company_name
+        
+        self.start_progress()
+        try:
+            for index, row in self.metrics.timed('load', iter_excel_rows(self.excel_file_path)):
+                name = row.get('회원사명')
+                company_name = str(name).strip() if name is not None else ''
+                future = None
+                row_hash = None
+                remembered = None
+                if self.manifest is not None and company_name:
+                    row_hash = RunManifest.content_hash(company_name, row.get('주소'))
+                    remembered = self.manifest.lookup('collector', row_hash)
+                
+                entry = journaled.get(index)
+                if entry is not None and entry['name'] == company_name:
+                    # 저널에 있는 행은 다시 검색하지 않음
+                    row['주소'] = entry['address']
+                    row['홈페이지'] = entry['homepage']
+                elif not company_name:
+                    self.log(f"행 {index + 1}: 회사명이 없습니다.")
+                elif pd.notna(row.get('주소')) and pd.notna(row.get('홈페이지')):
+                    pass
+                elif remembered is not None:
+                    # 지난 실행과 같은 내용의 행은 매니페스트의 결과 사용
+                    row['주소'], row['홈페이지'] = remembered
+                    self.metrics.count('manifest_reused')
+                else:
+                    future = executor.submit(self.search_company_info, company_name)
+                
+                window.append((index, row, company_name, row_hash, future))
+                yield from flush(concurrency)
+            
+            yield from flush(0)
+        finally:
+            executor.shutdown(wait=True)
+            self.rate_limiter = None
+            self.journal.close()
+            self.progress.close()
+    
     def save_excel(self, output_path=None):
-        """결과를 엑셀 파일로 저장"""
+        """결과를 엑셀 파일로 저장 (write-only 모드로 한 행씩 기록)"""
         if output_path is None:
             output_path = self.excel_file_path.replace('.xlsx', '_업데이트.xlsx')
         
         try:
-            self.df.to_excel(output_path, index=False)
+            with self.metrics.timer('save'):
+                writer = ExcelStreamWriter(output_path, self.df.columns)
+                for values in self.df.itertuples(index=False, name=None):
+                    writer.append(values)
+                writer.close()
             print(f"결과 저장 완료: {output_path}")
             return True
         except Exception as e:
             print(f"파일 저장 실패: {e}")
             return False
     
-    def run(self):
-        """전체 프로세스 실행"""
+    def run(self, concurrency=None, host_rate=2.0, streaming=False, pipeline=False, workers=None):
+        """전체 프로세스 실행 (concurrency 지정 시 비동기 동시 수집, pipeline이면 파싱을 프로세스 풀에서)"""
         print("회원사 정보 자동 수집을 시작합니다...")
         
+        self.metrics.start_snapshots()
+        try:
+            return self.collect(concurrency, host_rate, streaming, pipeline, workers)
+        finally:
+            self.finish_metrics()
+    
+    def finish_metrics(self):
+        """HTTP/캐시 통계를 계측에 더하고 보고서 파일을 씀"""
+        stats = self.http.stats()
+        self.metrics.gauge('http_requests', stats['requests'])
+        self.metrics.gauge('http_connections', stats['connections'])
+        paths = self.metrics.finish()
+        if self.metrics.timers:
+            print(f"단계별 시간: {self.metrics.stage_line()}")
+        if paths:
+            print(f"계측 결과 저장: {paths[0]}, {paths[1]}")
+    
+    def collect(self, concurrency=None, host_rate=2.0, streaming=False, pipeline=False, workers=None):
+        """수집 방식에 따라 검색하고 결과 저장"""
+        verify_skipped = self.verifier is not None and not (concurrency or pipeline)
+        if verify_skipped:
+            # 순차 검색에는 호스트별 요청 제한이 없고, 후보 확인이 행마다 그대로 더해짐
+            print("경고: 순차 검색에서는 홈페이지 검증(--verify-homepages)을 하지 않습니다. "
+                  "검증하려면 --concurrency 또는 --pipeline을 함께 지정하세요.")
+            self.metrics.gauge('verify_skipped', 1)
+            self.verifier = None
+        
+        if streaming:
+            # 한 행씩 읽고 바로 기록 (동시 검색 수 미지정 시 순차 검색, 호스트당 2초 간격)
+            try:
+                self.update_excel_streaming(concurrency=concurrency or 1,
+                                            host_rate=host_rate if concurrency else 0.5)
+            except Exception as e:
+                print(f"스트리밍 처리 실패: {e}")
+                return False
+            if verify_skipped:
+                print("홈페이지 검증: 건너뜀 (순차 검색, 후보는 문자열 점수로만 선택)")
+            print("모든 작업이 완료되었습니다!")
+            return True
+        
         if not self.load_excel():
             return False
         
-        if not self.update_excel():
+        if pipeline:
+            updated = asyncio.run(self.update_excel_pipelined(concurrency or 8, host_rate, workers))
+        elif concurrency:
+            updated = asyncio.run(self.update_excel_async(concurrency, host_rate))
+        else:
+            updated = self.update_excel()
+        
+        if not updated:
             print("정보 수집 중 오류가 발생했습니다.")
             return False
         
+        # 최종 결과는 저널 기준으로 작성
+        self.apply_journal()
+        
         if not self.save_excel():
             return False
+        self.record_manifest()
+        
+        if self.page_cache is not None:
+            print(f"페이지 캐시: 적중 {self.page_cache.hits}개, 미적중 {self.page_cache.misses}개")
+        print(self.http.summary())
+        if verify_skipped:
+            print("홈페이지 검증: 건너뜀 (순차 검색, 후보는 문자열 점수로만 선택)")
         
         print("모든 작업이 완료되었습니다!")
         return True
 
+# 파싱 프로세스에서 추출 메서드만 쓰는 컬렉터 (네트워크/캐시/저널은 쓰지 않음)
+_worker_collector = None
+
+def init_parse_worker():
+    """파싱 프로세스 초기화"""
+    global _worker_collector
+    _worker_collector = CompanyInfoCollector('', page_cache_path=None, journal_path=os.devnull, quiet=True)
+
+def parse_search_result(data, encoding, company_name, top_k=1):
+    """(파싱 프로세스) 검색 결과 페이지에서 (주소, 상위 top_k개 [(점수, 홈페이지 후보)], 소요 초) 추출"""
+    started = time.perf_counter()
+    collector = _worker_collector
+    page = SearchPage(data.decode(encoding or 'utf-8', errors='replace'))
+    address = collector.extract_address(page, company_name)
+    ranked = collector.rank_homepages(collector.homepage_candidates(page, company_name), company_name)
+    return address, ranked[:top_k], time.perf_counter() - started
+
+def parse_job_site_page(data, encoding, job_site_url):
+    """(파싱 프로세스) 구인구직 사이트 페이지에서 (실제 홈페이지, 소요 초) 추출"""
+    started = time.perf_counter()
+    html = data.decode(encoding or 'utf-8', errors='replace')
+    homepage = _worker_collector.extract_homepage_from_job_site_html(html, job_site_url)
+    return homepage, time.perf_counter() - started
+
 # 사용 방법
 if __name__ == "__main__":
-    # 파일 경로 설정
-    excel_file_path = "회원사 목록.xlsx"
+    parser = argparse.ArgumentParser(description="회원사 주소/홈페이지 자동 수집")
+    parser.add_argument('excel_file', nargs='?', default="회원사 목록.xlsx", help="회원사 목록 엑셀 파일 경로")
+    parser.add_argument('--resume', action='store_true', help="저널을 읽어 중단된 행부터 이어서 수집")
+    parser.add_argument('--concurrency', type=int, default=None, help="동시 검색 수 (미지정 시 한 건씩 순차 검색)")
+    parser.add_argument('--host-rate', type=float, default=2.0, help="비동기 모드에서 호스트별 초당 요청 수")
+    parser.add_argument('--replay', action='store_true', help="네트워크 없이 캐시된 페이지만으로 재추출")
+    parser.add_argument('--stream', action='store_true', help="엑셀을 한 행씩 읽고 결과를 바로 기록 (대용량 목록용)")
+    parser.add_argument('--pipeline', action='store_true',
+                        help="요청은 이벤트 루프에서, HTML 파싱은 프로세스 풀에서 처리 "
+                             "(동시 검색 수 기본 8, 코어가 여러 개일 때만 유리)")
+    parser.add_argument('--workers', type=int, default=None, help="파이프라인 모드의 파싱 프로세스 수 (기본: CPU 코어 수)")
+    parser.add_argument('--verify-homepages', action='store_true',
+                        help="홈페이지 후보 상위 몇 개를 실제로 요청해 살아 있는지/제목이 맞는지 확인 후 선택 "
+                             "(--concurrency 또는 --pipeline 필요, --replay에서는 사용 안 함)")
+    parser.add_argument('--verify-top', type=int, default=3, help="검증할 홈페이지 후보 수")
+    parser.add_argument('--metrics', default=None, help="단계별 계측 결과 JSON 경로 (같은 이름의 .prom 파일도 생성)")
+    parser.add_argument('--metrics-interval', type=float, default=0, help="계측 중간 스냅샷 간격(초), 0이면 끝날 때만")
+    parser.add_argument('--quiet', action='store_true', help="행별 출력 대신 진행 상황 한 줄만 표시")
+    parser.add_argument('--full', action='store_true',
+                        help="실행 매니페스트를 무시하고 모든 행을 다시 검색 (매니페스트는 새로 기록)")
+    args = parser.parse_args()
+    
+    manifest = RunManifest(os.path.splitext(args.excel_file)[0] + '_manifest.json', fresh=args.full)
+    verifier = HomepageVerifier(top_k=args.verify_top) if args.verify_homepages else None
     
     # 컬렉터 실행
-    collector = CompanyInfoCollector(excel_file_path)
-    collector.run()
\ No newline at end of file
+    collector = CompanyInfoCollector(args.excel_file, replay=args.replay, resume=args.resume,
+                                     metrics_path=args.metrics, metrics_interval=args.metrics_interval,
+                                     quiet=args.quiet, verifier=verifier, manifest=manifest)
+    collector.run(concurrency=args.concurrency, host_rate=args.host_rate, streaming=args.stream,
+                  pipeline=args.pipeline, workers=args.workers)
+    if verifier is not None:
+        verifier.close()
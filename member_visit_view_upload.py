@@ -1,247 +1,338 @@
 # member_visit_view_v4.py - 구글 지도 API 버전
 
 import pandas as pd
+import gzip
+import html
 import json
-import requests
+import math
+import os
+import random
+import re
+import shutil
+import sqlite3
+import threading
 import time
+from urllib.parse import quote
+from http_session import get_shared_pool
+from excel_stream import read_excel_columns, excel_columns
+from juso_geocoder import JusoGeocoder
+from geocoders import GoogleGeocoder, KakaoGeocoder, NaverGeocoder, FailoverGeocoder
+from run_metrics import RunMetrics, ProgressLine
+from run_manifest import RunManifest
 
-class ExcelToGoogleMap:
-    def __init__(self, excel_file_path, google_api_key):
-        self.excel_file_path = excel_file_path
-        self.google_api_key = google_api_key
-        self.df = None
-        self.company_locations = []
+try:
+    import brotli
+except ImportError:
+    brotli = None
 
-    def load_excel(self):
-        """엑셀 파일을 로드합니다."""
-        try:
-            if self.excel_file_path.endswith('.csv'):
-                self.df = pd.read_csv(self.excel_file_path)
-            else:
-                self.df = pd.read_excel(self.excel_file_path)
-            
-            print(f"✅ 엑셀 파일 로드 완료: {len(self.df)}개 행")
-            required_columns = ['회원사명', '주소']
-            if not all(col in self.df.columns for col in required_columns):
-                print(f"❌ 필요한 컬럼('회원사명', '주소')이 없습니다.")
-                return False
-            return True
-        except Exception as e:
-            print(f"❌ 엑셀 파일 로드 실패: {e}")
-            return False
+# 같은 건물 주소를 하나로 묶기 위한 정규화 규칙 (괄호 참고항목, 층/호수, 쉼표 제거)
+ADDRESS_KEY_PATTERNS = [
+    (r'\([^)]*\)', ' '),
+    (r'(지하\s*)?[Bb]?\d+\s*층', ' '),
+    # 호수는 건물 번호나 쉼표 바로 뒤에 오는 것만 (예: '공단1호로'의 '1호'는 도로명이라 남김)
+    (r'(,\s*|(?<=\d)\s+)(\d+동\s*)?(제\s*)?[Bb]?\d+(-\d+)?\s*호(?![가-힣\d])', ' '),
+    (r',', ' '),
+    (r'\s+', ' '),
+]
 
-    def test_google_api_connection(self):
-        """구글 API 연결을 테스트합니다."""
-        print("🔍 구글 지도 API 연결 테스트 중...")
-        test_address = "서울특별시 강남구 테헤란로 152"
-        
-        url = "https://maps.googleapis.com/maps/api/geocode/json"
-        params = {
-            'address': test_address,
-            'key': self.google_api_key,
-            'language': 'ko',
-            'region': 'kr'
-        }
-        
-        try:
-            print(f"  📍 테스트 주소: {test_address}")
-            print(f"  🔑 API Key: {self.google_api_key[:8]}...")
-            
-            response = requests.get(url, params=params, timeout=10)
-            print(f"  📡 응답 코드: {response.status_code}")
-            
-            if response.status_code == 200:
-                result = response.json()
-                status = result.get('status')
+def normalize_address_keys(addresses):
+    """주소 Series를 건물 단위 키로 정규화합니다. (벡터 연산)"""
+    keys = addresses.str.replace('\r', ' ', regex=False).str.replace('\n', ' ', regex=False)
+    for pattern, repl in ADDRESS_KEY_PATTERNS:
+        keys = keys.str.replace(pattern, repl, regex=True)
+    keys = keys.str.strip()
+    # 정규화 후 비어 버리면 원래 주소 사용
+    return keys.where(keys.ne(''), addresses)
+
+ADDRESS_KEY_REGEXES = [(re.compile(pattern), repl) for pattern, repl in ADDRESS_KEY_PATTERNS]
+
+def address_key(address):
+    """주소 하나를 건물 단위 키로 정규화합니다. (normalize_address_keys와 같은 규칙)"""
+    key = address.replace('\r', ' ').replace('\n', ' ')
+    for regex, repl in ADDRESS_KEY_REGEXES:
+        key = regex.sub(repl, key)
+    return key.strip() or address
+
+# 마커 그룹이 이보다 많으면 클러스터 모드로 지도를 그림
+CLUSTER_THRESHOLD = 500
+# 마커가 이보다 많으면 DROP 애니메이션 생략
+DROP_ANIMATION_LIMIT = 200
+# 클러스터를 미리 계산할 최대 줌 레벨과 격자 크기(픽셀)
+CLUSTER_MAX_ZOOM = 16
+CLUSTER_CELL_PX = 60
+# 지도 데이터 좌표의 고정소수점 배율 (소수점 6자리, 약 0.1m)
+COORD_SCALE = 1000000
+# 클러스터 수가 그룹 수의 이 비율에 이르면 더 확대된 줌은 계산하지 않음
+CLUSTER_SPLIT_RATIO = 0.95
+# 마커 그룹을 나눠 담는 타일의 줌 레벨 (10이면 한 변 약 30km)
+TILE_ZOOM = 10
+
+def quantize(value):
+    """좌표를 지도 데이터와 같은 고정소수점 값으로 맞춥니다. (페이지에서 푼 값과 동일)"""
+    return int(round(value * COORD_SCALE)) / COORD_SCALE
+
+def mercator(lat, lng):
+    """위경도를 웹 메르카토르 좌표(0~1 범위)로 변환합니다. (페이지 JS와 같은 계산식)"""
+    siny = min(max(math.sin(lat * math.pi / 180), -0.9999), 0.9999)
+    x = (lng + 180) / 360
+    y = 0.5 - math.log((1 + siny) / (1 - siny)) / (4 * math.pi)
+    return x, y
+
+def tile_quadkey(lat, lng, zoom=TILE_ZOOM):
+    """좌표가 속한 zoom 레벨 타일의 쿼드키를 반환합니다."""
+    x, y = mercator(lat, lng)
+    n = 2 ** zoom
+    tx = min(n - 1, max(0, int(math.floor(x * n))))
+    ty = min(n - 1, max(0, int(math.floor(y * n))))
+    digits = []
+    for z in range(zoom, 0, -1):
+        mask = 1 << (z - 1)
+        digits.append(str((1 if tx & mask else 0) + (2 if ty & mask else 0)))
+    return ''.join(digits)
+
+class TokenBucket:
+    """초당 요청 수(QPS) 할당량에 맞춰 요청을 흘려보내는 토큰 버킷 제한기"""
+    def __init__(self, rate, capacity=None):
+        self.rate = float(rate)
+        self.capacity = float(capacity if capacity is not None else max(1.0, rate))
+        self.tokens = self.capacity
+        self.updated_at = time.monotonic()
+        self.lock = threading.Lock()
+        # 통계
+        self.acquired = 0
+        self.throttled_count = 0
+        self.throttled_seconds = 0.0
+
+    def acquire(self):
+        """토큰 하나를 얻을 때까지 대기합니다."""
+        throttled = False
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+                self.updated_at = now
                 
-                if status == 'OK':
-                    print("  ✅ API 연결 성공!")
-                    return True
-                elif status == 'REQUEST_DENIED':
-                    print(f"  ❌ API 키 오류: {result.get('error_message', 'API 키가 유효하지 않습니다.')}")
-                elif status == 'OVER_QUERY_LIMIT':
-                    print("  ❌ API 사용량 초과")
-                else:
-                    print(f"  ❌ API 응답 오류: {status} - {result.get('error_message', '')}")
-            else:
-                print(f"  ❌ HTTP 오류: {response.status_code}")
-                print(f"  📄 응답 내용: {response.text}")
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    self.acquired += 1
+                    if throttled:
+                        self.throttled_count += 1
+                    return
                 
-        except Exception as e:
-            print(f"  💥 연결 테스트 실패: {e}")
+                wait = (1 - self.tokens) / self.rate
+                self.throttled_seconds += wait
             
-        return False
+            throttled = True
+            time.sleep(wait)
 
-    def geocode_address_google(self, address):
-        """구글 Geocoding API를 사용해 주소를 좌표로 변환합니다."""
-        cleaned_address = address.strip().replace('\n', ' ').replace('\r', ' ')
+    def reset_stats(self):
+        """통계를 초기화합니다."""
+        self.acquired = 0
+        self.throttled_count = 0
+        self.throttled_seconds = 0.0
+
+class GeocodeCache:
+    """주소 → 좌표 변환 결과를 SQLite 파일에 보관하는 캐시
+
+    키의 주소 부분은 건물 단위 키(address_key)입니다. 그 전 형식(정리된 주소 그대로)으로
+    기록된 캐시 파일은 처음 열 때 한 번 새 형식 키로 옮깁니다. (PRAGMA user_version)
+    """
+    # 키 형식 버전 (0: 정리된 주소, 1: 건물 단위 키)
+    KEY_VERSION = 1
+
+    def __init__(self, db_path="geocode_cache.sqlite", ttl_days=30, max_entries=100000):
+        self.db_path = db_path
+        self.ttl_seconds = ttl_days * 24 * 60 * 60 if ttl_days else None
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
         
-        url = "https://maps.googleapis.com/maps/api/geocode/json"
-        params = {
-            'address': cleaned_address,
-            'key': self.google_api_key,
-            'language': 'ko',  # 한국어 우선
-            'region': 'kr'     # 한국 지역 우선
-        }
+        self.conn = sqlite3.connect(db_path)
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS geocode ("
+            " key TEXT PRIMARY KEY, lat REAL, lng REAL,"
+            " created_at REAL, accessed_at REAL)"
+        )
+        self.conn.execute("CREATE INDEX IF NOT EXISTS idx_geocode_accessed ON geocode (accessed_at)")
+        self.conn.commit()
+        self.migrate_keys()
+
+    def migrate_keys(self):
+        """이전 형식 키를 건물 단위 키로 옮깁니다. (같은 건물의 항목이 여럿이면 먼저 옮긴 것을 남김)"""
+        version = self.conn.execute("PRAGMA user_version").fetchone()[0]
+        if version >= self.KEY_VERSION:
+            return
         
-        try:
-            # API 요청 제한을 위한 딜레이 (구글은 초당 50회 제한)
-            time.sleep(0.05)
-            
-            response = requests.get(url, params=params, timeout=15)
-            
-            if response.status_code != 200:
-                print(f"  ❌ HTTP 오류 {response.status_code}: {response.text}")
-                return None
-                
-            result = response.json()
-            status = result.get('status')
-            
-            if status == 'OK' and result.get('results'):
-                # 첫 번째 결과 사용 (가장 정확한 결과)
-                location = result['results'][0]['geometry']['location']
-                return {
-                    'lat': float(location['lat']), 
-                    'lng': float(location['lng'])
-                }
-            elif status == 'ZERO_RESULTS':
-                print(f"  ⚠️ 검색 결과 없음: '{cleaned_address}'")
-                return None
-            elif status == 'OVER_QUERY_LIMIT':
-                print(f"  ⏱️ API 사용량 초과 - 1초 대기 후 재시도")
-                time.sleep(1)
-                return self.geocode_address_google(address)  # 재시도
-            elif status == 'REQUEST_DENIED':
-                print(f"  🚫 API 키 오류: {result.get('error_message', '')}")
-                return None
-            else:
-                print(f"  ⚠️ API 오류 {status}: {result.get('error_message', '')}")
-                return None
-                
-        except requests.exceptions.Timeout:
-            print(f"  ⏰ API 요청 타임아웃")
-            return None
-        except requests.exceptions.RequestException as e:
-            print(f"  💥 API 요청 오류: {e}")
-            return None
-        except Exception as e:
-            print(f"  💥 알 수 없는 오류: {e}")
-            return None
+        rows = self.conn.execute("SELECT key, lat, lng, created_at, accessed_at FROM geocode").fetchall()
+        moved = 0
+        for key, lat, lng, created_at, accessed_at in rows:
+            language, region, address = key.split('|', 2) if key.count('|') >= 2 else ('', '', key)
+            new_key = self.make_key(address, {'language': language, 'region': region})
+            if new_key == key:
+                continue
+            self.conn.execute(
+                "INSERT OR IGNORE INTO geocode (key, lat, lng, created_at, accessed_at) VALUES (?, ?, ?, ?, ?)",
+                (new_key, lat, lng, created_at, accessed_at)
+            )
+            self.conn.execute("DELETE FROM geocode WHERE key = ?", (key,))
+            moved += 1
+        self.conn.execute(f"PRAGMA user_version = {self.KEY_VERSION}")
+        self.conn.commit()
+        if moved:
+            print(f"💾 좌표 캐시 키를 건물 단위로 옮겼습니다: {moved}개")
 
-    def process_addresses(self):
-        """모든 주소를 처리하여 좌표로 변환합니다."""
-        if self.df is None: 
-            return False
-            
-        # API 연결 테스트 먼저 실행
-        if not self.test_google_api_connection():
-            print("\n❌ 구글 지도 API 연결 실패. 다음을 확인해주세요:")
-            print("   1. https://console.cloud.google.com 에서 프로젝트 생성")
-            print("   2. Maps JavaScript API 및 Geocoding API 활성화")
-            print("   3. API 키 생성 및 정확한 입력")
-            print("   4. 결제 정보 등록 (무료 사용량: 월 $200)")
-            return False
+    @staticmethod
+    def make_key(cleaned_address, params):
+        """주소의 건물 단위 키와 언어/지역 파라미터로 캐시 키를 만듭니다. (같은 건물이면 층/호수가 달라도 같은 키)"""
+        return f"{params.get('language', '')}|{params.get('region', '')}|{address_key(cleaned_address)}"
+
+    def get(self, key):
+        """캐시된 좌표를 반환합니다. 없거나 만료되었으면 None."""
+        row = self.conn.execute(
+            "SELECT lat, lng, created_at FROM geocode WHERE key = ?", (key,)
+        ).fetchone()
+        now = time.time()
         
-        print("\n🔄 구글 지도 API로 주소를 좌표로 변환 중...")
-        print("=" * 60)
+        if row is None:
+            self.misses += 1
+            return None
         
-        success_count = 0
-        fail_count = 0
+        lat, lng, created_at = row
+        if self.ttl_seconds is not None and now - created_at > self.ttl_seconds:
+            self.conn.execute("DELETE FROM geocode WHERE key = ?", (key,))
+            self.conn.commit()
+            self.misses += 1
+            return None
         
-        for index, row in self.df.iterrows():
-            company_name = str(row.get('회원사명', '')).strip()
-            address = str(row.get('주소', '')).strip()
+        # LRU 순서 갱신
+        self.conn.execute("UPDATE geocode SET accessed_at = ? WHERE key = ?", (now, key))
+        self.conn.commit()
+        self.hits += 1
+        return {'lat': lat, 'lng': lng}
 
-            if not company_name or not address or address == 'nan':
-                continue
+    def put(self, key, coords):
+        """좌표를 저장하고, 최대 개수를 넘으면 가장 오래 쓰이지 않은 항목부터 지웁니다."""
+        now = time.time()
+        self.conn.execute(
+            "INSERT OR REPLACE INTO geocode (key, lat, lng, created_at, accessed_at) VALUES (?, ?, ?, ?, ?)",
+            (key, coords['lat'], coords['lng'], now, now)
+        )
+        
+        if self.max_entries:
+            count = self.conn.execute("SELECT COUNT(*) FROM geocode").fetchone()[0]
+            if count > self.max_entries:
+                self.conn.execute(
+                    "DELETE FROM geocode WHERE key IN "
+                    "(SELECT key FROM geocode ORDER BY accessed_at ASC LIMIT ?)",
+                    (count - self.max_entries,)
+                )
+        self.conn.commit()
+
+    def reset_stats(self):
+        """적중/미적중 카운터를 초기화합니다."""
+        self.hits = 0
+        self.misses = 0
+
+    def close(self):
+        """캐시 DB 연결을 닫습니다."""
+        self.conn.close()
 
-            print(f"\n📋 처리 중 ({index+1}/{len(self.df)}): {company_name}")
-            print(f"  📍 주소: {address}")
+# 지도 데이터 JSON 인코더 (공백 없이, 한글 그대로)
+JSON_ENCODER = json.JSONEncoder(ensure_ascii=False, separators=(',', ':'))
 
-            coords = self.geocode_address_google(address)
+def iter_script_json(data):
+    """<script> 안에 넣을 JSON을 조각 단위로 만듭니다. ('<'는 \\u003c로 이스케이프)"""
+    for chunk in JSON_ENCODER.iterencode(data):
+        yield chunk.replace('<', '\\u003c')
+
+def region_of(address):
+    """주소의 첫 단어(시/도)를 지역으로 사용합니다."""
+    return (address.split() or [''])[0]
+
+class PageTemplate:
+    """@@이름@@ 또는 @@이름:필터@@ 자리표시자를 가진 HTML 템플릿
+    
+    모듈을 읽을 때 한 번 조각으로 나눠 두고, 렌더링할 때는 조각을 파일에
+    바로 씁니다. 값이 함수이면 그 함수가 돌려주는 조각을 차례로 씁니다.
+    (이미 이스케이프된 스트리밍 값)
+    """
+    PLACEHOLDER = re.compile(r'@@(\w+)(?::(\w+))?@@')
+    FILTERS = {
+        'html': lambda value: html.escape(str(value)),
+        'js': lambda value: json.dumps(value, ensure_ascii=False).replace('<', '\\u003c'),
+        'url': lambda value: html.escape(quote(str(value), safe='')),
+        'raw': str,
+    }
+
+    def __init__(self, source):
+        # 템플릿이 바뀌면 지도를 다시 만들도록 원문 해시를 둠
+        self.digest = RunManifest.digest([source])
+        self.chunks = []
+        position = 0
+        for match in self.PLACEHOLDER.finditer(source):
+            self.chunks.append(source[position:match.start()])
+            self.chunks.append((match.group(1), self.FILTERS[match.group(2) or 'html']))
+            position = match.end()
+        self.chunks.append(source[position:])
+
+    def render_to(self, f, context):
+        """context 값을 채워 파일 객체 f에 조각 단위로 씁니다."""
+        for chunk in self.chunks:
+            if isinstance(chunk, str):
+                f.write(chunk)
+                continue
             
-            if coords:
-                self.company_locations.append({
-                    'name': company_name,
-                    'address': address,
-                    'lat': coords['lat'],
-                    'lng': coords['lng']
-                })
-                print(f"  ✅ 성공: ({coords['lat']:.6f}, {coords['lng']:.6f})")
-                success_count += 1
+            name, apply_filter = chunk
+            value = context[name]
+            if callable(value):
+                for piece in value():
+                    f.write(piece)
             else:
-                print(f"  ❌ 실패: 좌표를 찾을 수 없습니다.")
-                fail_count += 1
-            
-        print("\n" + "=" * 60)
-        print(f"🎉 처리 완료: 성공 {success_count}개, 실패 {fail_count}개")
-        return success_count > 0
-
-    def generate_html(self, output_path="회원사_지도_구글.html"):
-        """구글 지도와 테이블이 포함된 HTML 파일을 생성합니다."""
-        if not self.company_locations:
-            print("❌ 처리된 위치 데이터가 없어 HTML을 생성할 수 없습니다.")
-            return
+                f.write(apply_filter(value))
 
-        avg_lat = sum(loc['lat'] for loc in self.company_locations) / len(self.company_locations)
-        avg_lng = sum(loc['lng'] for loc in self.company_locations) / len(self.company_locations)
-        
-        # 회사 위치를 JavaScript 형태로 변환
-        locations_js = json.dumps(self.company_locations, ensure_ascii=False)
-        
-        table_rows_html = ""
-        for i, location in enumerate(self.company_locations, 1):
-            table_rows_html += f"""
-            <tr onclick="panToMarker({i-1})">
-                <td>{i}</td>
-                <td>{location['name']}</td>
-                <td>{location['address']}</td>
-            </tr>
-            """
-        
-        html_content = f'''<!DOCTYPE html>
+MAP_PAGE_TEMPLATE = PageTemplate('''<!DOCTYPE html>
 <html lang="ko">
 <head>
     <meta charset="UTF-8">
     <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>회원사 위치 지도 (Google Maps Ver.)</title>
+    <title>@@title@@ (Google Maps Ver.)</title>
     <style>
-        body {{ 
+        body { 
             font-family: 'Malgun Gothic', Arial, sans-serif; 
             margin: 0; 
             background-color: #f5f5f5; 
-        }}
+        }
         
-        .header {{ 
+        .header { 
             text-align: center; 
             padding: 20px; 
             background: linear-gradient(135deg, #4285F4, #34A853);
             color: white; 
             box-shadow: 0 2px 10px rgba(0,0,0,0.1);
-        }}
+        }
         
-        .main-content {{ 
+        .main-content { 
             display: flex; 
             gap: 20px; 
             padding: 20px; 
             max-width: 1400px;
             margin: 0 auto;
-        }}
+        }
         
-        .map-container {{ 
+        .map-container { 
             flex: 7; 
             box-shadow: 0 4px 20px rgba(0,0,0,0.1); 
             border-radius: 12px; 
             overflow: hidden; 
             background: white;
-        }}
+        }
         
-        #map {{ 
+        #map { 
             height: 85vh; 
             width: 100%;
-        }}
+        }
         
-        .list-container {{ 
+        .list-container { 
             flex: 3; 
             background: white; 
             box-shadow: 0 4px 20px rgba(0,0,0,0.1); 
@@ -250,73 +341,105 @@ class ExcelToGoogleMap:
             height: 85vh; 
             display: flex; 
             flex-direction: column; 
-        }}
+        }
         
-        .stats-info {{ 
+        .stats-info { 
             background: linear-gradient(135deg, #e3f2fd, #f3e5f5);
             border-left: 4px solid #4285F4;
             padding: 15px; 
             margin-bottom: 20px; 
             border-radius: 8px; 
             font-size: 14px;
-        }}
+        }
         
-        .table-wrapper {{ 
+        .table-wrapper { 
             overflow-y: auto; 
             flex-grow: 1; 
             border-radius: 8px;
             border: 1px solid #e0e0e0;
-        }}
+        }
         
-        table {{ 
+        table { 
             width: 100%; 
             border-collapse: collapse; 
-        }}
+            table-layout: fixed; 
+        }
         
-        th, td {{ 
+        th, td { 
             padding: 12px 10px; 
             text-align: left; 
             border-bottom: 1px solid #eee; 
-        }}
+        }
+        
+        /* 가상 스크롤: 행 높이 고정 */
+        tbody td { 
+            height: 20px; 
+            white-space: nowrap; 
+            overflow: hidden; 
+            text-overflow: ellipsis; 
+        }
+        
+        .list-filters { 
+            display: flex; 
+            gap: 8px; 
+            margin-bottom: 10px; 
+        }
+        
+        .list-filters input, .list-filters select { 
+            padding: 8px 10px; 
+            border: 1px solid #ccc; 
+            border-radius: 6px; 
+            font-size: 14px; 
+        }
         
-        th {{ 
+        .list-filters input { 
+            flex-grow: 1; 
+        }
+        
+        .result-count { 
+            font-size: 13px; 
+            color: #666; 
+            margin-bottom: 8px; 
+        }
+        
+        th { 
             background: linear-gradient(135deg, #f8f9fa, #e9ecef);
             position: sticky; 
             top: 0; 
             font-weight: 600;
             z-index: 10;
-        }}
+        }
         
-        tbody tr:hover {{ 
+        tbody tr:hover { 
             background-color: #e3f2fd; 
             cursor: pointer; 
             transform: translateX(2px);
             transition: all 0.2s ease;
-        }}
+        }
         
-        .loading {{ 
+        .loading { 
             text-align: center; 
             padding: 50px; 
             color: #666; 
-        }}
+        }
 
-        @media (max-width: 768px) {{
-            .main-content {{ 
+        @media (max-width: 768px) {
+            .main-content { 
                 flex-direction: column; 
                 padding: 10px;
-            }}
-            .map-container, .list-container {{ 
+            }
+            .map-container, .list-container { 
                 flex: none; 
                 height: 50vh; 
-            }}
-        }}
+            }
+        }
     </style>
 </head>
 <body>
     <div class="header">
-        <h1>🏢회원사 위치 지도</h1>
+        <h1>🏢@@title@@</h1>
         <p style="margin: 5px 0; opacity: 0.9;">Google Maps API 기반 정확한 위치 정보</p>
-        <p style="margin: 0; font-size: 14px; opacity: 0.8;">총 {len(self.company_locations)}개 회원사</p>
+        <p style="margin: 0; font-size: 14px; opacity: 0.8;">총 @@company_count@@개 회원사</p>
     </div>
     
     <div class="main-content">
@@ -331,12 +454,20 @@ class ExcelToGoogleMap:
             
             <div class="stats-info">
                 <strong>🎯 지도 정보</strong><br>
-                • 총 회원사: {len(self.company_locations)}개<br>
+                • 총 회원사: @@company_count@@개<br>
                 • API: Google Maps<br>
                 • 클릭하면 해당 위치로 이동합니다
             </div>
             
-            <div class="table-wrapper">
+            <div class="list-filters">
+                <input id="searchInput" type="search" placeholder="🔍 회원사명 또는 주소 검색">
+                <select id="regionSelect">
+                    <option value="-1">전체 지역</option>
+                </select>
+            </div>
+            <div class="result-count" id="resultCount"></div>
+            
+            <div class="table-wrapper" id="tableWrapper">
                 <table>
                     <thead>
                         <tr>
@@ -345,7 +476,7 @@ class ExcelToGoogleMap:
                             <th>주소</th>
                         </tr>
                     </thead>
-                    <tbody>{table_rows_html}</tbody>
+                    <tbody id="tableBody"></tbody>
                 </table>
             </div>
         </div>
@@ -353,129 +484,1229 @@ class ExcelToGoogleMap:
 
     <script>
         let map;
-        let markers = [];
-        const companyLocations = {locations_js};
+        let infoWindow;
+        // 지도 데이터 (mapDataReady 이후 채워짐)
+        let companyLocations = [];
+        // 같은 위치의 회원사 묶음 (members: companyLocations 인덱스, 읽은 타일의 그룹만 채워짐)
+        const markerGroups = [];
+        // 줌 레벨별 클러스터 (null이면 화면 안의 마커만 표시)
+        let clusterLevels = null;
+        // 마커 그룹 타일 (쿼드키 → 조각): 화면에 걸친 타일만 읽음
+        let tileZoom = 0;
+        let tileChunks = null;
+        let tileUrl = '';
+        let tiles = [];
+        const loadedTiles = new Map();
+        const tileGroups = new Map();
+        let regionNames = [];
+        let companyRegions = [];
+        // 회원사 인덱스 → 마커 그룹 인덱스
+        const companyGroup = [];
+        const useDropAnimation = @@drop_animation:js@@;
+        const dataBounds = @@data_bounds:js@@;
+        // 화면에 올라간 마커 ('g그룹' 또는 'c줌_번호' → 마커)
+        const renderedMarkers = new Map();
+
+        // 압축된 지도 데이터 풀기 (좌표: 고정소수점 차분, 이름/주소: 문자열 테이블 인덱스)
+        function decodeMapData(data) {
+            let lat = 0;
+            let lng = 0;
+            companyLocations = new Array(data.names.length);
+            for (let i = 0; i < data.names.length; i++) {
+                lat += data.coords[2 * i];
+                lng += data.coords[2 * i + 1];
+                companyLocations[i] = {
+                    name: data.strings[data.names[i]],
+                    address: data.strings[data.addresses[i]],
+                    lat: lat / data.scale,
+                    lng: lng / data.scale
+                };
+            }
+            tileZoom = data.tiles.zoom;
+            tileChunks = data.tiles.chunks || null;
+            tileUrl = data.tiles.url || '';
+            tiles = (data.tiles.keys || Object.keys(tileChunks)).map(key => {
+                const [x, y] = quadkeyXY(key);
+                return { key: key, x: x, y: y };
+            });
+            clusterLevels = data.clusters;
+            regionNames = data.regions;
+            companyRegions = data.companyRegions;
+        }
+
+        const mapDataReady = @@map_data:raw@@.then(decodeMapData);
+
+        // 좌표가 속한 타일 번호 (파이썬 tile_quadkey와 같은 계산식)
+        function tileXY(lat, lng) {
+            const siny = Math.min(Math.max(Math.sin(lat * Math.PI / 180), -0.9999), 0.9999);
+            const x = (lng + 180) / 360;
+            const y = 0.5 - Math.log((1 + siny) / (1 - siny)) / (4 * Math.PI);
+            const n = 2 ** tileZoom;
+            return [
+                Math.min(n - 1, Math.max(0, Math.floor(x * n))),
+                Math.min(n - 1, Math.max(0, Math.floor(y * n)))
+            ];
+        }
 
-        function initMap() {{
+        function tileKey(lat, lng) {
+            const [x, y] = tileXY(lat, lng);
+            let key = '';
+            for (let z = tileZoom; z > 0; z--) {
+                const mask = 1 << (z - 1);
+                key += ((x & mask) ? 1 : 0) + ((y & mask) ? 2 : 0);
+            }
+            return key;
+        }
+
+        function quadkeyXY(key) {
+            let x = 0;
+            let y = 0;
+            for (const digit of key) {
+                const d = Number(digit);
+                x = x * 2 + (d & 1);
+                y = y * 2 + (d >> 1);
+            }
+            return [x, y];
+        }
+
+        // 화면 범위에 걸친 (데이터가 있는) 타일 쿼드키 목록
+        function tilesInBounds(bounds) {
+            const sw = bounds.getSouthWest();
+            const ne = bounds.getNorthEast();
+            const [x0, y1] = tileXY(sw.lat(), sw.lng());
+            const [x1, y0] = tileXY(ne.lat(), ne.lng());
+            // 날짜 변경선을 걸친 화면이면 x 범위가 둘로 나뉨
+            const inX = x0 <= x1 ? (x => x >= x0 && x <= x1) : (x => x >= x0 || x <= x1);
+            return tiles.filter(t => inX(t.x) && t.y >= y0 && t.y <= y1).map(t => t.key);
+        }
+
+        // 타일 조각을 읽어 마커 그룹을 채움 (타일마다 한 번만)
+        function loadTile(key) {
+            if (!loadedTiles.has(key)) {
+                const chunk = tileChunks
+                    ? Promise.resolve(tileChunks[key] || [])
+                    : fetch(tileUrl + key + '.json').then(r => r.ok ? r.json() : []);
+                loadedTiles.set(key, chunk.then(entries => {
+                    tileGroups.set(key, entries.map(entry => {
+                        const groupIndex = entry[0];
+                        const members = entry.slice(1);
+                        members.forEach(i => companyGroup[i] = groupIndex);
+                        const first = companyLocations[members[0]];
+                        markerGroups[groupIndex] = { lat: first.lat, lng: first.lng, members: members };
+                        return groupIndex;
+                    }));
+                }));
+            }
+            return loadedTiles.get(key);
+        }
+
+        function initMap() {
             // 지도 초기화
-            const centerLat = {avg_lat};
-            const centerLng = {avg_lng};
+            const centerLat = @@avg_lat:js@@;
+            const centerLng = @@avg_lng:js@@;
             
-            map = new google.maps.Map(document.getElementById('map'), {{
+            map = new google.maps.Map(document.getElementById('map'), {
                 zoom: 8,
-                center: {{ lat: centerLat, lng: centerLng }},
+                center: { lat: centerLat, lng: centerLng },
                 mapTypeId: 'roadmap',
                 styles: [
-                    {{
+                    {
                         featureType: 'poi',
                         elementType: 'labels',
-                        stylers: [{{ visibility: 'on' }}]
-                    }}
+                        stylers: [{ visibility: 'on' }]
+                    }
                 ]
-            }});
+            });
 
-            // 마커 추가
-            const bounds = new google.maps.LatLngBounds();
-            
-            companyLocations.forEach((location, index) => {{
-                const marker = new google.maps.Marker({{
-                    position: {{ lat: location.lat, lng: location.lng }},
-                    map: map,
-                    title: location.name,
-                    animation: google.maps.Animation.DROP
-                }});
-
-                // 정보창 생성
-                const infoWindow = new google.maps.InfoWindow({{
-                    content: `
-                        <div style="padding: 10px; max-width: 300px;">
-                            <h3 style="margin: 0 0 8px 0; color: #333; font-size: 16px;">
-                                🏢 ${{location.name}}
-                            </h3>
-                            <p style="margin: 0; color: #666; font-size: 14px; line-height: 1.4;">
-                                📍 ${{location.address}}
-                            </p>
-                        </div>
-                    `
-                }});
-
-                // 마커 클릭 이벤트
-                marker.addListener('click', () => {{
-                    // 다른 정보창들 닫기
-                    markers.forEach(m => m.infoWindow.close());
-                    // 현재 정보창 열기
-                    infoWindow.open(map, marker);
-                }});
-
-                // 마커와 정보창 저장
-                markers.push({{ marker: marker, infoWindow: infoWindow }});
-                
-                // 경계 확장
-                bounds.extend(marker.getPosition());
-            }});
+            // 정보창은 하나만 만들어 재사용
+            infoWindow = new google.maps.InfoWindow();
 
-            // 모든 마커가 보이도록 지도 조정
-            if (companyLocations.length > 0) {{
-                map.fitBounds(bounds);
-                
-                // 최대 줌 레벨 제한 (너무 가까이 가지 않도록)
-                const listener = google.maps.event.addListener(map, 'idle', () => {{
-                    if (map.getZoom() > 16) map.setZoom(16);
-                    google.maps.event.removeListener(listener);
-                }});
-            }}
-        }}
+            mapDataReady.then(() => {
+                // 지도가 멈출 때마다 현재 줌/화면에 필요한 타일과 마커만 표시
+                map.addListener('idle', renderMarkers);
+                renderMarkers();
+
+                // 데이터 범위(미리 계산된 값)가 보이도록 지도 조정
+                if (companyLocations.length > 0) {
+                    map.fitBounds(dataBounds);
+                    
+                    // 최대 줌 레벨 제한 (너무 가까이 가지 않도록)
+                    const listener = google.maps.event.addListener(map, 'idle', () => {
+                        if (map.getZoom() > 16) map.setZoom(16);
+                        google.maps.event.removeListener(listener);
+                    });
+                }
+            });
+        }
+
+        function escapeHtml(text) {
+            return String(text).replace(/[&<>"']/g, c => ({
+                '&': '&amp;', '<': '&lt;', '>': '&gt;', '"': '&quot;', "'": '&#39;'
+            })[c]);
+        }
+
+        // 정보창 내용 (클릭할 때 생성)
+        function infoContent(groupIndex) {
+            const members = markerGroups[groupIndex].members.map(i => companyLocations[i]);
+            return `
+                <div style="padding: 10px; max-width: 300px; max-height: 300px; overflow-y: auto;">
+                    ${members.map(location => `
+                        <h3 style="margin: 0 0 8px 0; color: #333; font-size: 16px;">
+                            🏢 ${escapeHtml(location.name)}
+                        </h3>
+                        <p style="margin: 0 0 10px 0; color: #666; font-size: 14px; line-height: 1.4;">
+                            📍 ${escapeHtml(location.address)}
+                        </p>
+                    `).join('')}
+                </div>
+            `;
+        }
+
+        function openInfo(groupIndex, marker) {
+            infoWindow.setContent(infoContent(groupIndex));
+            infoWindow.open(map, marker);
+        }
+
+        // 회원사(같은 위치 묶음) 마커 생성
+        function createGroupMarker(groupIndex) {
+            const group = markerGroups[groupIndex];
+            const first = companyLocations[group.members[0]];
+            const count = group.members.length;
+            const marker = new google.maps.Marker({
+                position: { lat: group.lat, lng: group.lng },
+                map: map,
+                title: count > 1 ? `${first.name} 외 ${count - 1}곳` : first.name,
+                label: count > 1 ? String(count) : undefined,
+                animation: useDropAnimation ? google.maps.Animation.DROP : null
+            });
+            marker.addListener('click', () => openInfo(groupIndex, marker));
+            return marker;
+        }
+
+        // 클러스터 마커 생성 (클릭하면 확대)
+        function createClusterMarker(lat, lng, count) {
+            const marker = new google.maps.Marker({
+                position: { lat: lat, lng: lng },
+                map: map,
+                title: `회원사 ${count}곳`,
+                label: { text: String(count), color: 'white', fontSize: '12px', fontWeight: 'bold' },
+                icon: {
+                    path: google.maps.SymbolPath.CIRCLE,
+                    scale: Math.min(30, 12 + Math.log2(count) * 3),
+                    fillColor: '#4285F4',
+                    fillOpacity: 0.85,
+                    strokeColor: 'white',
+                    strokeWeight: 2
+                },
+                zIndex: 1000 + count
+            });
+            marker.addListener('click', () => {
+                map.panTo({ lat: lat, lng: lng });
+                map.setZoom(Math.min(map.getZoom() + 2, clusterLevels.maxZoom + 1));
+            });
+            return marker;
+        }
+
+        // 현재 줌/화면에 필요한 마커만 남기고 나머지는 제거
+        let renderSeq = 0;
+        function renderMarkers() {
+            const seq = ++renderSeq;
+            const zoom = map.getZoom();
+            const bounds = map.getBounds();
+            if (!bounds) return Promise.resolve();
+
+            const visible = (lat, lng) => bounds.contains({ lat: lat, lng: lng });
+            const clustered = clusterLevels && zoom <= clusterLevels.maxZoom;
+            let clusters = [];
+            let keys;
+            if (clustered) {
+                // 클러스터는 데이터에 들어 있으므로 그룹 하나짜리 칸의 타일만 읽음
+                clusterLevels.levels[Math.max(0, zoom)].forEach((cluster, i) => {
+                    if (visible(cluster[0], cluster[1])) clusters.push([i, cluster]);
+                });
+                keys = [...new Set(clusters
+                    .filter(([, cluster]) => cluster[3] >= 0)
+                    .map(([, cluster]) => tileKey(cluster[0], cluster[1])))];
+            } else {
+                keys = tilesInBounds(bounds);
+            }
+
+            return Promise.all(keys.map(loadTile)).then(() => {
+                // 타일을 읽는 사이 지도가 다시 움직였으면 이번 결과는 버림
+                if (seq !== renderSeq) return;
+
+                const wanted = new Map();
+                if (clustered) {
+                    clusters.forEach(([i, cluster]) => {
+                        const [lat, lng, count, groupIndex] = cluster;
+                        if (groupIndex < 0) wanted.set(`c${zoom}_${i}`, [-1, lat, lng, count]);
+                        else if (markerGroups[groupIndex]) wanted.set('g' + groupIndex, [groupIndex]);
+                    });
+                } else {
+                    keys.forEach(key => tileGroups.get(key).forEach(groupIndex => {
+                        const group = markerGroups[groupIndex];
+                        if (visible(group.lat, group.lng)) wanted.set('g' + groupIndex, [groupIndex]);
+                    }));
+                }
+
+                renderedMarkers.forEach((marker, key) => {
+                    if (!wanted.has(key)) {
+                        marker.setMap(null);
+                        renderedMarkers.delete(key);
+                    }
+                });
+                wanted.forEach((item, key) => {
+                    if (renderedMarkers.has(key)) return;
+                    renderedMarkers.set(key, item[0] >= 0
+                        ? createGroupMarker(item[0])
+                        : createClusterMarker(item[1], item[2], item[3]));
+                });
+            });
+        }
 
         // 테이블에서 클릭했을 때 해당 마커로 이동
-        function panToMarker(index) {{
-            if (index >= 0 && index < companyLocations.length) {{
+        const PAN_ZOOM = 16;
+        // 지도가 멈추면 정보창을 열도록 걸어 둔 리스너 (다른 행을 누르면 취소)
+        let pendingPan = null;
+        function openMarkerInfo(index, location) {
+            loadTile(tileKey(location.lat, location.lng)).then(() => {
+                const groupIndex = companyGroup[index];
+                if (groupIndex === undefined) return;
+                const key = 'g' + groupIndex;
+                if (!renderedMarkers.has(key)) {
+                    renderedMarkers.set(key, createGroupMarker(groupIndex));
+                }
+                openInfo(groupIndex, renderedMarkers.get(key));
+            });
+        }
+        function panToMarker(index) {
+            if (index >= 0 && index < companyLocations.length) {
                 const location = companyLocations[index];
+                if (pendingPan) {
+                    google.maps.event.removeListener(pendingPan);
+                    pendingPan = null;
+                }
                 
-                // 지도 이동 및 줌
-                map.panTo({{ lat: location.lat, lng: location.lng }});
-                map.setZoom(16);
+                // 이미 그 위치/줌이면 지도가 움직이지 않아 idle이 오지 않으므로 바로 정보창 열기
+                const center = map.getCenter();
+                if (map.getZoom() === PAN_ZOOM && center &&
+                    Math.abs(center.lat() - location.lat) < 1e-6 && Math.abs(center.lng() - location.lng) < 1e-6) {
+                    openMarkerInfo(index, location);
+                    return;
+                }
                 
-                // 해당 마커의 정보창 열기
-                setTimeout(() => {{
-                    markers.forEach(m => m.infoWindow.close()); // 다른 정보창 닫기
-                    markers[index].infoWindow.open(map, markers[index].marker);
-                }}, 500);
-            }}
-        }}
+                // 지도 이동 및 줌, 해당 마커의 정보창은 지도가 멈춘 뒤 열기
+                pendingPan = google.maps.event.addListenerOnce(map, 'idle', () => {
+                    pendingPan = null;
+                    openMarkerInfo(index, location);
+                });
+                map.panTo({ lat: location.lat, lng: location.lng });
+                map.setZoom(PAN_ZOOM);
+            }
+        }
+
+        // ---- 회원사 목록 (보이는 행만 그리는 가상 스크롤) ----
+        const ROW_HEIGHT = 45;
+        const OVERSCAN = 10;
+        // 검색용 소문자 문자열과 지역별 회원사 인덱스 (데이터를 읽은 뒤 한 번만 만듦)
+        let searchTexts = [];
+        let allIndices = [];
+        let regionMembers = [];
+
+        const tableWrapper = document.getElementById('tableWrapper');
+        const tableBody = document.getElementById('tableBody');
+        const searchInput = document.getElementById('searchInput');
+        const regionSelect = document.getElementById('regionSelect');
+        const resultCount = document.getElementById('resultCount');
+
+        let filteredIndices = [];
+        let lastQuery = '';
+        let lastRegion = -1;
+        let renderPending = false;
+
+        function spacerRow(height) {
+            const tr = document.createElement('tr');
+            const td = document.createElement('td');
+            td.colSpan = 3;
+            td.style.cssText = `height: ${height}px; padding: 0; border: 0;`;
+            tr.appendChild(td);
+            return tr;
+        }
+
+        function renderRows() {
+            renderPending = false;
+            const total = filteredIndices.length;
+            const start = Math.max(0, Math.floor(tableWrapper.scrollTop / ROW_HEIGHT) - OVERSCAN);
+            const end = Math.min(total, start + Math.ceil(tableWrapper.clientHeight / ROW_HEIGHT) + OVERSCAN * 2);
+
+            const fragment = document.createDocumentFragment();
+            fragment.appendChild(spacerRow(start * ROW_HEIGHT));
+            for (let pos = start; pos < end; pos++) {
+                const index = filteredIndices[pos];
+                const location = companyLocations[index];
+                const tr = document.createElement('tr');
+                tr.dataset.index = index;
+                [String(index + 1), location.name, location.address].forEach(text => {
+                    const td = document.createElement('td');
+                    td.textContent = text;
+                    td.title = text;
+                    tr.appendChild(td);
+                });
+                fragment.appendChild(tr);
+            }
+            fragment.appendChild(spacerRow((total - end) * ROW_HEIGHT));
+
+            tableBody.replaceChildren(fragment);
+            resultCount.textContent = `표시 ${total}개 / 전체 ${companyLocations.length}개`;
+        }
+
+        function applyFilter() {
+            const query = searchInput.value.trim().toLowerCase();
+            const region = Number(regionSelect.value);
+
+            // 검색어를 이어서 입력한 경우 직전 결과 안에서만 다시 거름
+            let base;
+            if (region === lastRegion && lastQuery && query.startsWith(lastQuery)) {
+                base = filteredIndices;
+            } else {
+                base = region >= 0 ? regionMembers[region] : allIndices;
+            }
+
+            if (query) {
+                const result = [];
+                for (let k = 0; k < base.length; k++) {
+                    if (searchTexts[base[k]].includes(query)) result.push(base[k]);
+                }
+                filteredIndices = result;
+            } else {
+                filteredIndices = base;
+            }
+
+            lastQuery = query;
+            lastRegion = region;
+            tableWrapper.scrollTop = 0;
+            renderRows();
+        }
+
+        function initList() {
+            searchTexts = companyLocations.map(l => (l.name + ' ' + l.address).toLowerCase());
+            allIndices = companyLocations.map((_, i) => i);
+            regionMembers = regionNames.map(() => []);
+            companyRegions.forEach((region, i) => regionMembers[region].push(i));
+            filteredIndices = allIndices;
+
+            regionNames.forEach((name, i) => {
+                const option = document.createElement('option');
+                option.value = i;
+                option.textContent = `${name} (${regionMembers[i].length})`;
+                regionSelect.appendChild(option);
+            });
+            renderRows();
+        }
+
+        searchInput.addEventListener('input', applyFilter);
+        regionSelect.addEventListener('change', applyFilter);
+        tableWrapper.addEventListener('scroll', () => {
+            if (!renderPending) {
+                renderPending = true;
+                requestAnimationFrame(renderRows);
+            }
+        });
+        tableBody.addEventListener('click', (event) => {
+            const tr = event.target.closest('tr[data-index]');
+            if (tr) panToMarker(Number(tr.dataset.index));
+        });
+        mapDataReady.then(initList);
 
         // 구글 지도 로드 실패 시 처리
-        window.gm_authFailure = function() {{
+        window.gm_authFailure = function() {
             document.getElementById('map').innerHTML = 
                 '<div style="padding: 50px; text-align: center; color: #d32f2f;">' +
                 '<h3>❌ 구글 지도 로드 실패</h3>' +
                 '<p>API 키를 확인해주세요.</p>' +
                 '</div>';
-        }}
+        }
     </script>
     
     <!-- 구글 지도 API 로드 (여기에 실제 API 키를 입력하세요) -->
     <script async defer 
-        src="https://maps.googleapis.com/maps/api/js?key={self.google_api_key}&callback=initMap&language=ko&region=KR">
+        src="https://maps.googleapis.com/maps/api/js?key=@@api_key:url@@&callback=initMap&language=ko&region=KR">
     </script>
 </body>
-</html>'''
+</html>''')
+
+class ExcelToGoogleMap:
+    def __init__(self, excel_file_path, google_api_key, cache_path="geocode_cache.sqlite",
+                 cache_ttl_days=30, cache_max_entries=100000, offline=False,
+                 qps=50, max_retries=5, backoff_base=1.0, backoff_max=32.0, rate_limiter=None,
+                 http=None, local_geocoder=None, geocoder=None, batch_size=100,
+                 metrics=None, metrics_path=None, metrics_interval=0, quiet=False, manifest=None):
+        self.excel_file_path = excel_file_path
+        self.google_api_key = google_api_key
+        self.df = None
+        self.company_locations = []
+        # 좌표 캐시 (cache_path가 None이면 사용하지 않음)
+        self.geocode_cache = None
+        if cache_path:
+            self.geocode_cache = GeocodeCache(cache_path, cache_ttl_days, cache_max_entries)
+        # 오프라인 모드: API를 호출하지 않고 캐시만 사용
+        self.offline = offline
+        # 도로명주소 DB 로컬 지오코더 (JusoGeocoder 또는 DB 경로). 찾지 못한 주소만 API 호출
+        if isinstance(local_geocoder, str):
+            local_geocoder = JusoGeocoder(local_geocoder)
+        self.local_geocoder = local_geocoder
+        # API 요청 제한 (구글 기본 할당량: 초당 50회). 여러 인스턴스가 공유할 수 있음
+        self.rate_limiter = rate_limiter or TokenBucket(qps)
+        # OVER_QUERY_LIMIT 재시도 설정 (지수 백오프 + 지터)
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.retry_count = 0
+        self.retried_rows = 0
+        self.max_row_retries = 0
+        self.backoff_seconds = 0.0
+        # keep-alive 연결을 재사용하는 공유 HTTP 세션
+        self.http = http or get_shared_pool()
+        # 지오코딩 백엔드 (기본: 구글). 로컬 DB/캐시에 없는 주소를 batch_size개씩 묶어 요청
+        self.geocoder = geocoder or GoogleGeocoder(google_api_key, http=self.http)
+        self.attach_rate_limiter(self.geocoder)
+        self.batch_size = batch_size
+        # 캐시 키 파라미터 (공급자와 관계없이 같은 주소는 같은 키)
+        self.cache_params = {'language': 'ko', 'region': 'kr'}
+        # 단계별 소요 시간/건수 계측 (metrics_path를 주면 끝날 때 JSON과 .prom 파일로 저장)
+        self.metrics = metrics or RunMetrics('mapper', metrics_path, metrics_interval)
+        # quiet면 주소마다 출력하지 않고 진행 상황 한 줄만 갱신
+        self.quiet = quiet
+        # 실행 매니페스트 (RunManifest 또는 경로). 지난번과 같은 (회원사명, 주소)는 좌표를 다시 찾지 않고,
+        # 위치 목록이 같으면 지도도 다시 만들지 않음
+        if isinstance(manifest, str):
+            manifest = RunManifest(manifest)
+        self.manifest = manifest
+        # geocode_stream에서 매니페스트에 없던 (새로 찾은) 위치 수
+        self.new_locations = 0
+
+    def attach_rate_limiter(self, geocoder):
+        """요청 제한이 없는 백엔드(FailoverGeocoder면 묶인 각 백엔드)에 self.rate_limiter를 붙입니다."""
+        for backend in getattr(geocoder, 'backends', [geocoder]):
+            if backend.rate_limiter is None:
+                backend.rate_limiter = self.rate_limiter
+
+    def log(self, message):
+        """주소 단위 진행 메시지를 출력합니다. (quiet면 생략)"""
+        if not self.quiet:
+            print(message)
+
+    def load_excel(self):
+        """엑셀 파일을 로드합니다."""
+        try:
+            required_columns = ['회원사명', '주소']
+            if self.excel_file_path.endswith('.csv'):
+                with self.metrics.timer('load'):
+                    self.df = pd.read_csv(self.excel_file_path)
+            else:
+                # 필요한 열만 openpyxl read-only 모드로 스트리밍해서 읽기
+                if not all(col in excel_columns(self.excel_file_path) for col in required_columns):
+                    print(f"❌ 필요한 컬럼('회원사명', '주소')이 없습니다.")
+                    return False
+                with self.metrics.timer('load'):
+                    self.df = read_excel_columns(self.excel_file_path, required_columns)
+            
+            print(f"✅ 엑셀 파일 로드 완료: {len(self.df)}개 행")
+            if not all(col in self.df.columns for col in required_columns):
+                print(f"❌ 필요한 컬럼('회원사명', '주소')이 없습니다.")
+                return False
+            return True
+        except Exception as e:
+            print(f"❌ 엑셀 파일 로드 실패: {e}")
+            return False
+
+    def test_api_connection(self):
+        """지오코딩 API 연결을 테스트합니다."""
+        print(f"🔍 지오코딩 API({self.geocoder.name}) 연결 테스트 중...")
+        test_address = "서울특별시 강남구 테헤란로 152"
+        print(f"  📍 테스트 주소: {test_address}")
         
-        with open(output_path, 'w', encoding='utf-8') as f:
-            f.write(html_content)
+        result = self.geocoder.geocode(test_address)
+        if result.status == 'OK':
+            print("  ✅ API 연결 성공!")
+            return True
+        elif result.status == 'REQUEST_DENIED':
+            print(f"  ❌ API 키 오류: {result.message or 'API 키가 유효하지 않습니다.'}")
+        elif result.status == 'OVER_QUERY_LIMIT':
+            print("  ❌ API 사용량 초과")
+        else:
+            print(f"  ❌ API 응답 오류: {result.status} - {result.message}")
+        return False
+
+    def test_google_api_connection(self):
+        """이전 이름 호환용 (test_api_connection 사용)"""
+        return self.test_api_connection()
+
+    @staticmethod
+    def clean_address(address):
+        """줄바꿈을 공백으로 바꾸고 앞뒤 공백을 없앱니다."""
+        return address.strip().replace('\n', ' ').replace('\r', ' ')
+
+    def lookup_known(self, address):
+        """로컬 주소DB와 좌표 캐시에서 좌표를 찾습니다. (API 호출 없음)"""
+        if self.local_geocoder is not None:
+            with self.metrics.timer('local_db'):
+                coords = self.local_geocoder.lookup(address)
+            if coords:
+                self.metrics.count('local_db_hit')
+                self.log(f"  🏠 로컬 주소DB 사용")
+                return coords
+            self.metrics.count('local_db_miss')
+        
+        if self.geocode_cache is not None:
+            with self.metrics.timer('cache'):
+                cached = self.geocode_cache.get(GeocodeCache.make_key(address, self.cache_params))
+            if cached:
+                self.metrics.count('cache_hit')
+                self.log(f"  💾 캐시 사용")
+                return cached
+            self.metrics.count('cache_miss')
+        return None
+
+    def geocode_address(self, address):
+        """주소 하나를 좌표로 변환합니다. (로컬 주소DB → 캐시 → 지오코딩 API)"""
+        cleaned_address = self.clean_address(address)
+        coords = self.lookup_known(cleaned_address)
+        if coords:
+            return coords
+        
+        if self.offline:
+            self.log(f"  📴 오프라인 모드: 캐시에 없는 주소입니다.")
+            return None
+        return self.accept_result(self.geocode_batch([cleaned_address])[0])
+
+    def geocode_address_google(self, address):
+        """이전 이름 호환용 (geocode_address 사용. 공급자는 geocoder 설정을 따름)"""
+        return self.geocode_address(address)
+
+    def accept_result(self, result):
+        """API 결과의 좌표를 캐시에 저장하고 반환합니다. 실패하면 원인을 출력하고 None."""
+        self.metrics.count(f'geocode_{result.status.lower()}')
+        if result.status == 'OK':
+            coords = {'lat': result.lat, 'lng': result.lng}
+            if self.geocode_cache is not None:
+                with self.metrics.timer('cache'):
+                    self.geocode_cache.put(GeocodeCache.make_key(result.address, self.cache_params), coords)
+            return coords
+        
+        if result.status == 'ZERO_RESULTS':
+            self.log(f"  ⚠️ 검색 결과 없음: '{result.address}'")
+        elif result.status == 'OVER_QUERY_LIMIT':
+            self.log(f"  ⏱️ API 사용량 초과 - 재시도 {self.max_retries}회 모두 실패: '{result.address}'")
+        elif result.status == 'REQUEST_DENIED':
+            self.log(f"  🚫 API 키 오류: {result.message}")
+        else:
+            self.log(f"  💥 API 요청 오류: {result.message}")
+        return None
+
+    def backoff_delay(self, attempt):
+        """재시도 대기 시간 (지수 증가, 상한 적용, full jitter)"""
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * (2 ** attempt)))
+
+    def geocode_batch(self, addresses):
+        """주소 목록을 지오코딩 백엔드로 변환해 같은 순서의 GeocodeResult 목록을 반환합니다.
+        
+        할당량 초과(OVER_QUERY_LIMIT) 결과만 모아 지수 백오프 후 다시 요청합니다.
+        """
+        results = {}
+        remaining = list(dict.fromkeys(addresses))
+        
+        for attempt in range(self.max_retries + 1):
+            if attempt:
+                self.retry_count += len(remaining)
+                self.max_row_retries = max(self.max_row_retries, attempt)
+                if attempt == 1:
+                    self.retried_rows += len(remaining)
+                delay = self.backoff_delay(attempt - 1)
+                self.backoff_seconds += delay
+                self.log(f"  ⏱️ API 사용량 초과 {len(remaining)}개 - {delay:.1f}초 대기 후 재시도 "
+                         f"({attempt}/{self.max_retries})")
+                with self.metrics.timer('backoff'):
+                    time.sleep(delay)
+            
+            self.metrics.count('geocode_requests', len(remaining))
+            with self.metrics.timer('geocode'):
+                batch_results = self.geocoder.geocode_batch(remaining)
+            retry = []
+            for address, result in zip(remaining, batch_results):
+                if result.status == 'OVER_QUERY_LIMIT' and attempt < self.max_retries:
+                    retry.append(address)
+                else:
+                    results[address] = result
+            remaining = retry
+            if not remaining:
+                break
+        
+        return [results[address] for address in addresses]
+
+    def process_addresses(self):
+        """모든 주소를 처리하여 좌표로 변환합니다."""
+        if self.df is None: 
+            return False
+        if not self.prepare_geocoding():
+            return False
+        
+        rows = self.plan_addresses()
+        rows['key'] = normalize_address_keys(rows['address'])
+        unique_keys = rows['key'].drop_duplicates()
+        print(f"📊 대상: 회원사 {len(rows)}개, 고유 주소 {len(unique_keys)}개")
+        
+        # 건물 단위 고유 주소만 좌표 변환 (매니페스트에 같은 행이 있으면 그 좌표 사용)
+        group_names = rows.groupby('key', sort=False)['name'].agg(list)
+        coords_by_key = self.remembered_coords(rows)
+        pending = []
+        progress = ProgressLine('lookup', len(unique_keys), enabled=self.quiet, metrics=self.metrics)
+        for i, key in enumerate(unique_keys, 1):
+            if key in coords_by_key:
+                progress.update(i, key)
+                continue
+            if not self.quiet:
+                names = group_names[key]
+                others = f" 외 {len(names) - 1}곳" if len(names) > 1 else ""
+                print(f"\n📋 처리 중 ({i}/{len(unique_keys)}): {names[0]}{others}")
+                print(f"  📍 주소: {key}")
+
+            # 로컬 주소DB/캐시에 없는 주소는 모아 두었다가 묶어서 API 요청
+            with self.metrics.timer('lookup'):
+                coords = self.lookup_known(self.clean_address(key))
+            if coords:
+                coords_by_key[key] = (coords['lat'], coords['lng'])
+                self.log(f"  ✅ 성공: ({coords['lat']:.6f}, {coords['lng']:.6f})")
+            elif self.offline:
+                self.log(f"  📴 오프라인 모드: 캐시에 없는 주소입니다.")
+                self.log(f"  ❌ 실패: 좌표를 찾을 수 없습니다.")
+            else:
+                pending.append(key)
+                self.log(f"  🌐 API 요청 대기")
+            progress.update(i, key)
+        progress.close()
+        
+        if pending:
+            print(f"\n🌐 지오코딩 API({self.geocoder.name}) 요청: 주소 {len(pending)}개 ({self.batch_size}개씩)")
+            progress = ProgressLine('geocode', len(pending), enabled=self.quiet, metrics=self.metrics)
+            for start in range(0, len(pending), self.batch_size):
+                batch = pending[start:start + self.batch_size]
+                coords_by_key.update(self.geocode_keys(batch))
+                self.log(f"  📦 {start + len(batch)}/{len(pending)}개 완료")
+                progress.update(start + len(batch), batch[-1])
+            progress.close()
+        
+        # 좌표를 같은 주소의 모든 회원사에 한 번에 반영 (원래 행 순서 유지)
+        coords_by_key = {key: coords for key, coords in coords_by_key.items() if coords}
+        found = pd.DataFrame(list(coords_by_key.values()), columns=['lat', 'lng'],
+                             index=pd.Index(list(coords_by_key.keys()), dtype=object))
+        located = rows.join(found, on='key', how='inner')
+        self.company_locations.extend(located[['name', 'address', 'lat', 'lng']].to_dict('records'))
+        if self.manifest is not None:
+            for row_hash, lat, lng in zip(located['hash'], located['lat'], located['lng']):
+                self.manifest.record('mapper', row_hash, [lat, lng])
+        
+        success_count = len(located)
+        return self.print_geocode_summary(success_count, len(rows) - success_count)
+
+    def remembered_coords(self, rows):
+        """매니페스트에 같은 (회원사명, 주소)로 기록된 행의 좌표를 {건물 키: (lat, lng)}로 반환합니다.
+        
+        rows에 행 해시 열('hash')을 더합니다.
+        """
+        if self.manifest is None:
+            return {}
+        
+        rows['hash'] = [RunManifest.content_hash(name, address)
+                        for name, address in zip(rows['name'], rows['address'])]
+        coords_by_key = {}
+        reused = 0
+        for key, row_hash in zip(rows['key'], rows['hash']):
+            coords = self.manifest.lookup('mapper', row_hash)
+            if coords is not None:
+                coords_by_key.setdefault(key, tuple(coords))
+                reused += 1
+        if reused:
+            self.metrics.count('manifest_reused', reused)
+            print(f"📒 매니페스트: 바뀌지 않은 회원사 {reused}개는 지난 좌표를 사용합니다.")
+        return coords_by_key
+
+    def geocode_keys(self, keys):
+        """캐시에 없는 건물 키들을 API로 묶어 변환하고 {키: (lat, lng) 또는 None}을 반환합니다."""
+        coords_by_key = {}
+        results = self.geocode_batch([self.clean_address(key) for key in keys])
+        for key, result in zip(keys, results):
+            coords = self.accept_result(result)
+            if coords:
+                coords_by_key[key] = (coords['lat'], coords['lng'])
+                self.log(f"  ✅ 성공: {key} ({coords['lat']:.6f}, {coords['lng']:.6f})")
+            else:
+                coords_by_key[key] = None
+                self.log(f"  ❌ 실패: {key}")
+        return coords_by_key
+
+    def geocode_stream(self, rows, batch_wait=2.0):
+        """(회원사명, 주소)가 들어오는 대로 좌표를 찾아 위치 dict를 내보내는 생성기
+        
+        로컬 주소DB/캐시에 있는 주소는 바로 내보내고, 없는 주소는 batch_size개가
+        모이거나 가장 먼저 기다린 주소가 batch_wait초를 넘기면 묶어서 요청합니다.
+        rows는 앞 단계가 한가할 때 None(틱)을 내보낼 수 있으며, 틱을 받을 때도
+        기다린 시간을 확인하므로 다음 행이 늦게 와도 모인 주소가 묶여 있지 않습니다.
+        같은 건물 주소는 한 번만 찾습니다. 내보낸 위치는 company_locations에도
+        쌓이고, 입력이 끝나면 입력 순서대로 다시 정렬됩니다. (process_addresses와 같은 순서)
+        """
+        coords_by_key = {}
+        # 키 → 기다리는 [(순번, 회원사명, 주소, 행 해시)]
+        waiting = {}
+        waiting_since = None
+        located = []
+        base = len(self.company_locations)
+        total = 0
+        self.new_locations = 0
+        
+        def locate(seq, name, address, row_hash, coords):
+            location = {'name': name, 'address': address, 'lat': coords[0], 'lng': coords[1]}
+            located.append((seq, location))
+            self.company_locations.append(location)
+            if row_hash is not None:
+                if self.manifest.lookup('mapper', row_hash) is None:
+                    self.new_locations += 1
+                self.manifest.record('mapper', row_hash, [coords[0], coords[1]])
+            else:
+                self.new_locations += 1
+            return location
+        
+        def flush():
+            keys = list(waiting)
+            self.log(f"\n🌐 지오코딩 API({self.geocoder.name}) 요청: 주소 {len(keys)}개")
+            coords_by_key.update(self.geocode_keys(keys))
+            for key in keys:
+                coords = coords_by_key[key]
+                for seq, name, address, row_hash in waiting.pop(key):
+                    if coords:
+                        yield locate(seq, name, address, row_hash, coords)
+        
+        progress = ProgressLine('lookup', enabled=self.quiet, metrics=self.metrics)
+        for row in rows:
+            if row is None:
+                # 틱: 새 행 없이 기다린 시간만 확인
+                if waiting and time.perf_counter() - waiting_since >= batch_wait:
+                    yield from flush()
+                    waiting_since = None
+                continue
+            name, address = row
+            name = str(name).strip() if name is not None else ''
+            address = str(address).strip() if address is not None else ''
+            if name in ('', 'nan') or address in ('', 'nan'):
+                continue
+            seq = total
+            total += 1
+            progress.update(total, name)
+            
+            key = address_key(address)
+            row_hash = None
+            if self.manifest is not None:
+                # 지난 실행과 같은 (회원사명, 주소)면 기록된 좌표 사용
+                row_hash = RunManifest.content_hash(name, address)
+                remembered = self.manifest.lookup('mapper', row_hash)
+                if remembered is not None and not coords_by_key.get(key):
+                    self.metrics.count('manifest_reused')
+                    coords_by_key[key] = tuple(remembered)
+            if key in coords_by_key:
+                if coords_by_key[key]:
+                    yield locate(seq, name, address, row_hash, coords_by_key[key])
+                continue
+            if key in waiting:
+                waiting[key].append((seq, name, address, row_hash))
+                continue
+            
+            self.log(f"\n📋 처리 중 ({total}): {name}")
+            self.log(f"  📍 주소: {key}")
+            with self.metrics.timer('lookup'):
+                coords = self.lookup_known(self.clean_address(key))
+            if coords:
+                coords_by_key[key] = (coords['lat'], coords['lng'])
+                self.log(f"  ✅ 성공: ({coords['lat']:.6f}, {coords['lng']:.6f})")
+                yield locate(seq, name, address, row_hash, coords_by_key[key])
+            elif self.offline:
+                coords_by_key[key] = None
+                self.log(f"  📴 오프라인 모드: 캐시에 없는 주소입니다.")
+            else:
+                waiting[key] = [(seq, name, address, row_hash)]
+                if waiting_since is None:
+                    waiting_since = time.perf_counter()
+                self.log(f"  🌐 API 요청 대기")
+            
+            if waiting and (len(waiting) >= self.batch_size or time.perf_counter() - waiting_since >= batch_wait):
+                yield from flush()
+                waiting_since = None
+        
+        if waiting:
+            yield from flush()
+        progress.close()
+        
+        located.sort(key=lambda item: item[0])
+        self.company_locations[base:] = [location for _, location in located]
+        self.print_geocode_summary(len(located), total - len(located))
+
+    def prepare_geocoding(self):
+        """API 연결을 확인하고 통계를 초기화합니다. (오프라인 모드는 캐시만 사용)"""
+        # API 연결 테스트 먼저 실행 (오프라인 모드는 캐시만 사용)
+        if self.offline:
+            print("📴 오프라인 모드: 좌표 캐시만 사용합니다.")
+        elif not self.test_api_connection():
+            print(f"\n❌ 지오코딩 API({self.geocoder.name}) 연결 실패.")
+            if isinstance(self.geocoder, GoogleGeocoder):
+                print("   다음을 확인해주세요:")
+                print("   1. https://console.cloud.google.com 에서 프로젝트 생성")
+                print("   2. Maps JavaScript API 및 Geocoding API 활성화")
+                print("   3. API 키 생성 및 정확한 입력")
+                print("   4. 결제 정보 등록 (무료 사용량: 월 $200)")
+            return False
+        
+        print(f"\n🔄 지오코딩({self.geocoder.name})으로 주소를 좌표로 변환 중...")
+        print("=" * 60)
+        
+        if self.geocode_cache is not None:
+            self.geocode_cache.reset_stats()
+        if self.local_geocoder is not None:
+            self.local_geocoder.reset_stats()
+        self.rate_limiter.reset_stats()
+        self.retry_count = 0
+        self.retried_rows = 0
+        self.max_row_retries = 0
+        self.backoff_seconds = 0.0
+        return True
+
+    def print_geocode_summary(self, success_count, fail_count):
+        """좌표 변환 결과와 캐시/요청 제한/재시도 통계를 출력합니다. 하나라도 성공하면 True."""
+        print("\n" + "=" * 60)
+        print(f"🎉 처리 완료: 성공 {success_count}개, 실패 {fail_count}개")
+        if self.local_geocoder is not None:
+            local = self.local_geocoder
+            lookups = local.hits + local.misses
+            average = local.lookup_seconds / lookups * 1e6 if lookups else 0.0
+            print(f"🏠 로컬 주소DB: 적중 {local.hits}개, 미적중 {local.misses}개 (평균 {average:.0f}µs)")
+        if self.geocode_cache is not None:
+            print(f"💾 좌표 캐시: 적중 {self.geocode_cache.hits}개, 미적중 {self.geocode_cache.misses}개")
+        limiter = self.rate_limiter
+        print(f"⏱️ 요청 제한: API 요청 {limiter.acquired}회, 대기 {limiter.throttled_count}회 "
+              f"({limiter.throttled_seconds:.1f}초)")
+        if self.retry_count:
+            print(f"🔁 재시도: {self.retried_rows}개 행에서 총 {self.retry_count}회 "
+                  f"(행당 최대 {self.max_row_retries}회, 백오프 {self.backoff_seconds:.1f}초)")
+        return success_count > 0
+
+    def plan_addresses(self):
+        """회원사명/주소를 벡터 연산으로 정리하고 비어 있는 행을 걸러냅니다."""
+        names = self.df['회원사명'].astype(str).str.strip()
+        addresses = self.df['주소'].astype(str).str.strip()
+        
+        valid = (self.df['회원사명'].notna() & self.df['주소'].notna() &
+                 names.ne('') & names.ne('nan') & addresses.ne('') & addresses.ne('nan'))
+        skipped = int((~valid).sum())
+        if skipped:
+            print(f"⏭️ 회원사명 또는 주소가 없는 행 {skipped}개 건너뜀")
+        
+        return pd.DataFrame({'name': names[valid], 'address': addresses[valid]})
+
+    def group_locations(self, group_colocated=True, locations=None):
+        """같은 좌표의 회원사를 하나의 마커 그룹으로 묶습니다.
+        
+        반환값: [{'lat', 'lng', 'members': [locations 인덱스, ...]}, ...]
+        group_colocated=False면 회원사마다 그룹 하나씩 만듭니다.
+        """
+        if locations is None:
+            locations = self.company_locations
+        groups = []
+        group_by_position = {}
+        for i, location in enumerate(locations):
+            position = (round(location['lat'], 6), round(location['lng'], 6))
+            group = group_by_position.get(position) if group_colocated else None
+            if group is None:
+                group = {'lat': location['lat'], 'lng': location['lng'], 'members': []}
+                groups.append(group)
+                group_by_position[position] = group
+            group['members'].append(i)
+        return groups
+
+    def compute_clusters(self, groups, max_zoom=CLUSTER_MAX_ZOOM, cell_px=CLUSTER_CELL_PX):
+        """줌 레벨별 마커 클러스터를 격자 방식으로 미리 계산합니다.
+        
+        반환값: {'maxZoom': z, 'levels': [[[lat, lng, 회원사 수, 그룹 인덱스 또는 -1], ...], ...]}
+        maxZoom보다 확대하면 화면 안의 그룹이 개별 마커로 표시됩니다.
+        """
+        # 웹 메르카토르 좌표 (0~1 범위)
+        points = [mercator(group['lat'], group['lng']) for group in groups]
+        
+        levels = []
+        for zoom in range(max_zoom + 1):
+            scale = 256 * (2 ** zoom) / cell_px
+            cells = {}
+            for group_index, (x, y) in enumerate(points):
+                group = groups[group_index]
+                size = len(group['members'])
+                key = (int(x * scale), int(y * scale))
+                cell = cells.get(key)
+                if cell is None:
+                    cells[key] = [group['lat'] * size, group['lng'] * size, size, group_index, 1]
+                else:
+                    cell[0] += group['lat'] * size
+                    cell[1] += group['lng'] * size
+                    cell[2] += size
+                    cell[4] += 1
+            
+            # 거의 모든 칸에 그룹이 하나뿐이면 이후 줌은 화면 안의 개별 마커로 충분
+            if len(cells) >= len(groups) * CLUSTER_SPLIT_RATIO:
+                break
+            
+            # 그룹 하나뿐인 칸은 그룹 좌표 그대로 (페이지에서 같은 타일을 찾도록)
+            levels.append([
+                [round(lat / size, 6), round(lng / size, 6), size, -1] if count > 1 else
+                [quantize(groups[group_index]['lat']), quantize(groups[group_index]['lng']), size, group_index]
+                for lat, lng, size, group_index, count in cells.values()
+            ])
+        
+        return {'maxZoom': len(levels) - 1, 'levels': levels}
+
+    def build_tile_index(self, groups, zoom=TILE_ZOOM):
+        """마커 그룹을 쿼드키 타일별로 나눕니다.
+        
+        반환값: {쿼드키: [[그룹 인덱스, 회원사 인덱스, ...], ...]} (쿼드키 순)
+        페이지는 화면에 걸친 타일의 조각만 읽어 마커를 그립니다.
+        """
+        tiles = {}
+        for group_index, group in enumerate(groups):
+            key = tile_quadkey(quantize(group['lat']), quantize(group['lng']), zoom)
+            tiles.setdefault(key, []).append([group_index] + group['members'])
+        return {key: tiles[key] for key in sorted(tiles)}
+
+    def build_map_data(self, marker_groups, clusters, locations=None):
+        """페이지에 넘길 지도 데이터를 압축된 형태로 만듭니다.
+        
+        좌표는 COORD_SCALE 배율 정수의 직전 값과의 차이로, 이름과 주소는
+        중복 없는 문자열 테이블의 인덱스로 저장합니다.
+        """
+        if locations is None:
+            locations = self.company_locations
+        strings = []
+        string_index = {}
+        
+        def intern(text):
+            index = string_index.get(text)
+            if index is None:
+                index = string_index[text] = len(strings)
+                strings.append(text)
+            return index
+        
+        coords = []
+        names = []
+        addresses = []
+        prev_lat = prev_lng = 0
+        for location in locations:
+            lat = int(round(location['lat'] * COORD_SCALE))
+            lng = int(round(location['lng'] * COORD_SCALE))
+            coords.append(lat - prev_lat)
+            coords.append(lng - prev_lng)
+            prev_lat, prev_lng = lat, lng
+            names.append(intern(location['name']))
+            addresses.append(intern(location['address']))
+        
+        # 목록 필터용 지역 (주소의 첫 단어: 시/도)
+        regions = [region_of(location['address']) for location in locations]
+        region_names = sorted(set(regions))
+        region_index = {name: i for i, name in enumerate(region_names)}
+        
+        return {
+            'scale': COORD_SCALE,
+            'coords': coords,
+            'strings': strings,
+            'names': names,
+            'addresses': addresses,
+            'tiles': {'zoom': TILE_ZOOM, 'chunks': self.build_tile_index(marker_groups)},
+            'clusters': clusters,
+            'regions': region_names,
+            'companyRegions': [region_index[region] for region in regions],
+        }
+
+    def write_tiles(self, tile_dir, chunks):
+        """타일 조각을 tile_dir/쿼드키.json 파일로 쓰고 경로 목록을 반환합니다."""
+        os.makedirs(tile_dir, exist_ok=True)
+        paths = []
+        for key, chunk in chunks.items():
+            path = os.path.join(tile_dir, key + '.json')
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write(JSON_ENCODER.encode(chunk))
+            paths.append(path)
+        return paths
+
+    def write_precompressed(self, path):
+        """path.gz (및 brotli가 있으면 path.br) 파일을 만들고 만든 파일 경로 목록을 반환합니다."""
+        with open(path, 'rb') as src, gzip.open(path + '.gz', 'wb', compresslevel=9) as dst:
+            shutil.copyfileobj(src, dst)
+        if brotli is None:
+            return [path + '.gz']
+        
+        compressor = brotli.Compressor()
+        with open(path, 'rb') as src, open(path + '.br', 'wb') as dst:
+            for block in iter(lambda: src.read(1024 * 1024), b''):
+                dst.write(compressor.process(block))
+            dst.write(compressor.finish())
+        return [path + '.gz', path + '.br']
+
+    def generate_html(self, output_path="회원사_지도_구글.html", group_colocated=True, clustered=None,
+                      external_data=False, locations=None, title="회원사 위치 지도"):
+        """구글 지도와 테이블이 포함된 HTML 파일을 생성합니다.
+        
+        미리 컴파일된 MAP_PAGE_TEMPLATE을 파일에 조각 단위로 바로 쓰므로
+        페이지 전체를 메모리에 만들지 않습니다. locations를 주면 그 회원사만
+        담은 지도(지역별, 시트별 등)를 만듭니다. external_data=True면 지도 데이터를
+        별도 파일(및 타일 파일)로 내보내고 미리 압축한 .gz/.br 파일도 만듭니다.
+        HTML과 함께 만든 파일의 경로 목록을 반환합니다.
+        """
+        if locations is None:
+            locations = self.company_locations
+        if not locations:
+            print("❌ 처리된 위치 데이터가 없어 HTML을 생성할 수 없습니다.")
+            return []
+
+        # 같은 위치의 회원사는 마커 하나로 표시
+        with self.metrics.timer('group'):
+            marker_groups = self.group_locations(group_colocated, locations)
+        
+        # 마커가 많으면 줌 레벨별 클러스터를 미리 계산해 넣음
+        if clustered is None:
+            clustered = len(marker_groups) > CLUSTER_THRESHOLD
+        with self.metrics.timer('clusters'):
+            clusters = self.compute_clusters(marker_groups) if clustered else None
+        with self.metrics.timer('map_data'):
+            map_data = self.build_map_data(marker_groups, clusters, locations)
+        
+        # 지도 데이터: HTML에 넣거나 별도 파일로 내보내 fetch로 읽음
+        if external_data:
+            # 타일 조각은 타일별 파일로 나눠 화면에 걸칠 때만 읽게 함
+            tile_dir = os.path.splitext(output_path)[0] + '_tiles'
+            with self.metrics.timer('tiles'):
+                tile_paths = self.write_tiles(tile_dir, map_data['tiles'].pop('chunks'))
+            map_data['tiles']['keys'] = [os.path.splitext(os.path.basename(path))[0] for path in tile_paths]
+            map_data['tiles']['url'] = os.path.basename(tile_dir) + '/'
+            
+            data_path = os.path.splitext(output_path)[0] + '_data.json'
+            with open(data_path, 'w', encoding='utf-8') as f:
+                for chunk in JSON_ENCODER.iterencode(map_data):
+                    f.write(chunk)
+            fetch_js = f"fetch({json.dumps(os.path.basename(data_path), ensure_ascii=False)}).then(r => r.json())"
+            map_data_js = lambda: [fetch_js]
+        else:
+            data_path = None
+            map_data_js = lambda: (piece for part in (['Promise.resolve('], iter_script_json(map_data), [')'])
+                                   for piece in part)
+        
+        context = {
+            'title': title,
+            'company_count': len(locations),
+            'avg_lat': sum(loc['lat'] for loc in locations) / len(locations),
+            'avg_lng': sum(loc['lng'] for loc in locations) / len(locations),
+            'drop_animation': len(marker_groups) <= DROP_ANIMATION_LIMIT,
+            'data_bounds': {
+                'south': min(loc['lat'] for loc in locations),
+                'west': min(loc['lng'] for loc in locations),
+                'north': max(loc['lat'] for loc in locations),
+                'east': max(loc['lng'] for loc in locations),
+            },
+            'map_data': map_data_js,
+            'api_key': self.google_api_key,
+        }
+        
+        with self.metrics.timer('render'), open(output_path, 'w', encoding='utf-8') as f:
+            MAP_PAGE_TEMPLATE.render_to(f, context)
         print(f"\n✅ 구글 지도 기반 HTML 생성 완료: {output_path}")
-        print(f"🌐 브라우저에서 파일을 열어 지도를 확인하세요!")
+        
+        if not external_data:
+            print(f"🌐 브라우저에서 파일을 열어 지도를 확인하세요!")
+            return []
+        
+        # 웹 서버가 바로 보낼 수 있도록 미리 압축한 파일도 함께 생성
+        written = [data_path] + tile_paths
+        with self.metrics.timer('precompress'):
+            for path in [output_path, data_path] + tile_paths:
+                written.extend(self.write_precompressed(path))
+        print(f"📦 지도 데이터 파일: {data_path} (.gz{'/.br' if brotli else ''} 포함)")
+        print(f"🧩 타일 파일: {tile_dir}/ ({len(tile_paths)}개)")
+        print(f"🌐 외부 데이터 모드는 웹 서버로 제공해야 지도가 표시됩니다.")
+        return written
 
-    def run(self):
-        """전체 프로세스를 실행합니다."""
+    def map_digest(self, output_path, options, locations=None):
+        """지도 HTML을 만드는 입력(위치 목록, 옵션, API 키, 템플릿)의 해시"""
+        if locations is None:
+            locations = self.company_locations
+        header = JSON_ENCODER.encode([os.path.basename(output_path), sorted(options.items()),
+                                      self.google_api_key, MAP_PAGE_TEMPLATE.digest])
+        return RunManifest.digest([header] + [
+            JSON_ENCODER.encode([loc['name'], loc['address'], loc['lat'], loc['lng']]) for loc in locations
+        ])
+
+    def generate_html_if_changed(self, output_path="회원사_지도_구글.html", **options):
+        """위치 목록과 옵션이 지난번과 같고 파일도 그대로면 지도를 다시 만들지 않습니다. 만들었으면 True.
+        
+        매니페스트가 없으면 항상 만듭니다. 외부 데이터 모드(external_data=True)면
+        데이터/타일 파일과 미리 압축한 파일도 그대로인지 함께 확인합니다.
+        """
+        if self.manifest is None:
+            self.generate_html(output_path, **options)
+            return True
+        
+        input_hash = self.map_digest(output_path, options)
+        if self.manifest.artifact_unchanged(output_path, input_hash):
+            self.metrics.count('html_unchanged')
+            print(f"\n⏭️ 위치 목록이 지난번과 같아 지도를 다시 만들지 않습니다: {output_path}")
+            return False
+        extra_paths = self.generate_html(output_path, **options)
+        if os.path.exists(output_path):
+            self.manifest.record_artifact(output_path, input_hash, extra_paths)
+        return True
+
+    def generate_region_maps(self, output_prefix="회원사_지도_구글", **options):
+        """지역(시/도)별 지도를 각각 생성합니다. 이미 읽은 위치 데이터를 그대로 사용합니다."""
+        by_region = {}
+        for location in self.company_locations:
+            by_region.setdefault(region_of(location['address']), []).append(location)
+        
+        for region, locations in sorted(by_region.items()):
+            safe_region = re.sub(r'[\\/:*?"<>|\s]+', '_', region) or '기타'
+            self.generate_html(f"{output_prefix}_{safe_region}.html", locations=locations,
+                               title=f"회원사 위치 지도 - {region or '기타'}", **options)
+
+    def finish_metrics(self):
+        """HTTP 통계를 계측에 더하고 단계별 시간 요약과 보고서 파일을 씁니다."""
+        stats = self.http.stats()
+        self.metrics.gauge('http_requests', stats['requests'])
+        self.metrics.gauge('http_connections', stats['connections'])
+        paths = self.metrics.finish()
+        if self.metrics.timers:
+            print(f"⏱️ 단계별 시간: {self.metrics.stage_line()}")
+        if paths:
+            print(f"📈 계측 결과 저장: {paths[0]}, {paths[1]}")
+
+    def run(self, external_data=False):
+        """전체 프로세스를 실행합니다. (external_data=True면 지도 데이터를 별도 파일과 .gz/.br로 내보냄)"""
         print("🚀 회원사 지도 생성 프로그램 (Google Maps Ver.)")
         print("=" * 60)
         
-        if not self.load_excel():
-            return
-        if not self.process_addresses():
-            return
-        self.generate_html()
+        self.metrics.start_snapshots()
+        try:
+            if not self.load_excel():
+                return
+            if not self.process_addresses():
+                return
+            with self.metrics.timer('html'):
+                self.generate_html_if_changed(external_data=external_data)
+            if self.manifest is not None:
+                self.manifest.save()
+        finally:
+            self.finish_metrics()
         
+        print(f"🔌 {self.http.summary()}")
         print("\n" + "=" * 60)
         print("🎉 모든 작업이 완료되었습니다!")
         print("💡 Tip: 생성된 HTML 파일을 브라우저에서 열어보세요.")
@@ -488,6 +1719,31 @@ if __name__ == "__main__":
     # 2. 여기에 발급받은 구글 API 키를 입력하세요.
     google_api_key = "YOUR_GOOGLE_API_KEY"
     
+    # 3. True로 설정하면 API를 호출하지 않고 저장된 좌표 캐시만 사용합니다.
+    offline = False
+    
+    # 4. 도로명주소 DB 색인 경로 (python juso_geocoder.py import <덤프>로 생성). 없으면 None
+    juso_db = "juso_geocoder.sqlite" if os.path.exists("juso_geocoder.sqlite") else None
+    
+    # 5. 주소 변환 공급자 순서 ('google', 'kakao', 'naver'). 여러 개면 앞 공급자가 못 찾은 주소만 다음으로 넘김
+    #    예: ['kakao', 'google']. 지도 표시는 항상 구글 지도 API 키를 사용합니다.
+    geocoder_order = ['google']
+    kakao_rest_api_key = "YOUR_KAKAO_REST_API_KEY"
+    naver_client_id = "YOUR_NAVER_CLIENT_ID"
+    naver_client_secret = "YOUR_NAVER_CLIENT_SECRET"
+    
+    # 6. 단계별 계측 결과 JSON 경로 (같은 이름의 .prom 파일도 생성). quiet=True면 주소별 출력 대신 진행 표시 한 줄
+    metrics_path = None
+    quiet = False
+    
+    # 7. 실행 매니페스트 경로. 지난 실행과 같은 회원사는 좌표를 다시 찾지 않고, 위치 목록이 같으면 지도도 그대로 둠
+    #    (None이면 사용하지 않음. 파일을 지우면 전체를 다시 처리)
+    manifest_path = os.path.splitext(excel_file)[0] + "_manifest.json"
+    
+    # 8. True면 지도 데이터를 HTML에 넣지 않고 별도 파일(_data.json, _tiles/)로 내보내 fetch로 읽고,
+    #    웹 서버용 .gz/.br 압축 파일도 만듭니다. (회원사가 많을 때 페이지 용량 감소. 웹 서버로 제공해야 함)
+    external_data = False
+    
     if not google_api_key or google_api_key == "YOUR_GOOGLE_API_KEY":
         print("🛑 [안내] 구글 API 키를 설정해주세요!")
         print("")
@@ -502,5 +1758,17 @@ if __name__ == "__main__":
         print("💰 비용: 월 $200 무료 크레딧 (약 28,500회 무료)")
         print("🔒 보안: API 키 제한 설정 권장")
     else:
-        mapper = ExcelToGoogleMap(excel_file, google_api_key)
-        mapper.run()
\ No newline at end of file
+        backends = []
+        for provider in geocoder_order:
+            if provider == 'kakao':
+                backends.append(KakaoGeocoder(kakao_rest_api_key))
+            elif provider == 'naver':
+                backends.append(NaverGeocoder(naver_client_id, naver_client_secret))
+            else:
+                backends.append(GoogleGeocoder(google_api_key))
+        geocoder = backends[0] if len(backends) == 1 else FailoverGeocoder(backends)
+        
+        mapper = ExcelToGoogleMap(excel_file, google_api_key, offline=offline, local_geocoder=juso_db,
+                                  geocoder=geocoder, metrics_path=metrics_path, quiet=quiet,
+                                  manifest=manifest_path)
+        mapper.run(external_data=external_data)
\ No newline at end of file
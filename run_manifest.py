@@ -0,0 +1,107 @@
+# run_manifest.py - 지난 실행의 행별/산출물별 내용 해시를 기록해 바뀐 것만 다시 처리하게 하는 매니페스트
+
+import hashlib
+import json
+import math
+import os
+import threading
+
+class RunManifest:
+    """행 내용 해시 → 지난 결과, 산출물 경로 → (입력 해시, 파일 해시)를 담는 JSON 매니페스트
+
+    구역(section)마다 행 해시별 결과를 기록합니다. (예: 'collector'는 주소와
+    홈페이지, 'mapper'는 좌표) 다음 실행에서 같은 해시의 행은 lookup으로
+    지난 결과를 얻어 다시 처리하지 않습니다. save는 이번 실행에서 기록한
+    구역을 통째로 바꾸므로 목록에서 빠진 행은 매니페스트에서도 빠집니다.
+
+    산출물은 만들 때 쓴 입력의 해시와 만든 파일의 해시를 함께 기록해, 입력이
+    같고 파일도 그대로일 때만 다시 만들지 않게 합니다. 함께 만든 파일(데이터
+    파일, 미리 압축한 파일 등)도 기록하면 그중 하나라도 바뀌거나 없어졌을 때
+    다시 만듭니다. fresh=True면 지난 기록을 읽지 않고 새로 기록합니다. (전체 재처리)
+    """
+    VERSION = 1
+
+    def __init__(self, path, fresh=False):
+        self.path = path
+        self.lock = threading.Lock()
+        self.rows = {}
+        self.artifacts = {}
+        # 이번 실행에서 기록한 구역 → {행 해시: 결과}
+        self.current = {}
+        if not fresh:
+            self.load()
+
+    def load(self):
+        """매니페스트 파일을 읽습니다. (없거나 깨졌거나 버전이 다르면 빈 매니페스트)"""
+        try:
+            with open(self.path, encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        if data.get('version') != self.VERSION:
+            return
+        self.rows = data.get('rows', {})
+        self.artifacts = data.get('artifacts', {})
+
+    @staticmethod
+    def content_hash(*values):
+        """값들의 내용 해시 (None/NaN은 빈 값, 앞뒤 공백 무시)"""
+        text = '\x1f'.join(
+            '' if value is None or (isinstance(value, float) and math.isnan(value)) else str(value).strip()
+            for value in values
+        )
+        return hashlib.sha1(text.encode('utf-8')).hexdigest()[:16]
+
+    @staticmethod
+    def digest(pieces):
+        """문자열 조각들을 이어 붙인 내용의 해시 (큰 입력을 메모리에 모으지 않음)"""
+        digest = hashlib.sha1()
+        for piece in pieces:
+            digest.update(piece.encode('utf-8'))
+        return digest.hexdigest()
+
+    @staticmethod
+    def file_hash(path):
+        """파일 내용의 해시 (파일이 없으면 None)"""
+        digest = hashlib.sha1()
+        try:
+            with open(path, 'rb') as f:
+                for block in iter(lambda: f.read(1 << 20), b''):
+                    digest.update(block)
+        except OSError:
+            return None
+        return digest.hexdigest()
+
+    def lookup(self, section, key):
+        """지난 실행에서 section 구역에 key 행 해시로 기록한 결과 (없으면 None)"""
+        return self.rows.get(section, {}).get(key)
+
+    def record(self, section, key, value):
+        """이번 실행의 행 결과를 기록합니다."""
+        with self.lock:
+            self.current.setdefault(section, {})[key] = value
+
+    def artifact_unchanged(self, path, input_hash):
+        """path를 같은 입력으로 만든 적이 있고 path와 함께 만든 파일도 그때 그대로인지 확인합니다."""
+        entry = self.artifacts.get(os.path.abspath(path))
+        if entry is None or entry['input'] != input_hash or entry['output'] != self.file_hash(path):
+            return False
+        return all(self.file_hash(extra) == digest for extra, digest in entry.get('extras', {}).items())
+
+    def record_artifact(self, path, input_hash, extra_paths=()):
+        """path(와 함께 만든 extra_paths)를 input_hash 입력으로 만들었다고 기록합니다."""
+        entry = {'input': input_hash, 'output': self.file_hash(path)}
+        if extra_paths:
+            entry['extras'] = {os.path.abspath(extra): self.file_hash(extra) for extra in extra_paths}
+        with self.lock:
+            self.artifacts[os.path.abspath(path)] = entry
+
+    def save(self):
+        """이번 실행에서 기록한 구역을 바꿔 넣고 파일에 씁니다. (임시 파일에 쓴 뒤 바꿔치기)"""
+        with self.lock:
+            self.rows.update(self.current)
+            data = {'version': self.VERSION, 'rows': self.rows, 'artifacts': self.artifacts}
+            temp_path = self.path + '.tmp'
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                json.dump(data, f, ensure_ascii=False, separators=(',', ':'))
+            os.replace(temp_path, self.path)
@@ -0,0 +1,255 @@
+# run_metrics.py - 단계별 소요 시간과 건수를 모아 JSON/Prometheus 텍스트로 내보내는 계측 도구
+
+import json
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+
+# Prometheus 지표 이름 앞에 붙는 접두사
+METRIC_PREFIX = 'member_visit'
+
+def prometheus_label(value):
+    """Prometheus 라벨 값 이스케이프 (역슬래시, 따옴표, 줄바꿈)"""
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+class RunMetrics:
+    """파이프라인 단계별 타이머와 카운터
+
+    timer(stage)로 감싼 구간의 호출 수/누적 시간/최대 시간을, count(name)로
+    캐시 적중 같은 사건 수를, gauge(name, value)로 진행 상황 같은 현재 값을
+    모읍니다. 여러 스레드에서 함께 써도 됩니다. 단계 구간은 겹칠 수 있습니다.
+    (예: homepage 단계 안에 job_site 단계, job_site 안에 fetch 단계)
+
+    snapshot_path를 주면 실행이 끝날 때 JSON 요약과 같은 이름의 .prom
+    파일을 쓰고, snapshot_interval초마다 중간 스냅샷도 같은 파일에 덮어씁니다.
+    """
+    def __init__(self, job, snapshot_path=None, snapshot_interval=0):
+        self.job = job
+        self.snapshot_path = snapshot_path
+        self.snapshot_interval = snapshot_interval
+        self.started_at = time.time()
+        self.started = time.perf_counter()
+        self.finished = False
+        self.lock = threading.Lock()
+        # 단계 → [호출 수, 누적 초, 최대 초]
+        self.timers = {}
+        self.counters = {}
+        self.gauges = {}
+        self.snapshot_thread = None
+        self.stop_event = threading.Event()
+
+    @contextmanager
+    def timer(self, stage):
+        """with 블록의 소요 시간을 stage 단계에 더합니다."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(stage, time.perf_counter() - start)
+
+    def timed(self, stage, iterable):
+        """반복자의 next() 시간을 stage 단계에 더하며 항목을 그대로 넘깁니다. (스트리밍 읽기용)"""
+        iterator = iter(iterable)
+        while True:
+            start = time.perf_counter()
+            try:
+                item = next(iterator)
+            except StopIteration:
+                self.observe(stage, time.perf_counter() - start)
+                return
+            self.observe(stage, time.perf_counter() - start)
+            yield item
+
+    def observe(self, stage, seconds):
+        """stage 단계에 한 번의 소요 시간을 기록합니다."""
+        with self.lock:
+            entry = self.timers.get(stage)
+            if entry is None:
+                self.timers[stage] = [1, seconds, seconds]
+            else:
+                entry[0] += 1
+                entry[1] += seconds
+                if seconds > entry[2]:
+                    entry[2] = seconds
+
+    def count(self, name, n=1):
+        """name 사건 수를 n만큼 늘립니다."""
+        with self.lock:
+            self.counters[name] = self.counters.get(name, 0) + n
+
+    def gauge(self, name, value):
+        """name의 현재 값을 기록합니다."""
+        with self.lock:
+            self.gauges[name] = value
+
+    def elapsed(self):
+        """시작 후 지난 시간(초)"""
+        return time.perf_counter() - self.started
+
+    def summary(self):
+        """지금까지의 계측 결과를 JSON으로 쓸 수 있는 dict로 반환합니다."""
+        with self.lock:
+            stages = {
+                stage: {
+                    'count': count,
+                    'seconds': round(seconds, 6),
+                    'avg_ms': round(seconds / count * 1000, 3) if count else 0.0,
+                    'max_ms': round(maximum * 1000, 3),
+                }
+                for stage, (count, seconds, maximum) in sorted(self.timers.items())
+            }
+            counters = dict(sorted(self.counters.items()))
+            gauges = dict(sorted(self.gauges.items()))
+        return {
+            'job': self.job,
+            'started_at': self.started_at,
+            'elapsed_seconds': round(self.elapsed(), 3),
+            'finished': self.finished,
+            'stages': stages,
+            'counters': counters,
+            'gauges': gauges,
+        }
+
+    def stage_line(self):
+        """단계별 누적 시간을 오래 걸린 순으로 한 줄에 요약합니다."""
+        with self.lock:
+            stages = sorted(self.timers.items(), key=lambda item: -item[1][1])
+        return ', '.join(f"{stage} {seconds:.1f}초/{count}회" for stage, (count, seconds, _) in stages)
+
+    def prometheus_text(self, prefix=METRIC_PREFIX):
+        """Prometheus 텍스트 노출 형식의 스냅샷 문자열을 반환합니다."""
+        summary = self.summary()
+        job = prometheus_label(self.job)
+        lines = []
+
+        def family(name, kind, help_text, samples):
+            lines.append(f"# HELP {prefix}_{name} {help_text}")
+            lines.append(f"# TYPE {prefix}_{name} {kind}")
+            for labels, value in samples:
+                label_text = ','.join(f'{key}="{prometheus_label(val)}"' for key, val in labels)
+                lines.append(f"{prefix}_{name}{{job=\"{job}\"{',' if label_text else ''}{label_text}}} {value}")
+
+        stages = summary['stages']
+        family('stage_seconds_total', 'counter', '단계별 누적 소요 시간(초)',
+               [((('stage', stage),), entry['seconds']) for stage, entry in stages.items()])
+        family('stage_calls_total', 'counter', '단계별 호출 수',
+               [((('stage', stage),), entry['count']) for stage, entry in stages.items()])
+        family('stage_max_seconds', 'gauge', '단계별 1회 최대 소요 시간(초)',
+               [((('stage', stage),), round(entry['max_ms'] / 1000, 6)) for stage, entry in stages.items()])
+        family('events_total', 'counter', '사건 수 (캐시 적중/미적중, 오류 등)',
+               [((('event', name),), value) for name, value in summary['counters'].items()])
+        family('state', 'gauge', '현재 값 (진행 행 수 등)',
+               [((('name', name),), value) for name, value in summary['gauges'].items()])
+        family('run_seconds', 'gauge', '실행 시작 후 지난 시간(초)', [((), summary['elapsed_seconds'])])
+        family('run_finished', 'gauge', '실행 완료 여부 (1이면 완료)', [((), int(summary['finished']))])
+        return '\n'.join(lines) + '\n'
+
+    @staticmethod
+    def write_atomic(path, text):
+        """임시 파일에 쓴 뒤 바꿔치기해 읽는 쪽이 반쯤 쓰인 파일을 보지 않게 합니다."""
+        temp_path = path + '.tmp'
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            f.write(text)
+        os.replace(temp_path, path)
+
+    def write_reports(self, path=None):
+        """JSON 요약(path)과 Prometheus 스냅샷(path의 확장자를 .prom으로)을 쓰고 두 경로를 반환합니다."""
+        path = path or self.snapshot_path
+        prom_path = os.path.splitext(path)[0] + '.prom'
+        self.write_atomic(path, json.dumps(self.summary(), ensure_ascii=False, indent=2))
+        self.write_atomic(prom_path, self.prometheus_text())
+        return path, prom_path
+
+    def start_snapshots(self):
+        """snapshot_interval초마다 중간 스냅샷을 쓰는 백그라운드 스레드를 시작합니다."""
+        if not self.snapshot_path or not self.snapshot_interval or self.snapshot_thread is not None:
+            return
+
+        def loop():
+            while not self.stop_event.wait(self.snapshot_interval):
+                try:
+                    self.write_reports()
+                except OSError:
+                    pass
+
+        self.stop_event.clear()
+        self.snapshot_thread = threading.Thread(target=loop, daemon=True)
+        self.snapshot_thread.start()
+
+    def finish(self):
+        """스냅샷 스레드를 멈추고, snapshot_path가 있으면 최종 결과를 씁니다. 쓴 경로(없으면 None)를 반환합니다."""
+        self.stop_event.set()
+        if self.snapshot_thread is not None:
+            self.snapshot_thread.join()
+            self.snapshot_thread = None
+        self.finished = True
+        if self.snapshot_path:
+            return self.write_reports()
+        return None
+
+class ProgressLine:
+    """행마다 여러 줄을 출력하는 대신 진행 상황 한 줄을 일정 간격으로만 갱신하는 표시기
+
+    터미널이면 같은 줄을 덮어쓰고, 파일/파이프로 나갈 때는 interval마다 한
+    줄씩 씁니다. enabled=False면 아무것도 출력하지 않고 metrics의 진행
+    게이지만 갱신합니다.
+    """
+    def __init__(self, label, total=None, interval=1.0, enabled=True, metrics=None, stream=None):
+        self.label = label
+        self.total = total
+        self.interval = interval
+        self.enabled = enabled
+        self.metrics = metrics
+        self.stream = stream or sys.stdout
+        self.overwrite = enabled and hasattr(self.stream, 'isatty') and self.stream.isatty()
+        self.started = time.perf_counter()
+        self.last_shown = 0.0
+        self.done = 0
+        self.width = 0
+        if metrics is not None and total is not None:
+            metrics.gauge(f'{label}_total', total)
+
+    def update(self, done=None, note=''):
+        """완료 수를 done으로 (없으면 1 증가) 갱신하고, 간격이 지났으면 표시합니다."""
+        self.done = self.done + 1 if done is None else done
+        if self.metrics is not None:
+            self.metrics.gauge(f'{self.label}_done', self.done)
+        if not self.enabled:
+            return
+        now = time.perf_counter()
+        if now - self.last_shown < self.interval and self.done != self.total:
+            return
+        self.last_shown = now
+        self.show(now, note)
+
+    def show(self, now, note=''):
+        elapsed = now - self.started
+        rate = self.done / elapsed if elapsed > 0 else 0.0
+        if self.total:
+            remaining = (self.total - self.done) / rate if rate > 0 else 0.0
+            text = (f"{self.label} {self.done}/{self.total} ({self.done / self.total:.0%}) "
+                    f"{rate:.1f}건/초, 남은 시간 {remaining:.0f}초")
+        else:
+            text = f"{self.label} {self.done}건 {rate:.1f}건/초"
+        if note:
+            text += f" - {note[:30]}"
+
+        if self.overwrite:
+            # 이전 줄이 더 길었으면 남은 글자를 공백으로 지움
+            self.stream.write('\r' + text.ljust(self.width))
+            self.width = len(text)
+        else:
+            self.stream.write(text + '\n')
+        self.stream.flush()
+
+    def close(self):
+        """마지막 상태를 표시하고 줄을 마칩니다."""
+        if not self.enabled:
+            return
+        if self.done != self.total or not self.last_shown:
+            self.show(time.perf_counter())
+        if self.overwrite:
+            self.stream.write('\n')
+            self.stream.flush()